@@ -0,0 +1,196 @@
+"""Durable background execution of remediation actions.
+
+Jobs live in the store's action_jobs table, so they survive restarts and are
+shared by every backend process. Submitting is idempotent: a second submit
+with the same key (a double-click, a client retry) returns the existing job
+instead of opening another GitHub issue or starting another retrain. Worker
+threads claim due jobs atomically, retry failures with jittered exponential
+backoff up to max_attempts, and publish every state change on an EventBus.
+
+Only idempotent kinds are retried on any failure. A retrain, rollback or
+GitHub issue that failed with a read timeout or a 5xx may still have happened
+on the server, so those are retried only when the failure is known not to
+have reached it (see never_reached_service) and fail otherwise. The same goes
+for a job left running by a crashed process: at startup only idempotent kinds
+are requeued. Running jobs renew their lease while the handler works, so a
+second process starting up leaves them alone. Submitting the key of a failed
+job queues it again.
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from typing import Callable
+
+import httpx
+
+from backend.event_bus import CrewEvent, EventBus
+from backend.store import Store
+from integrations.resilience import CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+
+def never_reached_service(exc: BaseException) -> bool:
+    """Whether a failed call certainly had no effect: short-circuited by an open
+    breaker or rate limiter, refused before connecting, or rejected with a 429."""
+    if isinstance(exc, (CircuitOpenError, httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 429
+
+
+class ActionQueue:
+    def __init__(
+        self,
+        store: Store,
+        handlers: dict[str, Callable[[dict], str]],
+        bus: EventBus,
+        idempotent_kinds: frozenset[str] = frozenset(),
+        on_update: Callable[[dict], None] | None = None,
+        workers: int = 2,
+        max_attempts: int = 3,
+        base_backoff_sec: float = 5.0,
+        max_backoff_sec: float = 300.0,
+        lease_sec: float = 600.0,
+        poll_sec: float = 1.0,
+    ):
+        """`handlers` maps job kind → fn(payload) returning a result string (raising means failure).
+
+        `idempotent_kinds` are safe to run twice and are retried after any failure.
+        `on_update(job)` runs after every state change, before the event is published.
+        """
+        self.store = store
+        self.handlers = handlers
+        self.bus = bus
+        self.idempotent_kinds = frozenset(idempotent_kinds)
+        self.on_update = on_update
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.base_backoff_sec = base_backoff_sec
+        self.max_backoff_sec = max_backoff_sec
+        self.lease_sec = lease_sec
+        self.poll_sec = poll_sec
+        self._threads: list[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self):
+        if self.running:
+            return
+        self._stopping.clear()
+        for job in self.store.recover_stale_jobs(self.lease_sec, self.idempotent_kinds):
+            self._changed(job)
+        self._threads = [
+            threading.Thread(target=self._work, name=f"action-worker-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def submit(
+        self, kind: str, payload: dict, key: str, plan_id: int | None = None, idx: int | None = None
+    ) -> tuple[dict, bool]:
+        """Queue a job (or find the existing one for `key`). Returns (job, created)."""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown action kind: {kind}")
+        job, created = self.store.enqueue_job(key, kind, payload, plan_id, idx, self.max_attempts)
+        if created:
+            self._changed(job)
+            self._wake.set()
+        return job, created
+
+    def _changed(self, job: dict):
+        if self.on_update is not None:
+            self.on_update(job)
+        self.bus.publish(CrewEvent(event_type="action_job", data=json.dumps(public_job(job), default=str)))
+
+    def _backoff(self, attempts: int) -> float:
+        delay = min(self.max_backoff_sec, self.base_backoff_sec * 2 ** (attempts - 1))
+        return delay * random.uniform(0.5, 1.0)
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                job = self.store.claim_job()
+            except Exception:
+                job = None  # database busy; try again after the poll interval
+            if job is None:
+                self._wake.wait(self.poll_sec)
+                self._wake.clear()
+                continue
+            try:
+                self._run(job)
+            except Exception:
+                # Bookkeeping failed (e.g. database locked); the job's lease recovers it on restart.
+                logger.exception("Action job %s (%s) could not be recorded", job["id"], job["kind"])
+
+    def _retryable(self, kind: str, exc: BaseException) -> bool:
+        return kind in self.idempotent_kinds or never_reached_service(exc)
+
+    def _heartbeat(self, job_id: int, done: threading.Event):
+        while not done.wait(max(1.0, self.lease_sec / 3)):
+            try:
+                self.store.touch_job(job_id)
+            except Exception:
+                pass  # database busy; the next beat renews it
+
+    def _call(self, job: dict) -> str:
+        """Run the job's handler, renewing its lease until it returns."""
+        done = threading.Event()
+        threading.Thread(target=self._heartbeat, args=(job["id"], done), name=f"action-lease-{job['id']}",
+                         daemon=True).start()
+        try:
+            return self.handlers[job["kind"]](job["payload"])
+        finally:
+            done.set()
+
+    def _run(self, job: dict):
+        self._changed(job)
+        try:
+            result = self._call(job)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:500]
+            if not self._retryable(job["kind"], e):
+                error = f"{error[:440]} (not retried: may have reached the service)"
+                status, next_run_at = "failed", None
+            elif job["attempts"] < job["max_attempts"]:
+                # An open breaker says when it is worth trying again.
+                delay = e.retry_in if isinstance(e, CircuitOpenError) else self._backoff(job["attempts"])
+                status, next_run_at = "queued", time.time() + delay
+            else:
+                status, next_run_at = "failed", None
+            self.store.finish_job(job["id"], status, error=error, next_run_at=next_run_at)
+        else:
+            self.store.finish_job(job["id"], "succeeded", result=result)
+        self._changed(self.store.get_job(job["id"]))
+
+
+def public_job(job: dict) -> dict:
+    """API shape of a job row."""
+    return {
+        "job_id": job["id"],
+        "kind": job["kind"],
+        "plan_id": job["plan_id"],
+        "index": job["idx"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "max_attempts": job["max_attempts"],
+        "next_run_at": job["next_run_at"] if job["status"] == "queued" else None,
+        "result": job["result"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
@@ -0,0 +1,266 @@
+"""Alert lifecycle: fingerprint dedup, grouping, flap suppression and expiry.
+
+Each evaluation reports the alerts that currently hold for a component. The
+manager folds them into one record per fingerprint (alert type + component),
+so a condition that persists across polls stays a single alert with an
+occurrence count instead of a new entry every time. Only state changes —
+opened, escalated, de-escalated, resolved, expired — are reported and
+logged. Alerts that open and resolve repeatedly within the flap window are
+marked flapping and stop producing changes until they settle, which is
+reported as a "settled" change carrying the alert's current status.
+
+With a Store attached, records and state changes are persisted and re-read
+before each evaluation, so several backend workers share one alert state;
+each evaluation's read-modify-write is one store transaction, so workers
+evaluating the same component at once take turns.
+"""
+
+import contextlib
+import threading
+import time
+from collections import deque
+from datetime import datetime, UTC
+
+SEVERITY_RANK = {"info": 0, "warning": 1, "critical": 2}
+
+
+def alert_fingerprint(alert: dict) -> str:
+    return f"{alert.get('alert_type', 'unknown')}:{alert.get('affected_component', 'unknown')}"
+
+
+def alert_group(alert: dict) -> str:
+    """Related alerts on the same model (e.g. drift + accuracy_drop) share a group."""
+    return f"group:{alert.get('affected_component', 'unknown')}"
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, UTC).isoformat()
+
+
+class _Record:
+    __slots__ = ("alert", "status", "first_seen", "last_seen", "occurrences", "transitions", "flapping")
+
+    def __init__(self, alert: dict, now: float):
+        self.alert = alert
+        self.status = "active"
+        self.first_seen = now
+        self.last_seen = now
+        self.occurrences = 1
+        self.transitions: deque[float] = deque()
+        self.flapping = False
+
+    def to_state(self) -> dict:
+        return {
+            "fingerprint": alert_fingerprint(self.alert),
+            "alert": self.to_dict(),
+            "status": self.status,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "occurrences": self.occurrences,
+            "flapping": self.flapping,
+            "transitions": list(self.transitions),
+        }
+
+    @classmethod
+    def from_state(cls, data: dict) -> "_Record":
+        alert = {
+            k: v for k, v in data["alert"].items()
+            if k not in ("fingerprint", "group_id", "status", "first_seen", "last_seen", "occurrences", "flapping")
+        }
+        rec = cls(alert, data["first_seen"])
+        rec.status = data["status"]
+        rec.last_seen = data["last_seen"]
+        rec.occurrences = data["occurrences"]
+        rec.flapping = data["flapping"]
+        rec.transitions = deque(data["transitions"])
+        return rec
+
+    def to_dict(self) -> dict:
+        return {
+            **self.alert,
+            "fingerprint": alert_fingerprint(self.alert),
+            "group_id": alert_group(self.alert),
+            "status": self.status,
+            "first_seen": _iso(self.first_seen),
+            "last_seen": _iso(self.last_seen),
+            "occurrences": self.occurrences,
+            "flapping": self.flapping,
+        }
+
+
+class AlertManager:
+    def __init__(
+        self,
+        ttl_sec: float = 1800.0,
+        flap_window_sec: float = 900.0,
+        flap_threshold: int = 4,
+        max_log: int = 500,
+        store=None,
+    ):
+        self.ttl_sec = ttl_sec
+        self.flap_window_sec = flap_window_sec
+        self.flap_threshold = flap_threshold
+        self._records: dict[str, _Record] = {}
+        self._log: deque[dict] = deque(maxlen=max_log)
+        self._lock = threading.Lock()
+        self.store = store
+
+    def _load(self, now: float):
+        """Replace in-memory records with the persisted ones (store only)."""
+        if self.store is None:
+            return
+        since = now - max(self.ttl_sec, self.flap_window_sec)
+        self._records = {
+            d["fingerprint"]: _Record.from_state(d) for d in self.store.load_alert_records(since)
+        }
+
+    def _settle(self, rec: _Record, now: float) -> dict | None:
+        """Drop open/resolve transitions older than the flap window; returns a
+        "settled" change if that ends the alert's flapping."""
+        while rec.transitions and now - rec.transitions[0] > self.flap_window_sec:
+            rec.transitions.popleft()
+        if rec.flapping and len(rec.transitions) < self.flap_threshold:
+            rec.flapping = False
+            return self._change(rec, "settled", now)
+        return None
+
+    def _change(self, rec: _Record, event: str, now: float) -> dict:
+        change = {
+            "ts": _iso(now),
+            "event": event,
+            "fingerprint": alert_fingerprint(rec.alert),
+            "severity": rec.alert.get("severity"),
+            "alert": rec.to_dict(),
+        }
+        self._log.append({k: v for k, v in change.items() if k != "alert"})
+        return change
+
+    def _transition(self, rec: _Record, event: str, now: float) -> dict | None:
+        """Record a state change; returns it unless the alert is flapping."""
+        was_flapping = rec.flapping
+        if event in ("opened", "reopened", "resolved"):
+            rec.transitions.append(now)
+        while rec.transitions and now - rec.transitions[0] > self.flap_window_sec:
+            rec.transitions.popleft()
+        rec.flapping = len(rec.transitions) >= self.flap_threshold
+        if rec.flapping and not was_flapping:
+            event = "flapping"
+        elif rec.flapping:
+            return None
+        return self._change(rec, event, now)
+
+    def ingest(self, alerts: list[dict], component: str | None = None, now: float | None = None) -> list[dict]:
+        """Fold one evaluation's alerts in and return the resulting state changes.
+
+        When `component` is given, active alerts for that component that were
+        not reported this time are resolved.
+        """
+        now = now or time.time()
+        changes = []
+        transaction = self.store.transaction() if self.store is not None else contextlib.nullcontext()
+        with self._lock, transaction:
+            self._load(now)
+            touched: set[str] = set()
+            seen = set()
+            for alert in alerts:
+                fp = alert_fingerprint(alert)
+                seen.add(fp)
+                touched.add(fp)
+                rec = self._records.get(fp)
+                if rec is None or rec.status != "active":
+                    reopened = rec is not None
+                    if rec is None:
+                        rec = self._records[fp] = _Record(alert, now)
+                    else:
+                        rec.alert, rec.status, rec.first_seen, rec.occurrences = alert, "active", now, 1
+                    rec.last_seen = now
+                    change = self._transition(rec, "reopened" if reopened else "opened", now)
+                else:
+                    settled = self._settle(rec, now)
+                    if settled:
+                        changes.append(settled)
+                    old = SEVERITY_RANK.get(rec.alert.get("severity"), 0)
+                    new = SEVERITY_RANK.get(alert.get("severity"), 0)
+                    # Keep the original alert_id so clients can track acknowledgement.
+                    rec.alert = {**alert, "alert_id": rec.alert.get("alert_id", alert.get("alert_id"))}
+                    rec.last_seen = now
+                    rec.occurrences += 1
+                    change = None
+                    if new != old:
+                        change = self._transition(rec, "escalated" if new > old else "deescalated", now)
+                if change:
+                    changes.append(change)
+
+            for fp, rec in self._records.items():
+                if rec.status != "active" or fp in seen:
+                    continue
+                if component is not None and rec.alert.get("affected_component") == component:
+                    rec.status = "resolved"
+                    event = "resolved"
+                elif now - rec.last_seen > self.ttl_sec:
+                    rec.status = "expired"
+                    event = "expired"
+                else:
+                    continue
+                touched.add(fp)
+                change = self._transition(rec, event, now)
+                if change:
+                    changes.append(change)
+
+            # Forget closed records once they are past the TTL and have settled.
+            for fp in [fp for fp, rec in self._records.items() if rec.status != "active"]:
+                rec = self._records[fp]
+                settled = self._settle(rec, now)
+                if settled:
+                    changes.append(settled)
+                    touched.add(fp)
+                if now - rec.last_seen > self.ttl_sec and not rec.transitions:
+                    del self._records[fp]
+                    touched.discard(fp)
+
+            if self.store is not None:
+                self.store.save_alerts(
+                    [self._records[fp].to_state() for fp in touched if fp in self._records],
+                    [{**c, "ts": now} for c in changes],
+                )
+        return changes
+
+    def active(self) -> list[dict]:
+        """Active alerts, most severe and most recent first."""
+        with self._lock:
+            self._load(time.time())
+            recs = [r for r in self._records.values() if r.status == "active"]
+            recs.sort(key=lambda r: (-SEVERITY_RANK.get(r.alert.get("severity"), 0), -r.last_seen))
+            return [r.to_dict() for r in recs]
+
+    def groups(self) -> list[dict]:
+        """Active alerts grouped by component."""
+        out: dict[str, dict] = {}
+        for a in self.active():
+            g = out.setdefault(a["group_id"], {
+                "group_id": a["group_id"],
+                "component": a.get("affected_component"),
+                "severity": a.get("severity"),
+                "alert_types": [],
+                "alert_ids": [],
+            })
+            g["alert_types"].append(a.get("alert_type"))
+            g["alert_ids"].append(a.get("alert_id"))
+            if SEVERITY_RANK.get(a.get("severity"), 0) > SEVERITY_RANK.get(g["severity"], 0):
+                g["severity"] = a.get("severity")
+        return list(out.values())
+
+    def log(self, limit: int = 100) -> list[dict]:
+        """Most recent state changes first."""
+        if self.store is not None:
+            events, _ = self.store.list_alert_events(limit)
+            return [{**e, "ts": _iso(e["ts"])} for e in events]
+        with self._lock:
+            return list(self._log)[-limit:][::-1]
+
+    def clear(self):
+        with self._lock:
+            if self.store is not None:
+                self.store.delete_alerts(list(self._records))
+            self._records.clear()
+            self._log.clear()
@@ -1,10 +1,14 @@
 """AgentOps FastAPI backend — REST endpoints + SSE crew streaming."""
 
+import asyncio
 import json
 import os
 import queue
 import sys
 import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import asdict
 from datetime import datetime, UTC
 from typing import Any
 
@@ -15,17 +19,37 @@ from dotenv import load_dotenv
 
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
+import httpx
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel
 from sse_starlette.sse import EventSourceResponse
 
 from config import settings
 from integrations.snowflake_client import SnowflakeClient
-from integrations.rag_client import RAGClient
+from integrations.rag_client import RAGClient, is_local_fallback
 from integrations.mlmonitoring_client import MLMonitoringClient
-
-from backend.event_bus import event_bus, CrewEvent
+from integrations.composio_client import warm_up as warm_up_composio
+from integrations.notifier import get_notifier, issue_key
+from integrations import registry
+from integrations.resilience import CircuitOpenError, fail_fast_message, policies
+from integrations.training_tracker import TrainingTracker, get_training_tracker
+from llm.cache import cache_key, get_llm_cache
+from llm.providers import close_providers, get_provider
+from telemetry import approx_tokens, prometheus_text, record, telemetry
+from monitoring.changepoint import detect_metric_changes
+from monitoring.rules import get_rule_engine
+from retrieval.incident_index import IncidentIndex, format_similar_incidents
+
+from backend.action_queue import ActionQueue, public_job
+from backend.alert_manager import AlertManager
+from backend.diagnosis_cache import DiagnosisCache, alert_signature
+from backend.store import Store
+from backend.event_bus import EventBus, event_bus, CrewEvent
+from backend.health import HealthAggregator
+from backend.live import LiveMetricsHub
+from backend.scheduler import AlertScheduler, parse_schedule
 from backend.stdout_capture import StdoutCapture
 
 # ---------------------------------------------------------------------------
@@ -51,9 +75,8 @@ class AppState:
         self.crew_running = False
         self.crew_result: str | None = None
         self.crew_error: str | None = None
-        self.alerts: list[dict] = []
-        self.diagnosis: dict | None = None
-        self.actions: list[dict] = []
+        self.crew_telemetry: dict | None = None  # last run's tool/LLM/task breakdown
+        self.warm_up: dict | None = None  # component → error (None = ok), once warm-up finishes
 
 
 state = AppState()
@@ -62,30 +85,168 @@ state = AppState()
 # Clients (lazy init)
 # ---------------------------------------------------------------------------
 
-_sf: SnowflakeClient | None = None
-_rag: RAGClient | None = None
-_ml: MLMonitoringClient | None = None
+_incident_index = IncidentIndex()
+_diagnosis_cache = DiagnosisCache(ttl_sec=settings.diagnosis_cache_ttl_sec)
+_store: Store | None = None
+_alert_manager: AlertManager | None = None
+_action_queue: ActionQueue | None = None
+_training_listener_added = False
+_drift_monitor = None
+_drift_monitor_error: str | None = None
 
 
 def get_sf() -> SnowflakeClient:
-    global _sf
-    if _sf is None:
-        _sf = SnowflakeClient()
-    return _sf
+    return registry.get_snowflake()
 
 
 def get_rag() -> RAGClient:
-    global _rag
-    if _rag is None:
-        _rag = RAGClient()
-    return _rag
+    return registry.get_rag()
 
 
 def get_ml() -> MLMonitoringClient:
-    global _ml
-    if _ml is None:
-        _ml = MLMonitoringClient()
-    return _ml
+    return registry.get_mlmonitor()
+
+
+def get_store() -> Store:
+    global _store
+    if _store is None:
+        _store = Store(settings.store_path)
+    return _store
+
+
+def get_alert_manager() -> AlertManager:
+    global _alert_manager
+    if _alert_manager is None:
+        _alert_manager = AlertManager(
+            ttl_sec=settings.alert_ttl_sec,
+            flap_window_sec=settings.alert_flap_window_sec,
+            flap_threshold=settings.alert_flap_threshold,
+            store=get_store(),
+        )
+    return _alert_manager
+
+
+def get_training() -> TrainingTracker:
+    """Retraining tracker shared with the agent tools; pushes job updates over /api/live."""
+    global _training_listener_added
+    tracker = get_training_tracker()
+    if not _training_listener_added:
+        _training_listener_added = True
+        tracker.add_listener(lambda job: action_bus.publish(
+            CrewEvent(event_type="training", data=json.dumps(job, default=str))
+        ))
+    return tracker
+
+
+def get_drift_monitor():
+    """Streaming drift monitor fed by predictions proxied through /api/predict and by
+    /api/metrics/feature-drift/live/observe, if a reference profile is configured."""
+    global _drift_monitor, _drift_monitor_error
+    if _drift_monitor is None and settings.drift_reference_path and _drift_monitor_error is None:
+        from monitoring.drift import ReferenceProfile
+        from monitoring.sketches import StreamingDriftMonitor
+
+        try:
+            reference = ReferenceProfile.load(settings.drift_reference_path)
+        except (OSError, KeyError, ValueError) as e:
+            _drift_monitor_error = f"Cannot load DRIFT_REFERENCE_PATH: {e}"
+            return None
+        _drift_monitor = StreamingDriftMonitor(reference)
+        get_ml().add_observer(_drift_monitor.observe)
+    return _drift_monitor
+
+
+def _require_drift_monitor():
+    monitor = get_drift_monitor()
+    if monitor is None:
+        raise HTTPException(404, _drift_monitor_error or
+                            "Streaming drift is not configured (set DRIFT_REFERENCE_PATH; "
+                            "fit one with scripts/fit_drift_reference.py)")
+    return monitor
+
+
+def get_incident_index() -> IncidentIndex:
+    """Incident similarity index, topped up with new INCIDENTS rows at most once a minute.
+
+    Refreshes run in the background; until the first one finishes the index is
+    empty and callers fall back to RAG search.
+    """
+    _incident_index.refresh_in_background(get_sf())
+    return _incident_index
+
+
+health_aggregator = HealthAggregator(
+    probes={
+        "snowflake": lambda timeout: get_sf().ping(timeout),
+        "rag": lambda timeout: get_rag().health(timeout),
+        "mlmonitor": lambda timeout: get_ml().health(timeout),
+    },
+    timeout_sec=settings.health_timeout_sec,
+    ttl_sec=settings.health_cache_ttl_sec,
+)
+
+
+# ---------------------------------------------------------------------------
+# Background alert evaluation
+# ---------------------------------------------------------------------------
+
+_alert_schedule = parse_schedule(settings.alert_eval_schedule, settings.alert_eval_interval_sec)
+alert_bus = EventBus(max_history=100)
+action_bus = EventBus(max_history=0)  # action job state changes, pushed over /api/live
+alert_scheduler = AlertScheduler(
+    lambda model: evaluate_alerts(model),
+    _alert_schedule,
+    alert_bus,
+    jitter=settings.alert_eval_jitter,
+    max_backoff_sec=settings.alert_eval_max_backoff_sec,
+)
+
+
+# Metrics shown on the dashboard trend charts (pushed over /api/live).
+LIVE_TREND_METRICS = ["f1_score", "drift_score", "latency_p99_ms", "anomaly_rate", "prediction_count"]
+
+live_hub = LiveMetricsHub(
+    sections={
+        "model": lambda: get_model_metrics(),
+        "data_quality": lambda: get_data_quality(),
+        "health": lambda: health(),
+        "incidents": lambda: get_incidents(limit=5),
+    },
+    trend_source=lambda hours: get_sf().get_metric_trends("classifier_v2", LIVE_TREND_METRICS, hours),
+    interval_sec=settings.live_refresh_sec,
+    trend_hours=settings.live_trend_hours,
+)
+
+
+def _warm_up():
+    """Import CrewAI and build clients, agents and the Composio toolset off the request path."""
+    from crew.agents import warm_up as warm_up_agents
+
+    results = warm_up_agents()
+    warm_up_composio()
+    state.warm_up = results
+
+
+@app.on_event("startup")
+async def _start_background_tasks():
+    if settings.alert_eval_enabled:
+        alert_scheduler.start()
+    live_hub.start()
+    get_action_queue().start()
+    get_training()
+    get_drift_monitor()  # attach to prediction traffic before the first request
+    get_incident_index()  # start loading incident history
+    if settings.crew_warm_up:
+        threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+
+
+@app.on_event("shutdown")
+async def _stop_background_tasks():
+    await alert_scheduler.stop()
+    await live_hub.stop()
+    await asyncio.to_thread(get_action_queue().stop)
+    await asyncio.to_thread(get_notifier().flush_all)
+    await close_providers()
 
 
 # ---------------------------------------------------------------------------
@@ -110,27 +271,45 @@ def _serialize(obj: Any) -> Any:
 
 @app.get("/api/health")
 def health():
-    result = {"snowflake": False, "rag": False, "mlmonitor": False}
+    """Dependency health from the aggregator's cache (refreshed in the background)."""
+    return health_aggregator.get()
 
-    try:
-        get_sf().query("SELECT 1")
-        result["snowflake"] = True
-    except Exception:
-        pass
 
-    try:
-        get_rag().health()
-        result["rag"] = True
-    except Exception:
-        pass
+@app.get("/api/health/stats")
+def health_stats():
+    """Probe latency histograms and circuit-breaker state per dependency."""
+    return health_aggregator.stats()
+
+
+@app.get("/api/resilience")
+def resilience_stats():
+    """Per-dependency call counters, retries, hedges, latency and breaker state."""
+    return {name: p.snapshot() for name, p in policies().items()}
+
+
+@app.get("/api/telemetry")
+def telemetry_stats():
+    """Process-wide time/token/error accounting by tool, LLM, task and agent."""
+    return telemetry.snapshot()
 
-    try:
-        get_ml().health()
-        result["mlmonitor"] = True
-    except Exception:
-        pass
 
-    return result
+@app.get("/metrics", response_class=PlainTextResponse)
+def prometheus_metrics():
+    """Prometheus scrape endpoint: instrumented calls plus integration policy counters."""
+    return PlainTextResponse(prometheus_text(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/api/llm/cache")
+def llm_cache_stats():
+    """LLM response cache size and hit rate."""
+    cache = get_llm_cache()
+    return cache.snapshot() if cache is not None else {"enabled": False}
+
+
+@app.get("/api/notifications")
+def notification_stats():
+    """Slack digest / GitHub issue aggregation counters and pending digests."""
+    return get_notifier().snapshot()
 
 
 # =========================================================================
@@ -145,24 +324,15 @@ def get_model_metrics():
         return {"status": "unknown", "f1": None, "drift": None, "latency": None, "anomaly_rate": None, "count": 0}
 
     latest = rows[0]
-    f1 = latest.get("f1_score", 0)
-    drift = latest.get("drift_score", 0)
-    latency = latest.get("latency_p99_ms", 0)
-    anomaly = latest.get("anomaly_rate", 0)
-
-    if f1 < 0.88 - settings.accuracy_drop_threshold or drift > settings.drift_threshold:
-        status = "critical"
-    elif f1 < 0.88 or drift > 0.2:
-        status = "warning"
-    else:
-        status = "healthy"
+    assessment = get_rule_engine().assess_one(latest.get("model_name", "classifier_v2"), latest)
 
     return _serialize({
-        "status": status,
-        "f1": f1,
-        "drift": drift,
-        "latency": latency,
-        "anomaly_rate": anomaly,
+        "status": assessment.status,
+        "f1": latest.get("f1_score", 0),
+        "drift": latest.get("drift_score", 0),
+        "latency": latest.get("latency_p99_ms", 0),
+        "anomaly_rate": latest.get("anomaly_rate", 0),
+        "breaches": [b.describe() for b in assessment.breaches],
         "count": len(rows),
         "rows": rows,
     })
@@ -190,6 +360,61 @@ def get_feature_drift():
     return _serialize(rows)
 
 
+@app.get("/api/metrics/feature-drift/live")
+def get_live_feature_drift():
+    monitor = _require_drift_monitor()
+    report = monitor.report()
+    return {"count": report.count, "rejected": monitor.rejected, "features": report.to_rows()}
+
+
+@app.get("/api/metrics/feature-drift/live/sketch")
+def export_live_feature_drift():
+    """This worker's sketch (DriftSketch.to_dict), for merging into another worker."""
+    return _require_drift_monitor().snapshot()
+
+
+@app.post("/api/metrics/feature-drift/live/merge")
+def merge_live_feature_drift(sketch: dict):
+    """Fold a sketch exported by another worker (GET .../live/sketch) into this one."""
+    monitor = _require_drift_monitor()
+    try:
+        monitor.merge(sketch)
+    except Exception as e:
+        raise HTTPException(400, f"Malformed sketch: {type(e).__name__}: {e}")
+    return {"count": monitor.report().count}
+
+
+class ObserveRequest(BaseModel):
+    rows: list[dict]
+
+
+@app.post("/api/metrics/feature-drift/live/observe")
+def observe_live_feature_drift(req: ObserveRequest):
+    """Feed scored feature rows (e.g. from a batch scoring job) into the streaming sketch."""
+    from monitoring.drift import to_matrix
+
+    monitor = _require_drift_monitor()
+    try:
+        batch = to_matrix(req.rows, monitor.sketch.reference.features)
+    except (TypeError, ValueError) as e:
+        raise HTTPException(400, f"Malformed rows: {e}")
+    monitor.observe_batch(batch)
+    return {"observed": len(req.rows), "count": monitor.report().count}
+
+
+@app.post("/api/predict")
+def predict(features: dict):
+    """Score a transaction through the ML service; the features also feed streaming drift."""
+    try:
+        return get_ml().predict(features)
+    except CircuitOpenError as e:
+        raise HTTPException(503, fail_fast_message(e))
+    except httpx.HTTPStatusError as e:
+        raise HTTPException(e.response.status_code, e.response.text[:500])
+    except httpx.HTTPError as e:
+        raise HTTPException(502, f"ML service unreachable: {e}")
+
+
 @app.get("/api/metrics/trend/{metric}")
 def get_metric_trend(metric: str, hours: int = 48):
     try:
@@ -201,6 +426,55 @@ def get_metric_trend(metric: str, hours: int = 48):
     return _serialize(normalized)
 
 
+@app.get("/api/metrics/trends")
+def get_metric_trends(metrics: str, hours: int = 48):
+    """Several metrics in one query: rows of {ts, <metric>...}, ascending."""
+    try:
+        rows = get_sf().get_metric_trends("classifier_v2", [m.strip() for m in metrics.split(",")], hours)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return _serialize(rows)
+
+
+@app.get("/api/live")
+async def live_stream():
+    """Multiplexed dashboard feed: a snapshot, then section/trend/alert/action-job/training deltas."""
+    q = live_hub.subscribe()
+    alerts_q = alert_bus.subscribe(replay=False)
+    actions_q = action_bus.subscribe(replay=False)
+
+    async def generate():
+        try:
+            snapshot = live_hub.snapshot()
+            snapshot["alerts"] = await asyncio.to_thread(get_alert_manager().active)
+            snapshot["training"] = get_training().snapshot()
+            yield {"event": "snapshot", "data": json.dumps(_serialize(snapshot), default=str)}
+            idle = 0.0
+            while True:
+                sent = False
+                for source in (q, alerts_q, actions_q):
+                    try:
+                        event = source.get_nowait()
+                    except queue.Empty:
+                        continue
+                    sent = True
+                    yield {"event": event.event_type, "data": event.data}
+                if sent:
+                    idle = 0.0
+                    continue
+                await asyncio.sleep(0.5)
+                idle += 0.5
+                if idle >= 15:
+                    idle = 0.0
+                    yield {"event": "ping", "data": ""}
+        finally:
+            live_hub.unsubscribe(q)
+            alert_bus.unsubscribe(alerts_q)
+            action_bus.unsubscribe(actions_q)
+
+    return EventSourceResponse(generate())
+
+
 @app.get("/api/incidents")
 def get_incidents(limit: int = 10):
     rows = get_sf().get_incidents(limit=limit)
@@ -212,48 +486,153 @@ def get_incidents(limit: int = 10):
 # =========================================================================
 
 
-@app.post("/api/alerts/check")
-def check_alerts():
-    rows = get_sf().get_latest_model_metrics(hours=1)
+# Metrics watched for statistical change points, and the alert type they raise.
+CHANGE_POINT_METRICS = {"f1_score": "accuracy_drop", "drift_score": "model_drift"}
+
+
+def evaluate_alerts(model: str = "classifier_v2") -> dict:
+    """Evaluate alert rules and change points for one model and fold them into alert state."""
+    rows = get_sf().get_latest_model_metrics(model, hours=1)
     if not rows:
-        return {"alerts": [], "message": "No metrics available"}
+        return {"alerts": get_alert_manager().active(), "changes": [], "message": "No metrics available"}
 
     latest = rows[0]
-    f1 = latest.get("f1_score", 0)
-    drift = latest.get("drift_score", 0)
 
     new_alerts = []
     ts_str = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
 
-    if f1 < 0.88:
+    # One alert per alert type, at the most severe breached rule.
+    assessment = get_rule_engine().assess_one(model, latest)
+    for alert_type, breach in assessment.worst_by_alert_type().items():
+        rule = breach.rule
         new_alerts.append({
-            "alert_id": f"alert_{ts_str}_accuracy",
-            "severity": "critical" if f1 < 0.83 else "warning",
-            "alert_type": "accuracy_drop",
-            "affected_component": "classifier_v2",
-            "metrics": {"f1_score": f1, "baseline_f1": 0.91},
+            "alert_id": f"alert_{ts_str}_{alert_type}",
+            "severity": rule.severity,
+            "alert_type": alert_type,
+            "affected_component": model,
+            "metrics": {rule.metric: breach.value, "threshold": rule.threshold, "rule": rule.name},
             "timestamp": datetime.now(UTC).isoformat(),
-            "message": f"Model F1 dropped to {f1:.4f} (baseline: 0.91)",
+            "message": breach.message(),
         })
 
-    if drift > settings.drift_threshold:
-        new_alerts.append({
-            "alert_id": f"alert_{ts_str}_drift",
-            "severity": "critical",
-            "alert_type": "model_drift",
-            "affected_component": "classifier_v2",
-            "metrics": {"drift_score": drift, "threshold": settings.drift_threshold},
-            "timestamp": datetime.now(UTC).isoformat(),
-            "message": f"Drift score {drift:.4f} exceeds threshold {settings.drift_threshold}",
-        })
+    # Statistical change points catch degradations before fixed thresholds do,
+    # and give threshold alerts an onset time.
+    try:
+        trend = get_sf().get_metric_trends(model, list(CHANGE_POINT_METRICS), hours=24)
+    except Exception:
+        trend = []
+    for metric, alert_type in CHANGE_POINT_METRICS.items():
+        result = detect_metric_changes(trend, metric)
+        if result["votes"] < 2:
+            continue
+        cp = result["summary"]
+        change = {"onset": cp["onset_ts"], "change_magnitude": round(cp["magnitude"], 4)}
+        existing = [a for a in new_alerts if a["alert_type"] == alert_type]
+        for a in existing:
+            a["metrics"].update(change)
+        if not existing:
+            new_alerts.append({
+                "alert_id": f"alert_{ts_str}_{metric}_change",
+                "severity": "warning",
+                "alert_type": alert_type,
+                "affected_component": model,
+                "metrics": {metric: latest.get(metric), **change},
+                "timestamp": datetime.now(UTC).isoformat(),
+                "message": (
+                    f"Change point in {metric}: {cp['baseline_mean']:.4f} → "
+                    f"{cp['shifted_mean']:.4f} since {cp['onset_ts']}"
+                ),
+            })
+
+    # Persisting conditions fold into their existing alert; only state changes are new.
+    manager = get_alert_manager()
+    changes = manager.ingest(_serialize(new_alerts), component=model)
+    active = manager.active()
+    return {"alerts": active, "changes": changes, "groups": manager.groups(), "total": len(active)}
+
+
+@app.post("/api/alerts/check")
+def check_alerts(model: str = "classifier_v2", force: bool = False):
+    """Latest alert evaluation — served from the scheduler's cache while it is fresh."""
+    interval = _alert_schedule.get(model)
+    if not force and interval is not None and alert_scheduler.running:
+        cached = alert_scheduler.latest(model, max_age_sec=interval * 1.5)
+        if cached is not None:
+            manager = get_alert_manager()
+            active = manager.active()
+            return {**cached, "alerts": active, "groups": manager.groups(), "total": len(active), "cached": True}
+    result = evaluate_alerts(model)
+    if interval is not None:
+        alert_scheduler.record(model, result)
+    return {**result, "cached": False}
+
+
+@app.get("/api/alerts/stream")
+async def alerts_stream():
+    """Active alerts on connect, then alert state changes as they happen."""
+    q = alert_bus.subscribe(replay=False)
 
-    state.alerts = new_alerts + state.alerts
-    return {"alerts": new_alerts, "total": len(state.alerts)}
+    async def generate():
+        try:
+            active = await asyncio.to_thread(get_alert_manager().active)
+            yield {"event": "snapshot", "data": json.dumps({"alerts": active}, default=str)}
+            idle = 0.0
+            while True:
+                try:
+                    event = q.get_nowait()
+                except queue.Empty:
+                    await asyncio.sleep(0.5)
+                    idle += 0.5
+                    if idle >= 15:
+                        idle = 0.0
+                        yield {"event": "ping", "data": ""}
+                    continue
+                idle = 0.0
+                yield {"event": event.event_type, "data": event.data}
+        finally:
+            alert_bus.unsubscribe(q)
+
+    return EventSourceResponse(generate())
+
+
+@app.get("/api/alerts/scheduler")
+def get_alert_scheduler():
+    return alert_scheduler.status()
 
 
 @app.get("/api/alerts")
-def get_alerts():
-    return {"alerts": state.alerts}
+def get_alerts(
+    status: str | None = "active",
+    model: str | None = None,
+    alert_type: str | None = None,
+    limit: int = 50,
+    cursor: str | None = None,
+):
+    """Alerts newest first; pass next_cursor back as `cursor` for the next page."""
+    try:
+        alerts, next_cursor = get_store().list_alerts(
+            status=status or None, model=model, alert_type=alert_type,
+            limit=max(1, min(limit, 500)), cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    return {"alerts": alerts, "next_cursor": next_cursor, "groups": get_alert_manager().groups()}
+
+
+@app.get("/api/alerts/log")
+def get_alert_log(limit: int = 100, cursor: str | None = None):
+    try:
+        events, next_cursor = get_store().list_alert_events(max(1, min(limit, 1000)), cursor)
+    except ValueError as e:
+        raise HTTPException(400, str(e))
+    for e in events:
+        e["ts"] = datetime.fromtimestamp(e["ts"], UTC).isoformat()
+    return {"log": events, "next_cursor": next_cursor}
+
+
+@app.get("/api/alerts/rules")
+def get_alert_rules():
+    return {"rules": [asdict(r) for r in get_rule_engine().rules]}
 
 
 # =========================================================================
@@ -267,6 +646,7 @@ class InvestigateRequest(BaseModel):
 
 class AutoInvestigateRequest(BaseModel):
     alert: dict
+    refresh: bool = False  # bypass the diagnosis cache
 
 
 @app.post("/api/investigate")
@@ -280,6 +660,22 @@ def auto_investigate(req: AutoInvestigateRequest):
     alert = req.alert
     alert_type = alert.get("alert_type", "unknown")
 
+    fd_rows: list[dict] = []
+    if "drift" in alert_type:
+        try:
+            fd_rows = get_sf().get_feature_drift(hours=2)
+        except Exception:
+            pass
+
+    # Repeated alerts of the same shape reuse the diagnosis built for the first one.
+    signature = alert_signature(alert, fd_rows)
+    if not req.refresh:
+        cached = _diagnosis_cache.get(signature)
+        if cached is not None:
+            diagnosis = {**cached, "alert": alert, "cached": True}
+            diagnosis["diagnosis_id"] = get_store().save_diagnosis(diagnosis)
+            return diagnosis
+
     # Build query from alert
     query = f"How to diagnose and fix {alert_type.replace('_', ' ')} in ML fraud detection model?"
     if alert.get("metrics"):
@@ -288,24 +684,23 @@ def auto_investigate(req: AutoInvestigateRequest):
 
     runbook_answer = get_rag().search_runbooks(query)
 
-    # Search incidents
-    incident_query = f"Past incidents similar to {alert_type.replace('_', ' ')}"
-    if "drift" in alert_type:
-        try:
-            fd_rows = get_sf().get_feature_drift(hours=2)
-            top_features = [r["feature_name"] for r in fd_rows[:3]] if fd_rows else []
-            if top_features:
-                incident_query += f" involving features {', '.join(top_features)}"
-        except Exception:
-            pass
-
-    incident_answer = get_rag().search_incidents(incident_query)
+    # Rank past incidents structurally (no RAG/LLM call); fall back to RAG text search.
+    component = alert.get("affected_component", "classifier_v2")
+    similar = get_incident_index().search(alert_type, component, fd_rows, k=3)
+    if similar:
+        incident_answer = format_similar_incidents(similar)
+    else:
+        incident_query = f"Past incidents similar to {alert_type.replace('_', ' ')}"
+        top_features = [r["feature_name"] for r in fd_rows[:3]]
+        if top_features:
+            incident_query += f" involving features {', '.join(top_features)}"
+        incident_answer = get_rag().search_incidents(incident_query)
 
     diagnosis = {
         "status": "complete",
-        "alert": alert,
         "root_cause_analysis": runbook_answer,
         "similar_incidents": incident_answer,
+        "similar_incidents_ranked": _serialize(similar),
         "recommended_actions": [
             {"action": "Send Slack notification", "priority": 1, "requires_approval": False},
             {"action": "Create GitHub issue", "priority": 2, "requires_approval": False},
@@ -313,7 +708,13 @@ def auto_investigate(req: AutoInvestigateRequest):
             {"action": "Rollback model (if retrain fails)", "priority": 4, "requires_approval": True},
         ],
     }
-    state.diagnosis = diagnosis
+    # A diagnosis built from local-index excerpts (RAG down) is not cached, so the
+    # full answer is generated once RAG is back.
+    degraded = is_local_fallback(runbook_answer) or (not similar and is_local_fallback(incident_answer))
+    if not degraded:
+        _diagnosis_cache.put(signature, diagnosis)
+    diagnosis = {**diagnosis, "alert": alert, "cached": False, "degraded": degraded}
+    diagnosis["diagnosis_id"] = get_store().save_diagnosis(diagnosis)
     return diagnosis
 
 
@@ -324,6 +725,7 @@ def auto_investigate(req: AutoInvestigateRequest):
 
 class ActionIndexRequest(BaseModel):
     index: int
+    idempotency_key: str | None = None  # defaults to one job per plan action; a failed one is requeued
 
 
 class SetActionsRequest(BaseModel):
@@ -332,23 +734,42 @@ class SetActionsRequest(BaseModel):
 
 @app.get("/api/actions")
 def get_actions():
-    return {"actions": state.actions}
+    return {"actions": get_store().plan_actions(), "plan_id": get_store().latest_plan_id()}
+
+
+@app.get("/api/actions/history")
+def get_action_history(plan_id: int | None = None, index: int | None = None):
+    store = get_store()
+    plan_id = plan_id if plan_id is not None else store.latest_plan_id()
+    if plan_id is None:
+        return {"plan_id": None, "history": []}
+    return {"plan_id": plan_id, "history": store.action_history(plan_id, index)}
 
 
 @app.post("/api/actions/set")
 def set_actions(req: SetActionsRequest):
-    state.actions = [
+    store = get_store()
+    actions = [
         {**act, "status": "pending", "timestamp": datetime.now(UTC).isoformat()}
         for act in req.actions
     ]
-    return {"actions": state.actions}
+    latest = store.latest_diagnosis()
+    plan_id = store.create_action_plan(actions, latest["diagnosis_id"] if latest else None)
+    return {"actions": actions, "plan_id": plan_id}
+
+
+def _get_action(index: int) -> tuple[int, dict]:
+    """(plan_id, action) for an index into the latest action plan."""
+    store = get_store()
+    plan_id = store.latest_plan_id()
+    actions = store.plan_actions(plan_id) if plan_id is not None else []
+    if index < 0 or index >= len(actions):
+        raise HTTPException(400, "Invalid action index")
+    return plan_id, actions[index]
 
 
 def _execute_slack(diagnosis: dict | None) -> str:
     """Send a Slack notification via Composio."""
-    from composio import ComposioToolSet, Action
-
-    toolset = ComposioToolSet()
     channel = settings.slack_channel or "#ml-alerts"
 
     # Build message from diagnosis or fallback
@@ -363,11 +784,15 @@ def _execute_slack(diagnosis: dict | None) -> str:
     else:
         msg = "*[AgentOps]* Action executed — no diagnosis context available."
 
-    kwargs = {"action": Action.SLACK_SENDS_A_MESSAGE_TO_A_SLACK_CHANNEL, "params": {"channel": channel, "text": msg}}
-    if settings.composio_slack_connection_id:
-        kwargs["connected_account_id"] = settings.composio_slack_connection_id
-
-    result = toolset.execute_action(**kwargs)
+    # A message held for a digest is sent when the window closes: the job stays
+    # running until then, so it only succeeds once Slack has the message and a
+    # failed digest fails (and retries) the job.
+    sent = get_notifier().slack(channel, msg)
+    wait_sec = settings.notify_digest_window_sec + settings.notify_max_wait_sec + settings.http_timeout_sec
+    try:
+        result = sent.result(timeout=wait_sec)
+    except FutureTimeout:
+        raise TimeoutError(f"Slack digest for {channel} not sent within {wait_sec:.0f}s") from None
     slack_ok = result.get("data", {}).get("ok", False)
     if slack_ok:
         return f"Slack message sent to {channel}"
@@ -379,13 +804,9 @@ def _execute_slack(diagnosis: dict | None) -> str:
 
 def _execute_github(diagnosis: dict | None) -> str:
     """Create a GitHub issue via the GitHub REST API."""
-    import requests as _requests
-
-    repo = settings.github_repo
-    token = settings.github_token
-    if not repo:
+    if not settings.github_repo:
         return "Skipped — GITHUB_REPO not configured in .env"
-    if not token:
+    if not settings.github_token:
         return "Skipped — GITHUB_TOKEN not configured in .env"
 
     alert = (diagnosis or {}).get("alert", {})
@@ -404,82 +825,136 @@ def _execute_github(diagnosis: dict | None) -> str:
 
     labels = ["agentops", severity]
 
-    resp = _requests.post(
-        f"https://api.github.com/repos/{repo}/issues",
-        headers={
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-        },
-        json={"title": title, "body": body, "labels": labels},
-        timeout=15,
-    )
+    try:
+        issue = get_notifier().github_issue(issue_key(alert), title, body, labels)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code >= 500 or e.response.status_code == 429:
+            raise  # the action queue retries it if the request never reached GitHub
+        try:
+            message = e.response.json().get("message", "")
+        except ValueError:
+            message = e.response.text[:200]
+        return f"GitHub API error {e.response.status_code}: {message}"
+    if issue is None:
+        return "Skipped — GitHub not configured"
+    verb = "created" if issue["action"] == "created" else "updated (comment added)"
+    return f"GitHub issue {verb}: {issue['url']}"
+
+
+def _action_kind(action: dict) -> str:
+    name = action.get("action", "").lower()
+    for kind in ("slack", "github", "retrain", "rollback"):
+        if kind in name:
+            return kind
+    return "noop"
+
+
+def _job_action_state(job: dict) -> dict:
+    """Action log entry reflecting a job's state."""
+    payload = job["payload"]
+    act = {**payload["action"], "job_id": job["id"]}
+    prefix = f"Approved at {payload['approved_at']} | " if payload.get("approved_at") else ""
+    ts = datetime.fromtimestamp(job["updated_at"], UTC).strftime("%H:%M:%S")
+    status = job["status"]
+    if status == "succeeded":
+        act["status"] = "completed"
+        act["details"] = f"{prefix}{job['result']} at {ts}"
+    elif status == "failed":
+        act["status"] = "failed"
+        act["details"] = f"{prefix}Failed after {job['attempts']} attempts at {ts} | Error: {job['error']}"
+    elif status == "running":
+        act["status"] = "running"
+        act["details"] = f"{prefix}Running (attempt {job['attempts']}/{job['max_attempts']})"
+    else:
+        act["status"] = "queued"
+        act["details"] = f"{prefix}Queued at {ts}"
+        if job["error"]:
+            act["details"] = f"{prefix}Retrying after error: {job['error']}"
+    return act
+
+
+def _record_job(job: dict):
+    if job["plan_id"] is not None:
+        get_store().append_action(job["plan_id"], job["idx"], _job_action_state(job))
+
+
+def get_action_queue() -> ActionQueue:
+    global _action_queue
+    if _action_queue is None:
+        _action_queue = ActionQueue(
+            get_store(),
+            handlers={
+                "slack": lambda p: _execute_slack(p.get("diagnosis")),
+                "github": lambda p: _execute_github(p.get("diagnosis")),
+                "retrain": lambda p: str(get_training().trigger()),
+                "rollback": lambda p: str(get_ml().rollback_model()),
+                "noop": lambda p: "Executed",
+            },
+            bus=action_bus,
+            idempotent_kinds=frozenset({"slack", "noop"}),
+            on_update=_record_job,
+            workers=settings.action_workers,
+            max_attempts=settings.action_max_attempts,
+            base_backoff_sec=settings.action_retry_backoff_sec,
+            lease_sec=settings.action_job_lease_sec,
+        )
+    return _action_queue
+
 
-    if resp.status_code == 201:
-        issue_url = resp.json().get("html_url", "")
-        return f"GitHub issue created: {issue_url}"
-    return f"GitHub API error {resp.status_code}: {resp.json().get('message', resp.text[:200])}"
+def _submit_action(plan_id: int, index: int, act: dict, key: str | None, approved: bool = False) -> dict:
+    """Queue an action's job; repeated submits with the same key return the same job."""
+    payload = {"action": act, "diagnosis": get_store().latest_diagnosis()}
+    if approved:
+        payload["approved_at"] = datetime.now(UTC).strftime("%H:%M:%S")
+    job, created = get_action_queue().submit(
+        _action_kind(act), payload, key or f"plan:{plan_id}:{index}", plan_id, index
+    )
+    current = get_store().plan_actions(plan_id)[index] if job["plan_id"] == plan_id else act
+    return {"action": current, "job": public_job(job), "duplicate": not created}
 
 
 @app.post("/api/actions/execute")
 def execute_action(req: ActionIndexRequest):
-    if req.index < 0 or req.index >= len(state.actions):
-        raise HTTPException(400, "Invalid action index")
-
-    act = state.actions[req.index]
+    """Queue the action and return its job immediately (see /api/actions/jobs/{id})."""
+    plan_id, act = _get_action(req.index)
     if act.get("requires_approval"):
         raise HTTPException(400, "This action requires approval")
+    return _submit_action(plan_id, req.index, act, req.idempotency_key)
 
-    action_name = act.get("action", "").lower()
-    ts = datetime.now(UTC).strftime("%H:%M:%S")
 
-    try:
-        if "slack" in action_name:
-            result = _execute_slack(state.diagnosis)
-            act["details"] = f"{result} at {ts}"
-        elif "github" in action_name:
-            result = _execute_github(state.diagnosis)
-            act["details"] = f"{result} at {ts}"
-        else:
-            act["details"] = f"Executed at {ts}"
-        act["status"] = "completed"
-    except Exception as e:
-        act["status"] = "completed"
-        act["details"] = f"Attempted at {ts} | Error: {e}"
+@app.post("/api/actions/approve")
+def approve_action(req: ActionIndexRequest):
+    plan_id, act = _get_action(req.index)
+    return _submit_action(plan_id, req.index, act, req.idempotency_key, approved=True)
 
-    return {"action": act}
 
+@app.get("/api/training")
+def training_status():
+    """Tracked retraining jobs per model type (cached; updated by the background tracker)."""
+    return get_training().snapshot()
 
-@app.post("/api/actions/approve")
-def approve_action(req: ActionIndexRequest):
-    if req.index < 0 or req.index >= len(state.actions):
-        raise HTTPException(400, "Invalid action index")
 
-    act = state.actions[req.index]
-    act["status"] = "completed"
-    act["details"] = f"Approved at {datetime.now(UTC).strftime('%H:%M:%S')}"
+@app.get("/api/actions/jobs")
+def list_action_jobs(plan_id: int | None = None, status: str | None = None, limit: int = 50):
+    store = get_store()
+    plan_id = plan_id if plan_id is not None else store.latest_plan_id()
+    return {"jobs": [public_job(j) for j in store.list_jobs(plan_id, status, min(limit, 200))]}
 
-    action_name = act.get("action", "").lower()
-    try:
-        if "retrain" in action_name:
-            result = get_ml().trigger_retraining()
-            act["details"] += f" | {result}"
-        elif "rollback" in action_name:
-            result = get_ml().rollback_model()
-            act["details"] += f" | {result}"
-    except Exception as e:
-        act["details"] += f" | API error: {e}"
 
-    return {"action": act}
+@app.get("/api/actions/jobs/{job_id}")
+def get_action_job(job_id: int):
+    job = get_store().get_job(job_id)
+    if job is None:
+        raise HTTPException(404, "Job not found")
+    return public_job(job)
 
 
 @app.post("/api/actions/deny")
 def deny_action(req: ActionIndexRequest):
-    if req.index < 0 or req.index >= len(state.actions):
-        raise HTTPException(400, "Invalid action index")
-
-    act = state.actions[req.index]
+    plan_id, act = _get_action(req.index)
     act["status"] = "denied"
     act["details"] = f"Denied at {datetime.now(UTC).strftime('%H:%M:%S')}"
+    get_store().append_action(plan_id, req.index, act)
     return {"action": act}
 
 
@@ -492,40 +967,92 @@ class SummarizeRequest(BaseModel):
     text: str
 
 
-@app.post("/api/crew/summarize")
-def crew_summarize(req: SummarizeRequest):
-    """Summarize a crew result using the configured LLM."""
+SUMMARY_MAX_TOKENS = 512
+NO_LLM_SUMMARY = "No LLM API key configured — cannot generate summary."
+
+
+def _summary_messages(text: str) -> list[dict]:
     prompt = (
         "You are an ML operations assistant. Summarize the following crew execution result "
         "in 3-5 concise bullet points. Focus on: what was detected, root cause, and actions taken or recommended. "
         "Be specific with metric values when available.\n\n"
-        f"{req.text[:8000]}"
+        f"{text[:8000]}"
     )
+    return [{"role": "user", "content": prompt}]
 
-    if settings.anthropic_api_key:
-        import anthropic
 
-        client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
-        msg = client.messages.create(
-            model="claude-sonnet-4-20250514",
-            max_tokens=512,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        summary = msg.content[0].text
-    elif settings.openai_api_key:
-        import openai
-
-        client = openai.OpenAI(api_key=settings.openai_api_key)
-        resp = client.chat.completions.create(
-            model="gpt-4o",
-            max_tokens=512,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        summary = resp.choices[0].message.content
-    else:
-        summary = "No LLM API key configured — cannot generate summary."
+@app.post("/api/crew/summarize")
+def crew_summarize(req: SummarizeRequest):
+    """Summarize a crew result using the configured LLM (identical requests are served from the LLM cache)."""
+    provider = get_provider()
+    if provider is None:
+        return {"summary": NO_LLM_SUMMARY, "cached": False}
+    messages = _summary_messages(req.text)
 
-    return {"summary": summary}
+    def call():
+        return provider.complete(messages, SUMMARY_MAX_TOKENS)
+
+    start = time.perf_counter()
+    cache = get_llm_cache()
+    try:
+        if cache is None:
+            summary, cached = call(), False
+        else:
+            summary, cached = cache.get_or_call(
+                provider.cache_model, messages, {"max_tokens": SUMMARY_MAX_TOKENS}, call
+            )
+    except Exception:
+        record("llm", provider.cache_model, time.perf_counter() - start, error=True)
+        raise
+    record("llm", provider.cache_model, time.perf_counter() - start, cached=cached,
+           tokens_in=0 if cached else approx_tokens(messages),
+           tokens_out=0 if cached else approx_tokens(summary))
+    return {"summary": summary, "cached": cached}
+
+
+@app.post("/api/crew/summarize/stream")
+async def crew_summarize_stream(req: SummarizeRequest):
+    """Stream the summary over SSE: "token" events as the LLM produces text, then "done".
+
+    A cached summary is sent as a single token; a completed stream is cached.
+    """
+    provider = get_provider()
+    messages = _summary_messages(req.text)
+    cache = get_llm_cache()
+    key = (
+        cache_key(provider.cache_model, messages, {"max_tokens": SUMMARY_MAX_TOKENS})
+        if provider is not None and cache is not None else None
+    )
+
+    async def generate():
+        if provider is None:
+            yield {"event": "token", "data": json.dumps({"text": NO_LLM_SUMMARY})}
+            yield {"event": "done", "data": json.dumps({"summary": NO_LLM_SUMMARY, "cached": False})}
+            return
+        start = time.perf_counter()
+        cached = await asyncio.to_thread(cache.get, key) if key else None
+        if cached is not None:
+            record("llm", provider.cache_model, time.perf_counter() - start, cached=True)
+            yield {"event": "token", "data": json.dumps({"text": cached})}
+            yield {"event": "done", "data": json.dumps({"summary": cached, "cached": True})}
+            return
+        parts = []
+        try:
+            async for text in provider.astream(messages, SUMMARY_MAX_TOKENS):
+                parts.append(text)
+                yield {"event": "token", "data": json.dumps({"text": text})}
+        except Exception as e:
+            record("llm", provider.cache_model, time.perf_counter() - start, error=True)
+            yield {"event": "error", "data": json.dumps({"message": f"{type(e).__name__}: {e}"[:300]})}
+            return
+        summary = "".join(parts)
+        record("llm", provider.cache_model, time.perf_counter() - start,
+               tokens_in=approx_tokens(messages), tokens_out=approx_tokens(summary))
+        if key and summary:
+            await asyncio.to_thread(cache.put, key, summary, provider.cache_model)
+        yield {"event": "done", "data": json.dumps({"summary": summary, "cached": False})}
+
+    return EventSourceResponse(generate())
 
 
 # =========================================================================
@@ -539,6 +1066,8 @@ def crew_status():
         "running": state.crew_running,
         "result": state.crew_result,
         "error": state.crew_error,
+        "warm_up": state.warm_up,
+        "telemetry": state.crew_telemetry,
     }
 
 
@@ -549,6 +1078,7 @@ def crew_start():
 
     state.crew_running = True
     state.crew_result = None
+    state.crew_telemetry = None
     state.crew_error = None
     event_bus.clear_history()
 
@@ -561,7 +1091,10 @@ def crew_start():
             from crew.crew import AgentOpsCrew
 
             crew = AgentOpsCrew()
-            result = crew.run(context="Check for model drift — elevated drift on V14 and V17.")
+            try:
+                result = crew.run(context="Check for model drift — elevated drift on V14 and V17.")
+            finally:
+                state.crew_telemetry = crew.last_telemetry
             state.crew_result = result
             event_bus.publish(CrewEvent(event_type="complete", data=result))
         except BrokenPipeError:
@@ -0,0 +1,85 @@
+"""Cache of generated diagnoses keyed by alert signature.
+
+Repeated or flapping alerts of the same shape (type, component, top drifting
+features, severity) reuse the diagnosis built for the first one. Entries
+expire after a TTL and are invalidated when the ingested RAG corpus changes.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from integrations.rag_ingest import MANIFEST_PATH, corpus_version
+
+# Features with PSI above this count toward the signature.
+SIGNATURE_PSI_MIN = 0.2
+SIGNATURE_TOP_FEATURES = 3
+
+
+def alert_signature(alert: dict, drift_rows: list[dict] | None = None) -> tuple:
+    """(alert_type, component, top drifting features, severity bucket)."""
+    features = sorted(
+        r["feature_name"]
+        for r in sorted(drift_rows or [], key=lambda r: -(r.get("psi_score") or 0))[
+            :SIGNATURE_TOP_FEATURES
+        ]
+        if (r.get("psi_score") or 0) > SIGNATURE_PSI_MIN
+    )
+    severity = alert.get("severity")
+    if severity not in ("critical", "warning", "info"):
+        severity = "unknown"
+    return (
+        alert.get("alert_type", "unknown"),
+        alert.get("affected_component", "unknown"),
+        tuple(features),
+        severity,
+    )
+
+
+class DiagnosisCache:
+    def __init__(self, ttl_sec: float = 900.0, max_entries: int = 256):
+        self.ttl_sec = ttl_sec
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[float, str, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = ""
+        self._version_mtime: float | None = None
+
+    def corpus_version(self) -> str:
+        """Version of the ingested corpus, re-read only when the manifest changes."""
+        try:
+            mtime = MANIFEST_PATH.stat().st_mtime
+        except OSError:
+            mtime = None
+        if mtime != self._version_mtime or not self._version:
+            self._version = corpus_version() if mtime is not None else "none"
+            self._version_mtime = mtime
+        return self._version
+
+    def get(self, key: tuple) -> dict | None:
+        version = self.corpus_version()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, entry_version, diagnosis = entry
+            if entry_version != version or time.time() - stored_at > self.ttl_sec:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return {**diagnosis, "cached_at": stored_at, "corpus_version": entry_version}
+
+    def put(self, key: tuple, diagnosis: dict):
+        version = self.corpus_version()
+        with self._lock:
+            self._entries[key] = (time.time(), version, diagnosis)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: tuple | None = None):
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
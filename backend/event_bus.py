@@ -2,6 +2,7 @@
 
 import queue
 import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime, UTC
 from typing import Optional
@@ -16,19 +17,25 @@ class CrewEvent:
 
 
 class EventBus:
-    def __init__(self):
+    def __init__(self, max_history: int | None = None):
         self._subscribers: list[queue.Queue] = []
         self._lock = threading.Lock()
-        self._history: list[CrewEvent] = []
+        self._history: deque[CrewEvent] = deque(maxlen=max_history)
 
-    def subscribe(self) -> queue.Queue:
+    def subscribe(self, replay: bool = True) -> queue.Queue:
         q: queue.Queue[CrewEvent] = queue.Queue()
         with self._lock:
-            for event in self._history:
-                q.put(event)
+            if replay:
+                for event in self._history:
+                    q.put(event)
             self._subscribers.append(q)
         return q
 
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
     def unsubscribe(self, q: queue.Queue):
         with self._lock:
             try:
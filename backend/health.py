@@ -0,0 +1,121 @@
+"""Cached, concurrent dependency health checks.
+
+Every dependency is probed in parallel with a short timeout. Probes go
+through the clients, and so through the same circuit breakers as every
+other call (an open breaker is reported without probing). Results are cached for a few seconds; once stale, the next read
+returns the cached result immediately and triggers one background refresh,
+so /api/health never waits on a slow dependency after the first check.
+
+A probe that overruns its timeout counts as a breaker failure, and the
+dependency is not probed again until that probe has ended — it is reported
+down (stale) meanwhile — so one hung dependency can't tie up the pool and
+starve the others' probes.
+"""
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime, UTC
+from typing import Any, Callable
+
+from integrations.resilience import CircuitOpenError, LatencyHistogram, get_breaker
+
+
+class HealthAggregator:
+    def __init__(
+        self,
+        probes: dict[str, Callable[[float], Any]],
+        timeout_sec: float = 2.0,
+        ttl_sec: float = 5.0,
+    ):
+        """`probes` maps dependency name → fn(timeout_sec); raising means unhealthy."""
+        self.probes = probes
+        self.timeout_sec = timeout_sec
+        self.ttl_sec = ttl_sec
+        self.latency = {name: LatencyHistogram() for name in probes}
+        # At most one probe per dependency is in flight, so one worker each is enough.
+        self._executor = ThreadPoolExecutor(max_workers=max(1, len(probes)), thread_name_prefix="health")
+        self._inflight: dict[str, Future] = {}
+        self._cache: dict | None = None
+        self._checked_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def _probe(self, name: str) -> dict:
+        start = time.perf_counter()
+        try:
+            self.probes[name](self.timeout_sec)
+        except CircuitOpenError:
+            return {"ok": False, "error": "circuit open", "latency_ms": None}
+        except Exception as e:
+            ms = (time.perf_counter() - start) * 1000
+            self.latency[name].observe(ms)
+            return {"ok": False, "error": f"{type(e).__name__}: {e}"[:200], "latency_ms": round(ms, 1)}
+        ms = (time.perf_counter() - start) * 1000
+        self.latency[name].observe(ms)
+        return {"ok": True, "error": None, "latency_ms": round(ms, 1)}
+
+    def refresh(self) -> dict:
+        """Probe every dependency concurrently; blocks at most ~timeout_sec."""
+        futures, running = {}, set()
+        with self._lock:
+            for name in self.probes:
+                previous = self._inflight.get(name)
+                if previous is not None and not previous.done():
+                    running.add(name)
+                else:
+                    futures[name] = self._inflight[name] = self._executor.submit(self._probe, name)
+        wait(futures.values(), timeout=self.timeout_sec + 0.25)
+        details = {}
+        for name in self.probes:
+            fut = futures.get(name)
+            if name in running:
+                details[name] = {"ok": False, "error": "previous probe still running", "latency_ms": None,
+                                 "stale": True}
+            elif fut.done():
+                details[name] = fut.result()
+            else:
+                # An overrun is a failure even if the client's own timeouts are longer.
+                get_breaker(name).record_failure()
+                details[name] = {"ok": False, "error": "timeout", "latency_ms": None}
+            details[name]["breaker"] = get_breaker(name).snapshot()
+        with self._lock:
+            self._cache = details
+            self._checked_at = time.time()
+            self._refreshing = False
+        return details
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._safe_refresh, name="health-refresh", daemon=True).start()
+
+    def _safe_refresh(self):
+        try:
+            self.refresh()
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self) -> dict:
+        """{dependency: bool, ..., "details": {...}} — cached, stale-while-revalidate."""
+        with self._lock:
+            cache, checked_at = self._cache, self._checked_at
+        if cache is None:
+            cache = self.refresh()
+            checked_at = self._checked_at
+        elif time.time() - checked_at > self.ttl_sec:
+            self._refresh_in_background()
+        return {
+            **{name: d["ok"] for name, d in cache.items()},
+            "details": cache,
+            "checked_at": datetime.fromtimestamp(checked_at, UTC).isoformat(),
+        }
+
+    def stats(self) -> dict:
+        return {
+            name: {"latency": self.latency[name].snapshot(), "breaker": get_breaker(name).snapshot()}
+            for name in self.probes
+        }
@@ -0,0 +1,119 @@
+"""Live metrics channel: one refresher, many SSE subscribers.
+
+A single LiveMetricsHub task refreshes every dashboard section (model
+metrics, data quality, health, incidents, metric trends) on a fixed cadence
+and publishes only what changed: whole sections when their content differs,
+and just the new rows for trends. New subscribers get the current snapshot
+first. Warehouse load is one refresh per interval no matter how many
+viewers are connected, and the refresher idles while nobody is.
+"""
+
+import asyncio
+import json
+import threading
+from collections import deque
+from datetime import datetime, UTC, timedelta
+from typing import Any, Callable
+
+from backend.event_bus import CrewEvent, EventBus
+
+
+def _iso(ts) -> str:
+    return ts.isoformat() if isinstance(ts, datetime) else str(ts)
+
+
+class LiveMetricsHub:
+    def __init__(
+        self,
+        sections: dict[str, Callable[[], Any]],
+        trend_source: Callable[[int], list[dict]],
+        interval_sec: float = 15.0,
+        trend_hours: int = 24,
+    ):
+        self.sections = sections
+        self.trend_source = trend_source
+        self.interval_sec = interval_sec
+        self.trend_hours = trend_hours
+        self.bus = EventBus(max_history=0)
+        self._state: dict[str, Any] = {}
+        self._encoded: dict[str, str] = {}
+        self._trend: deque[dict] = deque()
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._wake = asyncio.Event()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                **self._state,
+                "trend": {"hours": self.trend_hours, "rows": list(self._trend)},
+                "interval_sec": self.interval_sec,
+            }
+
+    def subscribe(self):
+        q = self.bus.subscribe(replay=False)
+        if not self._state:
+            self._wake.set()  # nothing cached yet: refresh now rather than at the next tick
+        return q
+
+    def unsubscribe(self, q):
+        self.bus.unsubscribe(q)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="live-metrics")
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def _publish(self, name: str, payload: Any):
+        self.bus.publish(CrewEvent(event_type=name, data=json.dumps(payload, default=str)))
+
+    def refresh(self):
+        """Fetch every section once and publish the deltas (blocking)."""
+        for name, fetch in self.sections.items():
+            try:
+                value = fetch()
+            except Exception:
+                continue  # keep the last good value
+            encoded = json.dumps(value, default=str, sort_keys=True)
+            with self._lock:
+                if self._encoded.get(name) == encoded:
+                    continue
+                self._encoded[name] = encoded
+                self._state[name] = value
+            self._publish(name, value)
+
+        try:
+            new_rows = self._refresh_trend()
+        except Exception:
+            new_rows = []
+        if new_rows:
+            self._publish("trend", {"rows": new_rows})
+
+    def _refresh_trend(self) -> list[dict]:
+        with self._lock:
+            last_ts = self._trend[-1]["ts"] if self._trend else None
+        # After the first load only the recent tail is re-read.
+        hours = self.trend_hours if last_ts is None else max(1, int(self.interval_sec // 3600) + 1)
+        rows = [{**r, "ts": _iso(r["ts"])} for r in self.trend_source(hours)]
+        new_rows = [r for r in rows if last_ts is None or r["ts"] > last_ts]
+        cutoff = (datetime.now(UTC).replace(tzinfo=None) - timedelta(hours=self.trend_hours)).isoformat()
+        with self._lock:
+            self._trend.extend(new_rows)
+            while self._trend and self._trend[0]["ts"] < cutoff:
+                self._trend.popleft()
+        return new_rows
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            if self.bus.subscriber_count:
+                await asyncio.to_thread(self.refresh)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.interval_sec)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,124 @@
+"""Background alert evaluation on a per-model cadence.
+
+One asyncio task per model calls the (blocking) evaluation function in a
+worker thread, caches the result and publishes any alert state changes on an
+EventBus for SSE clients. Runs are spread out with jitter and back off
+exponentially while evaluation fails, so Snowflake load depends on the
+schedule, not on how many dashboards are open.
+"""
+
+import asyncio
+import json
+import random
+import threading
+import time
+from typing import Callable
+
+from backend.event_bus import CrewEvent, EventBus
+
+
+def parse_schedule(spec: str, default_interval: float) -> dict[str, float]:
+    """'classifier_v2=60,fraud_v1' → {'classifier_v2': 60.0, 'fraud_v1': default_interval}."""
+    schedule = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        model, _, interval = item.partition("=")
+        schedule[model.strip()] = float(interval) if interval.strip() else default_interval
+    return schedule
+
+
+class AlertScheduler:
+    def __init__(
+        self,
+        evaluate: Callable[[str], dict],
+        schedule: dict[str, float],
+        bus: EventBus,
+        jitter: float = 0.1,
+        max_backoff_sec: float = 600.0,
+    ):
+        self.evaluate = evaluate
+        self.schedule = schedule
+        self.bus = bus
+        self.jitter = jitter
+        self.max_backoff_sec = max_backoff_sec
+        self._tasks: list[asyncio.Task] = []
+        self._latest: dict[str, dict] = {}
+        self._failures: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return any(not t.done() for t in self._tasks)
+
+    def start(self):
+        """Start one task per model on the running event loop."""
+        if self.running:
+            return
+        self._tasks = [
+            asyncio.create_task(self._run(model, interval), name=f"alert-eval-{model}")
+            for model, interval in self.schedule.items()
+        ]
+
+    async def stop(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def latest(self, model: str, max_age_sec: float | None = None) -> dict | None:
+        """Cached evaluation for a model, if younger than max_age_sec."""
+        with self._lock:
+            entry = self._latest.get(model)
+        if entry is None:
+            return None
+        if max_age_sec is not None and time.time() - entry["evaluated_at"] > max_age_sec:
+            return None
+        return entry
+
+    def record(self, model: str, result: dict):
+        """Cache an evaluation and publish its state changes."""
+        with self._lock:
+            self._latest[model] = {**result, "evaluated_at": time.time()}
+        if result.get("changes"):
+            self.bus.publish(CrewEvent(
+                event_type="alert_change",
+                data=json.dumps({
+                    "model": model,
+                    "changes": result["changes"],
+                    "alerts": result.get("alerts", []),
+                }, default=str),
+            ))
+
+    def status(self) -> dict:
+        with self._lock:
+            return {
+                "running": self.running,
+                "models": {
+                    model: {
+                        "interval_sec": interval,
+                        "consecutive_failures": self._failures.get(model, 0),
+                        "last_evaluated_at": self._latest.get(model, {}).get("evaluated_at"),
+                    }
+                    for model, interval in self.schedule.items()
+                },
+            }
+
+    def _delay(self, interval: float, failures: int) -> float:
+        base = min(interval * 2 ** failures, max(interval, self.max_backoff_sec))
+        return base * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    async def _run(self, model: str, interval: float):
+        # Spread the first runs so models don't all query at once.
+        await asyncio.sleep(random.uniform(0, interval * self.jitter))
+        while True:
+            try:
+                result = await asyncio.to_thread(self.evaluate, model)
+                self._failures[model] = 0
+                self.record(model, result)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self._failures[model] = self._failures.get(model, 0) + 1
+            await asyncio.sleep(self._delay(interval, self._failures.get(model, 0)))
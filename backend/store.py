@@ -0,0 +1,462 @@
+"""Persistent store for alerts, diagnoses and remediation actions.
+
+SQLite in WAL mode: readers never block the writer, so several uvicorn
+workers can share one database file. Alerts are keyed by fingerprint and
+indexed by model, type, status and time; list endpoints page with opaque
+keyset cursors instead of returning everything. Action status changes are
+appended to action_log and never rewritten — an action's current state is
+its latest log entry. action_jobs is the durable queue behind action
+execution: one row per idempotency key, claimed by workers atomically.
+"""
+
+import base64
+import contextlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+STALE_JOB_ERROR = "Interrupted while running; it may have reached the service — verify before retrying"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    fingerprint TEXT PRIMARY KEY,
+    alert_id TEXT NOT NULL,
+    model TEXT NOT NULL,
+    alert_type TEXT NOT NULL,
+    severity TEXT,
+    status TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    occurrences INTEGER NOT NULL DEFAULT 1,
+    flapping INTEGER NOT NULL DEFAULT 0,
+    transitions TEXT NOT NULL DEFAULT '[]',
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_alerts_model ON alerts(model, last_seen);
+CREATE INDEX IF NOT EXISTS idx_alerts_type ON alerts(alert_type, last_seen);
+CREATE INDEX IF NOT EXISTS idx_alerts_status ON alerts(status, last_seen);
+CREATE INDEX IF NOT EXISTS idx_alerts_last_seen ON alerts(last_seen);
+
+CREATE TABLE IF NOT EXISTS alert_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    fingerprint TEXT NOT NULL,
+    event TEXT NOT NULL,
+    severity TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_alert_events_fp ON alert_events(fingerprint, ts);
+
+CREATE TABLE IF NOT EXISTS diagnoses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    alert_id TEXT,
+    model TEXT,
+    alert_type TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_diagnoses_model ON diagnoses(model, created_at);
+CREATE INDEX IF NOT EXISTS idx_diagnoses_type ON diagnoses(alert_type, created_at);
+
+CREATE TABLE IF NOT EXISTS action_plans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at REAL NOT NULL,
+    diagnosis_id INTEGER,
+    size INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS action_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts REAL NOT NULL,
+    plan_id INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_action_log_plan ON action_log(plan_id, idx, id);
+CREATE INDEX IF NOT EXISTS idx_action_log_status ON action_log(status, ts);
+
+CREATE TABLE IF NOT EXISTS action_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    kind TEXT NOT NULL,
+    plan_id INTEGER,
+    idx INTEGER,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    next_run_at REAL NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_action_jobs_due ON action_jobs(status, next_run_at);
+CREATE INDEX IF NOT EXISTS idx_action_jobs_plan ON action_jobs(plan_id, idx);
+"""
+
+
+def encode_cursor(sort_value: float, key) -> str:
+    return base64.urlsafe_b64encode(json.dumps([sort_value, key]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[float, object]:
+    try:
+        sort_value, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(sort_value), key
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class Store:
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        if self.path == ":memory:" or self.path.startswith("file::memory:"):
+            # Connections are per thread, so each thread would get its own empty database.
+            raise ValueError("Store needs a file path (use a temp file for throwaway stores), not ':memory:'")
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not thread-safe)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=10000")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, fn):
+        """Run fn(conn) inside one IMMEDIATE transaction (the open one, inside transaction())."""
+        conn = self._conn()
+        if getattr(self._local, "in_transaction", False):
+            return fn(conn)
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = fn(conn)
+                conn.execute("COMMIT")
+                return result
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    @contextlib.contextmanager
+    def transaction(self):
+        """Hold one IMMEDIATE transaction for every read and write this thread makes
+        in the block, so a read-modify-write can't interleave with another process's."""
+        conn = self._conn()
+        if getattr(self._local, "in_transaction", False):
+            yield
+            return
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.in_transaction = True
+            try:
+                yield
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._local.in_transaction = False
+
+    # -- alerts ------------------------------------------------------------
+
+    def save_alerts(self, records: list[dict], events: list[dict] = ()):
+        """Upsert alert records and append their state-change events atomically."""
+        rows = [
+            (
+                r["fingerprint"], r["alert"].get("alert_id", r["fingerprint"]),
+                r["alert"].get("affected_component", "unknown"),
+                r["alert"].get("alert_type", "unknown"), r["alert"].get("severity"),
+                r["status"], r["first_seen"], r["last_seen"], r["occurrences"],
+                int(r["flapping"]), json.dumps(r["transitions"]), json.dumps(r["alert"], default=str),
+            )
+            for r in records
+        ]
+        event_rows = [(e["ts"], e["fingerprint"], e["event"], e.get("severity")) for e in events]
+
+        def write(conn):
+            conn.executemany(
+                "INSERT INTO alerts (fingerprint, alert_id, model, alert_type, severity, status, "
+                "first_seen, last_seen, occurrences, flapping, transitions, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(fingerprint) DO UPDATE SET alert_id=excluded.alert_id, "
+                "severity=excluded.severity, status=excluded.status, first_seen=excluded.first_seen, "
+                "last_seen=excluded.last_seen, occurrences=excluded.occurrences, "
+                "flapping=excluded.flapping, transitions=excluded.transitions, payload=excluded.payload",
+                rows,
+            )
+            conn.executemany(
+                "INSERT INTO alert_events (ts, fingerprint, event, severity) VALUES (?, ?, ?, ?)",
+                event_rows,
+            )
+
+        self._write(write)
+
+    def delete_alerts(self, fingerprints: list[str]):
+        self._write(lambda conn: conn.executemany(
+            "DELETE FROM alerts WHERE fingerprint = ?", [(fp,) for fp in fingerprints]
+        ))
+
+    def load_alert_records(self, since: float) -> list[dict]:
+        """Active alerts plus any touched since `since` (epoch seconds)."""
+        rows = self._conn().execute(
+            "SELECT * FROM alerts WHERE status = 'active' "
+            "UNION SELECT * FROM alerts WHERE last_seen >= ?",
+            (since,),
+        ).fetchall()
+        return [
+            {
+                "fingerprint": r["fingerprint"],
+                "alert": json.loads(r["payload"]),
+                "status": r["status"],
+                "first_seen": r["first_seen"],
+                "last_seen": r["last_seen"],
+                "occurrences": r["occurrences"],
+                "flapping": bool(r["flapping"]),
+                "transitions": json.loads(r["transitions"]),
+            }
+            for r in rows
+        ]
+
+    def list_alerts(
+        self,
+        status: str | None = None,
+        model: str | None = None,
+        alert_type: str | None = None,
+        limit: int = 50,
+        cursor: str | None = None,
+    ) -> tuple[list[dict], str | None]:
+        """Alert payloads newest first, and the cursor for the next page (None at the end)."""
+        where, params = [], []
+        for col, val in (("status", status), ("model", model), ("alert_type", alert_type)):
+            if val:
+                where.append(f"{col} = ?")
+                params.append(val)
+        if cursor:
+            last_seen, fp = decode_cursor(cursor)
+            where.append("(last_seen < ? OR (last_seen = ? AND fingerprint < ?))")
+            params += [last_seen, last_seen, fp]
+        sql = "SELECT fingerprint, last_seen, payload FROM alerts"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY last_seen DESC, fingerprint DESC LIMIT ?"
+        rows = self._conn().execute(sql, (*params, limit + 1)).fetchall()
+        items = [json.loads(r["payload"]) for r in rows[:limit]]
+        next_cursor = encode_cursor(rows[limit - 1]["last_seen"], rows[limit - 1]["fingerprint"]) \
+            if len(rows) > limit else None
+        return items, next_cursor
+
+    def list_alert_events(self, limit: int = 100, cursor: str | None = None) -> tuple[list[dict], str | None]:
+        params: list = []
+        sql = "SELECT * FROM alert_events"
+        if cursor:
+            _, last_id = decode_cursor(cursor)
+            sql += " WHERE id < ?"
+            params.append(int(last_id))
+        sql += " ORDER BY id DESC LIMIT ?"
+        rows = self._conn().execute(sql, (*params, limit + 1)).fetchall()
+        items = [dict(r) for r in rows[:limit]]
+        next_cursor = encode_cursor(0, rows[limit - 1]["id"]) if len(rows) > limit else None
+        return items, next_cursor
+
+    # -- diagnoses -----------------------------------------------------------
+
+    def save_diagnosis(self, diagnosis: dict) -> int:
+        alert = diagnosis.get("alert") or {}
+        return self._write(lambda conn: conn.execute(
+            "INSERT INTO diagnoses (created_at, alert_id, model, alert_type, payload) VALUES (?, ?, ?, ?, ?)",
+            (time.time(), alert.get("alert_id"), alert.get("affected_component"),
+             alert.get("alert_type"), json.dumps(diagnosis, default=str)),
+        ).lastrowid)
+
+    def latest_diagnosis(self) -> dict | None:
+        row = self._conn().execute(
+            "SELECT id, payload FROM diagnoses ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+        return {**json.loads(row["payload"]), "diagnosis_id": row["id"]} if row else None
+
+    def list_diagnoses(
+        self, model: str | None = None, limit: int = 20, cursor: str | None = None
+    ) -> tuple[list[dict], str | None]:
+        where, params = [], []
+        if model:
+            where.append("model = ?")
+            params.append(model)
+        if cursor:
+            _, last_id = decode_cursor(cursor)
+            where.append("id < ?")
+            params.append(int(last_id))
+        sql = "SELECT id, payload FROM diagnoses"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY id DESC LIMIT ?"
+        rows = self._conn().execute(sql, (*params, limit + 1)).fetchall()
+        items = [{**json.loads(r["payload"]), "diagnosis_id": r["id"]} for r in rows[:limit]]
+        next_cursor = encode_cursor(0, rows[limit - 1]["id"]) if len(rows) > limit else None
+        return items, next_cursor
+
+    # -- actions -------------------------------------------------------------
+
+    def create_action_plan(self, actions: list[dict], diagnosis_id: int | None = None) -> int:
+        """Start a new plan; each action's first log entry is its initial state."""
+        now = time.time()
+
+        def write(conn):
+            plan_id = conn.execute(
+                "INSERT INTO action_plans (created_at, diagnosis_id, size) VALUES (?, ?, ?)",
+                (now, diagnosis_id, len(actions)),
+            ).lastrowid
+            conn.executemany(
+                "INSERT INTO action_log (ts, plan_id, idx, status, payload) VALUES (?, ?, ?, ?, ?)",
+                [(now, plan_id, i, a.get("status", "pending"), json.dumps(a, default=str))
+                 for i, a in enumerate(actions)],
+            )
+            return plan_id
+
+        return self._write(write)
+
+    def latest_plan_id(self) -> int | None:
+        row = self._conn().execute("SELECT MAX(id) AS id FROM action_plans").fetchone()
+        return row["id"]
+
+    def plan_actions(self, plan_id: int | None = None) -> list[dict]:
+        """Current state of every action in a plan (default: the latest plan)."""
+        plan_id = plan_id if plan_id is not None else self.latest_plan_id()
+        if plan_id is None:
+            return []
+        rows = self._conn().execute(
+            "SELECT payload FROM action_log WHERE id IN ("
+            "  SELECT MAX(id) FROM action_log WHERE plan_id = ? GROUP BY idx"
+            ") ORDER BY idx",
+            (plan_id,),
+        ).fetchall()
+        return [json.loads(r["payload"]) for r in rows]
+
+    def append_action(self, plan_id: int, idx: int, action: dict):
+        self._write(lambda conn: conn.execute(
+            "INSERT INTO action_log (ts, plan_id, idx, status, payload) VALUES (?, ?, ?, ?, ?)",
+            (time.time(), plan_id, idx, action.get("status", "pending"), json.dumps(action, default=str)),
+        ))
+
+    def action_history(self, plan_id: int, idx: int | None = None) -> list[dict]:
+        sql = "SELECT ts, idx, status, payload FROM action_log WHERE plan_id = ?"
+        params: list = [plan_id]
+        if idx is not None:
+            sql += " AND idx = ?"
+            params.append(idx)
+        rows = self._conn().execute(sql + " ORDER BY id", params).fetchall()
+        return [{"ts": r["ts"], "idx": r["idx"], "status": r["status"], **json.loads(r["payload"])} for r in rows]
+
+    # -- action jobs ---------------------------------------------------------
+
+    @staticmethod
+    def _job(row) -> dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def enqueue_job(
+        self, key: str, kind: str, payload: dict,
+        plan_id: int | None = None, idx: int | None = None, max_attempts: int = 3,
+    ) -> tuple[dict, bool]:
+        """Insert a queued job unless `key` exists. Returns (job, created).
+
+        A job for `key` that has failed is queued again from scratch (a retry
+        from the UI); a queued, running or succeeded one is returned as is.
+        """
+        now = time.time()
+
+        def write(conn):
+            created = conn.execute(
+                "INSERT INTO action_jobs (idempotency_key, kind, plan_id, idx, status, max_attempts, "
+                "next_run_at, created_at, updated_at, payload) VALUES (?, ?, ?, ?, 'queued', ?, ?, ?, ?, ?) "
+                "ON CONFLICT(idempotency_key) DO UPDATE SET status = 'queued', attempts = 0, "
+                "max_attempts = excluded.max_attempts, result = NULL, error = NULL, "
+                "next_run_at = excluded.next_run_at, updated_at = excluded.updated_at, payload = excluded.payload "
+                "WHERE action_jobs.status = 'failed'",
+                (key, kind, plan_id, idx, max_attempts, now, now, now, json.dumps(payload, default=str)),
+            ).rowcount == 1
+            row = conn.execute("SELECT * FROM action_jobs WHERE idempotency_key = ?", (key,)).fetchone()
+            return self._job(row), created
+
+        return self._write(write)
+
+    def claim_job(self) -> dict | None:
+        """Atomically move the oldest due job to 'running' and return it."""
+        now = time.time()
+        row = self._write(lambda conn: conn.execute(
+            "UPDATE action_jobs SET status = 'running', attempts = attempts + 1, updated_at = ? "
+            "WHERE id = (SELECT id FROM action_jobs WHERE status = 'queued' AND next_run_at <= ? "
+            "            ORDER BY next_run_at, id LIMIT 1) "
+            "RETURNING *",
+            (now, now),
+        ).fetchone())
+        return self._job(row) if row else None
+
+    def finish_job(self, job_id: int, status: str, result: str | None = None, error: str | None = None,
+                   next_run_at: float | None = None):
+        """Record an outcome; status 'queued' with next_run_at schedules a retry."""
+        now = time.time()
+        self._write(lambda conn: conn.execute(
+            "UPDATE action_jobs SET status = ?, result = ?, error = ?, updated_at = ?, "
+            "next_run_at = COALESCE(?, next_run_at) WHERE id = ?",
+            (status, result, error, now, next_run_at, job_id),
+        ))
+
+    def touch_job(self, job_id: int):
+        """Extend a running job's lease (its worker is still alive)."""
+        now = time.time()
+        self._write(lambda conn: conn.execute(
+            "UPDATE action_jobs SET updated_at = ? WHERE id = ? AND status = 'running'", (now, job_id),
+        ))
+
+    def recover_stale_jobs(self, lease_sec: float, retryable_kinds: frozenset[str]) -> list[dict]:
+        """Settle jobs stuck in 'running' for longer than lease_sec (a crashed worker).
+
+        Jobs of `retryable_kinds` go back to the queue; any other job may already
+        have taken effect, so it is failed for someone to check. Returns the jobs changed.
+        """
+        now = time.time()
+        kinds = sorted(retryable_kinds)
+        marks = ", ".join("?" * len(kinds)) or "NULL"
+
+        def write(conn):
+            requeued = conn.execute(
+                f"UPDATE action_jobs SET status = 'queued', updated_at = ?, next_run_at = ? "
+                f"WHERE status = 'running' AND updated_at < ? AND kind IN ({marks}) RETURNING *",
+                (now, now, now - lease_sec, *kinds),
+            ).fetchall()
+            failed = conn.execute(
+                "UPDATE action_jobs SET status = 'failed', updated_at = ?, error = ? "
+                "WHERE status = 'running' AND updated_at < ? RETURNING *",
+                (now, STALE_JOB_ERROR, now - lease_sec),
+            ).fetchall()
+            return [self._job(r) for r in (*requeued, *failed)]
+
+        return self._write(write)
+
+    def get_job(self, job_id: int) -> dict | None:
+        row = self._conn().execute("SELECT * FROM action_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row else None
+
+    def list_jobs(self, plan_id: int | None = None, status: str | None = None, limit: int = 50) -> list[dict]:
+        where, params = [], []
+        for col, val in (("plan_id", plan_id), ("status", status)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                params.append(val)
+        sql = "SELECT * FROM action_jobs"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        rows = self._conn().execute(sql + " ORDER BY id DESC LIMIT ?", (*params, limit)).fetchall()
+        return [self._job(r) for r in rows]
@@ -19,9 +19,9 @@ from dotenv import load_dotenv
 
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
-from config import settings
 from integrations.snowflake_client import SnowflakeClient
 from integrations.rag_client import RAGClient
+from monitoring.rules import get_rule_engine
 
 # ---------------------------------------------------------------------------
 # Page config
@@ -102,24 +102,14 @@ def fetch_model_metrics(sf: SnowflakeClient) -> dict:
         return {"status": "unknown", "f1": None, "drift": None, "latency": None, "anomaly_rate": None, "count": 0}
 
     latest = rows[0]
-    f1 = latest.get("f1_score", 0)
-    drift = latest.get("drift_score", 0)
-    latency = latest.get("latency_p99_ms", 0)
-    anomaly = latest.get("anomaly_rate", 0)
-
-    if f1 < 0.88 - settings.accuracy_drop_threshold or drift > settings.drift_threshold:
-        status = "critical"
-    elif f1 < 0.88 or drift > 0.2:
-        status = "warning"
-    else:
-        status = "healthy"
+    assessment = get_rule_engine().assess_one(latest.get("model_name", "classifier_v2"), latest)
 
     return {
-        "status": status,
-        "f1": f1,
-        "drift": drift,
-        "latency": latency,
-        "anomaly_rate": anomaly,
+        "status": assessment.status,
+        "f1": latest.get("f1_score", 0),
+        "drift": latest.get("drift_score", 0),
+        "latency": latest.get("latency_p99_ms", 0),
+        "anomaly_rate": latest.get("anomaly_rate", 0),
         "count": len(rows),
         "rows": rows,
     }
@@ -392,27 +382,21 @@ with tab_alerts:
             model_data = fetch_model_metrics(sf)
             new_alerts = []
 
-            if model_data["f1"] and model_data["f1"] < 0.88:
-                new_alerts.append({
-                    "alert_id": f"alert_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}_accuracy",
-                    "severity": "critical" if model_data["f1"] < 0.83 else "warning",
-                    "alert_type": "accuracy_drop",
-                    "affected_component": "classifier_v2",
-                    "metrics": {"f1_score": model_data["f1"], "baseline_f1": 0.91},
-                    "timestamp": datetime.now(UTC).isoformat(),
-                    "message": f"Model F1 dropped to {model_data['f1']:.4f} (baseline: 0.91)",
-                })
-
-            if model_data["drift"] and model_data["drift"] > settings.drift_threshold:
-                new_alerts.append({
-                    "alert_id": f"alert_{datetime.now(UTC).strftime('%Y%m%d_%H%M%S')}_drift",
-                    "severity": "critical",
-                    "alert_type": "model_drift",
-                    "affected_component": "classifier_v2",
-                    "metrics": {"drift_score": model_data["drift"], "threshold": settings.drift_threshold},
-                    "timestamp": datetime.now(UTC).isoformat(),
-                    "message": f"Drift score {model_data['drift']:.4f} exceeds threshold {settings.drift_threshold}",
-                })
+            if model_data.get("rows"):
+                latest = model_data["rows"][0]
+                model = latest.get("model_name", "classifier_v2")
+                ts_str = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
+                assessment = get_rule_engine().assess_one(model, latest)
+                for alert_type, breach in assessment.worst_by_alert_type().items():
+                    new_alerts.append({
+                        "alert_id": f"alert_{ts_str}_{alert_type}",
+                        "severity": breach.rule.severity,
+                        "alert_type": alert_type,
+                        "affected_component": model,
+                        "metrics": {breach.rule.metric: breach.value, "threshold": breach.rule.threshold},
+                        "timestamp": datetime.now(UTC).isoformat(),
+                        "message": breach.message(),
+                    })
 
             if new_alerts:
                 st.session_state.alerts = new_alerts + st.session_state.alerts
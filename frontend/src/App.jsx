@@ -1,6 +1,6 @@
-import { useCallback } from 'react'
+import { useCallback, useEffect } from 'react'
 import { AppProvider, useApp } from './context/AppContext'
-import { useCrewStream } from './api'
+import { useCrewStream, useLiveMetrics } from './api'
 import Layout from './components/Layout'
 import MetricsTab from './components/MetricsTab'
 import DataQualityTab from './components/DataQualityTab'
@@ -27,6 +27,12 @@ function TabContent() {
 
   useCrewStream(handleCrewEvent, state.crewRunning)
 
+  // Alerts arrive on the shared /api/live connection (snapshot + alert_change).
+  const { alerts } = useLiveMetrics()
+  useEffect(() => {
+    dispatch({ type: 'SET_ALERTS', payload: alerts })
+  }, [alerts, dispatch])
+
   switch (state.activeTab) {
     case 'metrics':
       return <MetricsTab />
@@ -1,4 +1,4 @@
-import { useEffect, useRef } from 'react'
+import { useEffect, useRef, useState } from 'react'
 
 export async function fetchJSON(path) {
   const res = await fetch(path)
@@ -16,6 +16,43 @@ export async function postJSON(path, body = {}) {
   return res.json()
 }
 
+// POST and read a text/event-stream response (EventSource only supports GET).
+// Calls onEvent(type, data) per event; resolves when the stream ends.
+export async function postSSE(path, body, onEvent, signal) {
+  const res = await fetch(path, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify(body),
+    signal,
+  })
+  if (!res.ok || !res.body) throw new Error(`POST ${path}: ${res.status}`)
+  const reader = res.body.getReader()
+  const decoder = new TextDecoder()
+  let buffer = ''
+  for (;;) {
+    const { done, value } = await reader.read()
+    if (done) break
+    buffer += decoder.decode(value, { stream: true }).replace(/\r\n?/g, '\n')
+    let sep
+    while ((sep = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, sep)
+      buffer = buffer.slice(sep + 2)
+      let type = 'message'
+      const data = []
+      for (const line of block.split('\n')) {
+        if (line.startsWith('event:')) type = line.slice(6).trim()
+        else if (line.startsWith('data:')) data.push(line.slice(5).replace(/^ /, ''))
+      }
+      if (!data.length) continue
+      try {
+        onEvent(type, JSON.parse(data.join('\n')))
+      } catch {
+        onEvent(type, data.join('\n'))
+      }
+    }
+  }
+}
+
 export function useCrewStream(onEvent, enabled) {
   const onEventRef = useRef(onEvent)
   onEventRef.current = onEvent
@@ -47,3 +84,95 @@ export function useCrewStream(onEvent, enabled) {
     return () => eventSource.close()
   }, [enabled])
 }
+
+// One shared /api/live connection per browser tab, however many components listen.
+const LIVE_SECTIONS = ['model', 'data_quality', 'health', 'incidents']
+let liveSource = null
+let liveState = { connected: false, trend: { hours: 0, rows: [] }, alerts: [], actionJobs: {}, training: {} }
+const liveListeners = new Set()
+
+function setLive(next) {
+  liveState = { ...liveState, ...next }
+  liveListeners.forEach((fn) => fn(liveState))
+}
+
+// Timestamps are naive UTC; windows are measured from the newest row so the
+// browser's timezone doesn't matter.
+function tsMillis(row) {
+  return new Date(row.ts).getTime()
+}
+
+function parse(e) {
+  try { return JSON.parse(e.data) } catch { return null }
+}
+
+function openLive() {
+  liveSource = new EventSource('/api/live')
+  liveSource.onopen = () => setLive({ connected: true })
+  liveSource.onerror = () => setLive({ connected: false })
+  liveSource.addEventListener('snapshot', (e) => {
+    const data = parse(e)
+    if (data) setLive({ ...data, trend: data.trend || { hours: 0, rows: [] }, training: data.training || {}, connected: true })
+  })
+  LIVE_SECTIONS.forEach((name) => {
+    liveSource.addEventListener(name, (e) => {
+      const data = parse(e)
+      if (data !== null) setLive({ [name]: data })
+    })
+  })
+  liveSource.addEventListener('trend', (e) => {
+    const data = parse(e)
+    if (!data?.rows?.length) return
+    const hours = liveState.trend.hours || 24
+    const merged = [...liveState.trend.rows, ...data.rows]
+    const cutoff = tsMillis(merged[merged.length - 1]) - hours * 3600 * 1000
+    const rows = merged.filter((r) => tsMillis(r) >= cutoff)
+    setLive({ trend: { ...liveState.trend, rows } })
+  })
+  liveSource.addEventListener('alert_change', (e) => {
+    const data = parse(e)
+    if (data) setLive({ alerts: data.alerts || [] })
+  })
+  liveSource.addEventListener('action_job', (e) => {
+    const job = parse(e)
+    if (job) setLive({ actionJobs: { ...liveState.actionJobs, [job.job_id]: job } })
+  })
+  liveSource.addEventListener('training', (e) => {
+    const job = parse(e)
+    if (job) setLive({ training: { ...liveState.training, [job.model_type]: job } })
+  })
+}
+
+export function useLiveMetrics() {
+  const [live, setLiveLocal] = useState(liveState)
+
+  useEffect(() => {
+    liveListeners.add(setLiveLocal)
+    if (!liveSource) openLive()
+    setLiveLocal(liveState)
+    return () => {
+      liveListeners.delete(setLiveLocal)
+      if (liveListeners.size === 0 && liveSource) {
+        liveSource.close()
+        liveSource = null
+        liveState = { ...liveState, connected: false }
+      }
+    }
+  }, [])
+
+  return live
+}
+
+// Rows of {ts, <metric>...} → {metric: [{ts, value}]} limited to the last `hours`.
+export function splitTrend(rows, metrics, hours) {
+  const out = Object.fromEntries(metrics.map((m) => [m, []]))
+  if (!rows.length) return out
+  const cutoff = tsMillis(rows[rows.length - 1]) - hours * 3600 * 1000
+  for (const r of rows) {
+    if (tsMillis(r) < cutoff) continue
+    for (const m of metrics) {
+      if (r[m] != null) out[m].push({ ts: r.ts, value: r[m] })
+    }
+  }
+  return out
+}
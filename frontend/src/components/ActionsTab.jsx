@@ -1,20 +1,53 @@
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 import { useApp } from '../context/AppContext'
 import { useTheme } from '../hooks/useTheme'
-import { postJSON } from '../api'
+import { postJSON, useLiveMetrics } from '../api'
 
 const statusIcons = {
   pending: '\u25CB',
+  queued: '\u25D4',
+  running: '\u25D1',
   completed: '\u25CF',
+  failed: '\u2715',
   denied: '\u2715',
 }
 
 const statusColors = {
   pending: 'text-gray-400',
+  queued: 'text-blue-400',
+  running: 'text-blue-400',
   completed: 'text-green-400',
+  failed: 'text-red-400',
   denied: 'text-red-400',
 }
 
+// Action job status (backend queue) → action status shown here.
+const jobStatus = { queued: 'queued', running: 'running', succeeded: 'completed', failed: 'failed' }
+
+function jobUpdates(job) {
+  const ts = new Date(job.updated_at * 1000).toLocaleTimeString()
+  const details = job.status === 'succeeded'
+    ? `${job.result} at ${ts}`
+    : job.error
+      ? `${job.status === 'failed' ? 'Failed' : 'Retrying'} (attempt ${job.attempts}/${job.max_attempts}) | Error: ${job.error}`
+      : `${job.status === 'running' ? 'Running' : 'Queued'} at ${ts}`
+  return { status: jobStatus[job.status] || job.status, details }
+}
+
+// Background retraining tracker state for a retrain action, e.g. "running · 40% · polled 3×".
+function trainingLine(job) {
+  if (!job) return null
+  const parts = [job.status]
+  if (job.progress != null) {
+    parts.push(typeof job.progress === 'number' && job.progress <= 1 ? `${Math.round(job.progress * 100)}%` : String(job.progress))
+  }
+  if (job.metrics) {
+    parts.push(Object.entries(job.metrics).slice(0, 3).map(([k, v]) => `${k}: ${typeof v === 'number' ? v.toFixed(3) : v}`).join(', '))
+  }
+  if (!job.done) parts.push(`polled ${job.polls}\u00D7`)
+  return `Training: ${parts.join(' \u00B7 ')}`
+}
+
 function extractGitHubUrl(details) {
   if (!details) return null
   const match = details.match(/(https:\/\/github\.com\/[^\s]+\/issues\/\d+)/)
@@ -146,12 +179,25 @@ export default function ActionsTab() {
   const { state, dispatch } = useApp()
   const t = useTheme()
   const [executing, setExecuting] = useState(null)
+  const { actionJobs, training } = useLiveMetrics()
+
+  // Jobs run in the background; their progress arrives over the live channel.
+  useEffect(() => {
+    state.actions.forEach((action, index) => {
+      const job = action.job_id != null && actionJobs[action.job_id]
+      if (!job) return
+      const updates = jobUpdates(job)
+      if (updates.status !== action.status || updates.details !== action.details) {
+        dispatch({ type: 'UPDATE_ACTION', payload: { index, updates } })
+      }
+    })
+  }, [actionJobs, state.actions, dispatch])
 
   const handleExecute = async (index) => {
     setExecuting(index)
     try {
       const data = await postJSON('/api/actions/execute', { index })
-      dispatch({ type: 'UPDATE_ACTION', payload: { index, updates: data.action || { status: 'completed' } } })
+      dispatch({ type: 'UPDATE_ACTION', payload: { index, updates: data.action || { status: 'queued' } } })
     } catch (err) {
       console.error('Execute failed:', err)
     } finally {
@@ -163,7 +209,7 @@ export default function ActionsTab() {
     setExecuting(index)
     try {
       const data = await postJSON('/api/actions/approve', { index })
-      dispatch({ type: 'UPDATE_ACTION', payload: { index, updates: data.action || { status: 'completed' } } })
+      dispatch({ type: 'UPDATE_ACTION', payload: { index, updates: data.action || { status: 'queued' } } })
     } catch (err) {
       console.error('Approve failed:', err)
     } finally {
@@ -252,6 +298,9 @@ export default function ActionsTab() {
                         Issue created at {action.details.match(/at (\S+)/)?.[1] || ''}
                       </p>
                     )}
+                    {/retrain/i.test(action.action || '') && action.status === 'completed' && trainingLine(training.classifier) && (
+                      <p className={`text-xs ${t.textMuted} mt-1`}>{trainingLine(training.classifier)}</p>
+                    )}
                     {action.timestamp && (
                       <p className={`text-xs ${t.textDimmest} mt-1`}>{new Date(action.timestamp).toLocaleString()}</p>
                     )}
@@ -284,6 +333,15 @@ export default function ActionsTab() {
                         </button>
                       </>
                     )}
+                    {action.status === 'failed' && (
+                      <button
+                        onClick={() => (action.requires_approval ? handleApprove(i) : handleExecute(i))}
+                        disabled={executing === i}
+                        className="px-3 py-1.5 bg-blue-600 hover:bg-blue-500 disabled:bg-gray-700 text-white text-xs rounded-lg font-medium transition-colors"
+                      >
+                        {executing === i ? '...' : 'Retry'}
+                      </button>
+                    )}
                   </div>
                 </div>
                 {/* GitHub Issue Card */}
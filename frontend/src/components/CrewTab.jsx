@@ -1,7 +1,7 @@
 import { useMemo, useRef, useEffect, useState } from 'react'
 import { useApp } from '../context/AppContext'
 import { useTheme } from '../hooks/useTheme'
-import { postJSON } from '../api'
+import { postJSON, postSSE } from '../api'
 import Terminal from './Terminal'
 
 const pipeline = [
@@ -336,10 +336,29 @@ export default function CrewTab() {
     setSummary(null)
     setSummaryLoading(true)
     const text = typeof state.crewResult === 'string' ? state.crewResult : JSON.stringify(state.crewResult)
-    postJSON('/api/crew/summarize', { text })
-      .then(res => setSummary(res.summary))
-      .catch(() => setSummary(null))
-      .finally(() => setSummaryLoading(false))
+    // Stream tokens as they arrive; fall back to the one-shot endpoint if the stream fails early.
+    const requested = state.crewResult
+    const current = () => summaryRequestedRef.current === requested
+    let received = ''
+    postSSE('/api/crew/summarize/stream', { text }, (type, data) => {
+      if (!current()) return
+      if (type === 'token') {
+        received += data.text
+        setSummary(received)
+        setSummaryLoading(false)
+      } else if (type === 'done') {
+        setSummary(data.summary)
+      } else if (type === 'error') {
+        throw new Error(data.message)
+      }
+    })
+      .catch(() => {
+        if (received || !current()) return
+        return postJSON('/api/crew/summarize', { text })
+          .then(res => current() && setSummary(res.summary))
+          .catch(() => current() && setSummary(null))
+      })
+      .finally(() => current() && setSummaryLoading(false))
   }, [state.crewResult])
 
   // Auto-scroll active terminal into view on agent transition
@@ -1,7 +1,7 @@
 import { useEffect, useState } from 'react'
 import { useApp } from '../context/AppContext'
 import { useTheme } from '../hooks/useTheme'
-import { fetchJSON } from '../api'
+import { fetchJSON, splitTrend, useLiveMetrics } from '../api'
 import MetricCard from './MetricCard'
 import SeverityBadge from './SeverityBadge'
 
@@ -49,6 +49,7 @@ function trendValues(trend) {
 }
 
 const RANGE_HOURS = { '1h': 1, '6h': 6, '24h': 24, '7d': 168, '30d': 720 }
+const TREND_METRICS = ['f1_score', 'drift_score', 'latency_p99_ms', 'anomaly_rate', 'prediction_count']
 
 // Prediction volume bar chart from real prediction_count trend
 function PredictionBars({ data, dark }) {
@@ -99,44 +100,41 @@ function QualityRow({ label, value, max, unit, color, dark }) {
 export default function MetricsTab() {
   const { state, dispatch } = useApp()
   const t = useTheme()
-  const [loading, setLoading] = useState(true)
   const [selectedRange, setSelectedRange] = useState('24h')
-  const [incidents, setIncidents] = useState([])
-  const [trends, setTrends] = useState({ f1: [], drift: [], latency: [], anomaly: [], predictions: [] })
+  const [history, setHistory] = useState(null)
+  const live = useLiveMetrics()
+  const hours = RANGE_HOURS[selectedRange] || 24
+  const liveCovers = hours <= (live.trend?.hours || 0)
 
-  // Fetch all data including trends
+  // Model, data quality, incidents and trends arrive over the shared live channel.
   useEffect(() => {
-    async function load() {
-      const hours = RANGE_HOURS[selectedRange] || 24
-      try {
-        const [model, dq, inc, f1Trend, driftTrend, latencyTrend, anomalyTrend, predTrend] = await Promise.all([
-          fetchJSON('/api/metrics/model'),
-          fetchJSON('/api/metrics/data-quality'),
-          fetchJSON('/api/incidents?limit=5').catch(() => []),
-          fetchJSON(`/api/metrics/trend/f1_score?hours=${hours}`).catch(() => []),
-          fetchJSON(`/api/metrics/trend/drift_score?hours=${hours}`).catch(() => []),
-          fetchJSON(`/api/metrics/trend/latency_p99_ms?hours=${hours}`).catch(() => []),
-          fetchJSON(`/api/metrics/trend/anomaly_rate?hours=${hours}`).catch(() => []),
-          fetchJSON(`/api/metrics/trend/prediction_count?hours=${hours}`).catch(() => []),
-        ])
-        dispatch({ type: 'SET_METRICS', payload: model })
-        dispatch({ type: 'SET_DATA_QUALITY', payload: dq })
-        setIncidents(Array.isArray(inc) ? inc : inc?.incidents || [])
-        setTrends({
-          f1: Array.isArray(f1Trend) ? f1Trend : [],
-          drift: Array.isArray(driftTrend) ? driftTrend : [],
-          latency: Array.isArray(latencyTrend) ? latencyTrend : [],
-          anomaly: Array.isArray(anomalyTrend) ? anomalyTrend : [],
-          predictions: Array.isArray(predTrend) ? predTrend : [],
-        })
-      } catch (err) {
-        console.error('Failed to load metrics:', err)
-      } finally {
-        setLoading(false)
-      }
-    }
-    load()
-  }, [dispatch, selectedRange])
+    if (live.model) dispatch({ type: 'SET_METRICS', payload: live.model })
+  }, [live.model, dispatch])
+
+  useEffect(() => {
+    if (live.data_quality) dispatch({ type: 'SET_DATA_QUALITY', payload: live.data_quality })
+  }, [live.data_quality, dispatch])
+
+  // Ranges longer than the live window are loaded once, in a single query.
+  useEffect(() => {
+    if (liveCovers) return
+    let cancelled = false
+    fetchJSON(`/api/metrics/trends?metrics=${TREND_METRICS.join(',')}&hours=${hours}`)
+      .then((rows) => { if (!cancelled) setHistory(Array.isArray(rows) ? rows : []) })
+      .catch((err) => console.error('Failed to load trends:', err))
+    return () => { cancelled = true }
+  }, [hours, liveCovers])
+
+  const loading = !live.model && !state.modelMetrics
+  const incidents = Array.isArray(live.incidents) ? live.incidents : []
+  const series = splitTrend(liveCovers ? live.trend.rows : history || [], TREND_METRICS, hours)
+  const trends = {
+    f1: series.f1_score,
+    drift: series.drift_score,
+    latency: series.latency_p99_ms,
+    anomaly: series.anomaly_rate,
+    predictions: series.prediction_count,
+  }
 
   if (loading) {
     return <div className={t.textFaint}>Loading metrics...</div>
@@ -217,7 +215,7 @@ export default function MetricsTab() {
           {['1h', '6h', '24h', '7d', '30d'].map((r) => (
             <button
               key={r}
-              onClick={() => { setSelectedRange(r); setLoading(true) }}
+              onClick={() => setSelectedRange(r)}
               className="px-2.5 py-1 rounded text-[10px] cursor-pointer border-none"
               style={{
                 fontFamily: 'inherit',
@@ -1,6 +1,6 @@
 import { useEffect } from 'react'
 import { useApp } from '../context/AppContext'
-import { fetchJSON, postJSON } from '../api'
+import { postJSON, useLiveMetrics } from '../api'
 
 const tabs = [
   { id: 'metrics', label: 'Metrics' },
@@ -21,18 +21,12 @@ function ServiceDot({ ok }) {
 export default function Sidebar() {
   const { state, dispatch } = useApp()
 
+  const { health } = useLiveMetrics()
+
+  // Health is pushed over the shared live channel; no polling.
   useEffect(() => {
-    let mounted = true
-    const poll = async () => {
-      try {
-        const data = await fetchJSON('/api/health')
-        if (mounted) dispatch({ type: 'SET_SERVICES', payload: data })
-      } catch { /* ignore */ }
-    }
-    poll()
-    const id = setInterval(poll, 15000)
-    return () => { mounted = false; clearInterval(id) }
-  }, [dispatch])
+    if (health) dispatch({ type: 'SET_SERVICES', payload: health })
+  }, [health, dispatch])
 
   const handleStartCrew = async () => {
     if (state.crewRunning) return
@@ -0,0 +1,132 @@
+"""Startup benchmark for the API and the CLI entry points.
+
+Each target is imported in a fresh interpreter, several times: wall-clock
+import time is reported as the median, and one `python -X importtime` run is
+parsed for the slowest modules. The run fails (exit code 1) when a target
+exceeds its time budget or eagerly imports a module that must stay deferred
+(CrewAI, LiteLLM, Composio, the Snowflake connector, LLM SDKs).
+tests/test_startup.py runs every default target as part of the test suite.
+
+Usage:
+    python scripts/bench_startup.py                     # all targets, default budgets
+    python scripts/bench_startup.py --runs 10 --top 15
+    python scripts/bench_startup.py --target backend.api --budget-sec 0.8
+    python scripts/bench_startup.py --json --save-dir .bench   # keep raw -X importtime logs
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# module → wall-clock import budget (seconds, median)
+DEFAULT_BUDGETS = {
+    "backend.api": 1.5,
+    "orchestrator": 1.0,
+    "crew.crew": 1.0,
+}
+
+# Heavy optional dependencies that must only load on first use.
+DEFERRED_MODULES = (
+    "crewai", "litellm", "composio", "composio_crewai",
+    "snowflake.connector", "anthropic", "openai",
+)
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(ROOT / "src"), str(ROOT), env.get("PYTHONPATH", "")])
+    env.setdefault("CREW_WARM_UP", "false")
+    return env
+
+
+def time_import(module: str, runs: int) -> list[float]:
+    """Wall-clock seconds of `import module` in fresh interpreters (bytecode already cached)."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    env = _env()
+    subprocess.run([sys.executable, "-c", f"import {module}"], cwd=ROOT, env=env,
+                   capture_output=True, check=True)  # warm the .pyc cache
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                             capture_output=True, text=True, check=True)
+        samples.append(float(out.stdout.strip().splitlines()[-1]))
+    return samples
+
+
+def import_profile(module: str) -> tuple[list[tuple[str, int, int]], str]:
+    """(module, self_us, cumulative_us) rows from `python -X importtime`, plus the raw log."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, env=_env(), capture_output=True, text=True, check=True)
+    rows = []
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows, out.stderr
+
+
+def bench(module: str, budget_sec: float, runs: int, top: int, save_dir: Path | None) -> dict:
+    samples = time_import(module, runs)
+    rows, raw = import_profile(module)
+    if save_dir is not None:
+        save_dir.mkdir(parents=True, exist_ok=True)
+        (save_dir / f"importtime_{module}.txt").write_text(raw)
+    loaded = {name for name, _, _ in rows}
+    eager = sorted(m for m in DEFERRED_MODULES if m in loaded)
+    median = statistics.median(samples)
+    return {
+        "module": module,
+        "median_sec": round(median, 3),
+        "min_sec": round(min(samples), 3),
+        "budget_sec": budget_sec,
+        "modules_imported": len(rows),
+        "slowest": [
+            {"module": name, "cumulative_ms": round(cum / 1000, 1), "self_ms": round(self_us / 1000, 1)}
+            for name, self_us, cum in sorted(rows, key=lambda r: r[2], reverse=True)[:top]
+        ],
+        "eager_deferred_modules": eager,
+        "ok": median <= budget_sec and not eager,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AgentOps startup imports")
+    parser.add_argument("--target", action="append", help="Module to import (repeatable; default: all)")
+    parser.add_argument("--budget-sec", type=float, help="Override the budget for every target")
+    parser.add_argument("--runs", type=int, default=5, help="Timed imports per target (default: 5)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest modules to list (default: 10)")
+    parser.add_argument("--save-dir", type=Path, help="Write raw -X importtime output here")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    targets = args.target or list(DEFAULT_BUDGETS)
+    started = time.perf_counter()
+    results = [
+        bench(t, args.budget_sec or DEFAULT_BUDGETS.get(t, 1.0), args.runs, args.top, args.save_dir)
+        for t in targets
+    ]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for r in results:
+            verdict = "OK" if r["ok"] else "OVER BUDGET"
+            print(f"{r['module']}: median {r['median_sec']:.3f}s (min {r['min_sec']:.3f}s, "
+                  f"budget {r['budget_sec']:.2f}s, {r['modules_imported']} modules) — {verdict}")
+            if r["eager_deferred_modules"]:
+                print(f"  eagerly imports: {', '.join(r['eager_deferred_modules'])}")
+            for s in r["slowest"]:
+                print(f"  {s['cumulative_ms']:9.1f} ms  {s['module']}")
+        print(f"\n({time.perf_counter() - started:.1f}s)")
+    sys.exit(0 if all(r["ok"] for r in results) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Fit the reference profile used by the backend's streaming drift monitor.
+
+Reads training-time transactions from a CSV with the model's feature columns
+(V1..V28, Time, Amount — e.g. the credit-card fraud dataset), fits per-feature
+quantile bins and moments, and saves the .npz that DRIFT_REFERENCE_PATH
+points at.
+
+Usage:
+    python scripts/fit_drift_reference.py --csv data/creditcard.csv
+    python scripts/fit_drift_reference.py --csv train.csv --out drift_reference.npz --bins 20
+"""
+import argparse
+import csv
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from config import settings
+from monitoring.drift import FEATURES, ReferenceProfile, to_matrix
+
+
+def read_rows(path: Path, limit: int | None) -> list[dict]:
+    rows = []
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in FEATURES if c not in (reader.fieldnames or [])]
+        if missing:
+            raise SystemExit(f"{path} is missing feature columns: {', '.join(missing)}")
+        for row in reader:
+            rows.append({c: float(row[c]) if row[c] not in ("", None) else None for c in FEATURES})
+            if limit and len(rows) >= limit:
+                break
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit the streaming-drift reference profile")
+    parser.add_argument("--csv", type=Path, required=True, help="Training-time transactions (CSV)")
+    parser.add_argument("--out", type=Path, default=Path(settings.drift_reference_path or "drift_reference.npz"),
+                        help="Output .npz (default: DRIFT_REFERENCE_PATH or drift_reference.npz)")
+    parser.add_argument("--bins", type=int, default=10, help="Quantile bins per feature (default: 10)")
+    parser.add_argument("--limit", type=int, help="Use at most this many rows")
+    args = parser.parse_args()
+
+    rows = read_rows(args.csv, args.limit)
+    if not rows:
+        raise SystemExit(f"No rows in {args.csv}")
+    profile = ReferenceProfile.fit(to_matrix(rows, FEATURES), FEATURES, n_bins=args.bins)
+    # np.savez appends .npz to a path without it; keep the name the backend will load.
+    out = args.out if args.out.suffix == ".npz" else args.out.with_suffix(".npz")
+    out.parent.mkdir(parents=True, exist_ok=True)
+    profile.save(out)
+    print(f"Fitted {len(FEATURES)} features x {args.bins} bins on {profile.count} rows → {out}")
+    if not settings.drift_reference_path:
+        print(f"Set DRIFT_REFERENCE_PATH={out} in .env to enable /api/metrics/feature-drift/live")
+
+
+if __name__ == "__main__":
+    main()
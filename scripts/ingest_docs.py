@@ -1,32 +1,61 @@
-"""Ingest runbooks and incidents into the RAG system."""
+"""Ingest runbooks and incidents into the RAG system.
+
+Only new or changed files are uploaded (tracked in .ingest_manifest.json).
+
+Usage:
+    python scripts/ingest_docs.py                 # incremental ingest + verification
+    python scripts/ingest_docs.py --force         # re-ingest everything
+    python scripts/ingest_docs.py --watch         # keep ingesting files as they change
+"""
+import argparse
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 from integrations.rag_client import RAGClient
-from pathlib import Path
+from integrations.rag_ingest import Ingestor, Manifest
+
+
+def _print_result(kind, path, result):
+    if isinstance(result, Exception):
+        print(f"Failed {kind}: {path.name} → {result}")
+    else:
+        print(f"Ingested {kind}: {path.name} → {result}")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Ingest runbooks and incidents into RAG")
+    parser.add_argument("--force", action="store_true", help="Re-ingest unchanged files")
+    parser.add_argument("--workers", type=int, default=8, help="Concurrent uploads (default: 8)")
+    parser.add_argument("--retries", type=int, default=4, help="Retries per file (default: 4)")
+    parser.add_argument("--watch", action="store_true", help="Watch runbooks/ and incidents/")
+    parser.add_argument("--interval", type=float, default=2.0, help="Watch poll interval in seconds")
+    parser.add_argument("--no-verify", action="store_true", help="Skip verification queries")
+    args = parser.parse_args()
+
     client = RAGClient()
 
     # Check health
     health = client.health()
     print(f"RAG health: {health}")
 
-    # Ingest runbooks
-    runbooks_dir = Path(__file__).parent.parent / "runbooks"
-    for f in sorted(runbooks_dir.glob("*.md")):
-        print(f"Ingesting runbook: {f.name}...")
-        result = client.ingest_file(str(f))
-        print(f"  → {result}")
+    ingestor = Ingestor(client, Manifest(), workers=args.workers, retries=args.retries)
+    report = ingestor.run(force=args.force, on_result=_print_result)
+    print(
+        f"\n{len(report.uploaded)} ingested, {len(report.skipped)} unchanged, "
+        f"{len(report.failed)} failed (corpus version {ingestor.manifest.version()})"
+    )
+
+    if args.watch:
+        print(f"Watching for changes every {args.interval}s — Ctrl+C to stop")
+        try:
+            ingestor.watch(args.interval, on_result=_print_result)
+        except KeyboardInterrupt:
+            print("\nWatch stopped.")
+        return
 
-    # Ingest incidents
-    incidents_dir = Path(__file__).parent.parent / "incidents"
-    for f in sorted(incidents_dir.glob("*.md")):
-        print(f"Ingesting incident: {f.name}...")
-        result = client.ingest_file(str(f))
-        print(f"  → {result}")
+    if args.no_verify:
+        sys.exit(1 if report.failed else 0)
 
     # Verify with test queries
     print("\n--- Verification Queries ---")
@@ -37,6 +66,9 @@ def main():
     r2 = client.search_incidents("Has V14 drift happened before?")
     print(f"\nIncident query result:\n{r2[:300]}...")
 
+    if report.failed:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -14,6 +14,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
 
 import snowflake.connector
 from config import settings
+from monitoring.drift import FEATURES
 
 # ---------------------------------------------------------------------------
 # Schema DDL
@@ -84,13 +85,6 @@ TABLES_DDL = [
     """,
 ]
 
-# ---------------------------------------------------------------------------
-# Features list (matches mlmonitoring PCA features)
-# ---------------------------------------------------------------------------
-
-FEATURES = [f"V{i}" for i in range(1, 29)] + ["Time", "Amount"]
-
-
 def jitter(base: float, pct: float = 0.03) -> float:
     return round(base * (1 + random.uniform(-pct, pct)), 6)
 
@@ -11,12 +11,16 @@ class Settings(BaseSettings):
     snowflake_database: str = "AGENTOPS"
     snowflake_schema: str = "PUBLIC"
     snowflake_warehouse: str = "DEFAULT_WH"
+    snowflake_login_timeout_sec: int = 15
 
     # Sibling services
     mlmonitoring_url: str = "http://localhost:8000"
     ragsystem_url: str = "http://localhost:8003"
     rag_username: str = "agentops"
     rag_password: str = "agentops123"
+    rag_local_fallback: bool = True  # answer from the local index when RAG is down
+    rag_local_index_dir: str = ".local_index"
+    rag_local_index_check_sec: float = 30.0  # re-fingerprint runbooks/incidents this often
 
     # LLM
     openai_api_key: str = ""
@@ -31,12 +35,63 @@ class Settings(BaseSettings):
     # GitHub
     github_repo: str = ""
     github_token: str = ""
+    github_rate_per_sec: float = 0.5  # client-side cap; server rate-limit headers also apply
+
+    # Notifications
+    notify_digest_window_sec: float = 30.0  # Slack messages within this window become one digest
+    slack_rate_per_sec: float = 1.0  # per channel
+    notify_max_wait_sec: float = 60.0  # longest a send waits on a rate limiter before failing
 
     # Agent behavior
     monitor_poll_interval_sec: int = 30
     drift_threshold: float = 0.3
+    drift_reference_path: str = ""  # ReferenceProfile .npz for streaming drift
     accuracy_drop_threshold: float = 0.05
+    alert_rules_path: str = ""  # JSON list of alert rules overriding the defaults
+    alert_ttl_sec: int = 1800  # active alerts not re-reported for this long expire
+    alert_flap_window_sec: int = 900
+    alert_flap_threshold: int = 4  # open/resolve transitions per window before suppression
+    alert_eval_enabled: bool = True  # evaluate alerts in the backend on a schedule
+    alert_eval_schedule: str = "classifier_v2"  # comma-separated model[=interval_sec]
+    alert_eval_interval_sec: int = 60
+    alert_eval_jitter: float = 0.1
+    alert_eval_max_backoff_sec: int = 600
+    health_timeout_sec: float = 2.0  # per-dependency probe timeout
+    health_cache_ttl_sec: float = 5.0
+    live_refresh_sec: int = 15  # cadence of the shared /api/live refresher
+    live_trend_hours: int = 24  # trend window kept in memory and pushed to dashboards
+    training_poll_min_sec: float = 5.0  # retraining tracker polls this often while the run changes
+    training_poll_max_sec: float = 60.0  # ...backing off to this while it doesn't
     approval_timeout_sec: int = 300
+    diagnosis_cache_ttl_sec: int = 900
+    action_workers: int = 2  # threads executing queued remediation actions
+    action_max_attempts: int = 3
+    action_retry_backoff_sec: float = 5.0  # doubled per attempt, jittered
+    action_job_lease_sec: int = 600  # a 'running' job not renewed for this long is recovered at startup
+    store_path: str = "agentops.db"  # SQLite (WAL) store for alerts, diagnoses, actions
+
+    # LLM response cache (summaries + agent calls, keyed by model + prompt + params)
+    llm_cache_enabled: bool = True
+    llm_cache_path: str = ".llm_cache.db"  # "" = in-memory only
+    llm_cache_max_entries: int = 2000  # least recently used entries are evicted beyond this
+    llm_cache_ttl_sec: int = 7 * 86400
+
+    # Tool output compaction (what agents see from tool calls)
+    tool_output_max_tokens: int = 600  # hard cap per tool result (~4 chars/token)
+    tool_output_verbose_max_tokens: int = 3000  # cap when the agent asks for verbose=True
+    tool_drift_top_k: int = 5  # features listed besides flagged ones; the rest roll up
+
+    # Resilience (per-dependency breakers, retries, hedging)
+    http_timeout_sec: float = 60.0
+    http_connect_timeout_sec: float = 5.0
+    breaker_failure_threshold: int = 5  # consecutive failures before failing fast
+    breaker_reset_sec: float = 30.0  # cool-down before a trial call
+    retry_max_attempts: int = 2  # retries for idempotent calls
+    retry_budget_ratio: float = 0.2  # retries may add at most this fraction of load
+    hedge_after_ms: float = 0.0  # 0 = hedge idempotent reads at observed p95
+
+    # Startup
+    crew_warm_up: bool = True  # build agents/clients in the background when the API starts
 
     # Demo mode
     demo_mode: bool = False
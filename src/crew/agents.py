@@ -1,83 +1,148 @@
-"""CrewAI agent definitions for AgentOps."""
-from crewai import Agent, LLM
+"""CrewAI agent definitions for AgentOps.
+
+Agents are built on first use by get_agent() and cached for the process, so
+importing this module constructs nothing (no LLM, no tools, no clients).
+warm_up() builds them ahead of time; the backend calls it in the background
+at startup. `monitor_agent`, `investigator_agent` and `remediator_agent`
+remain importable and resolve through the registry.
+"""
+import threading
+from typing import Callable
 
 from config import settings
-from tools.snowflake_tools import (
-    query_model_metrics,
-    query_feature_drift,
-    query_data_quality,
-    query_metric_trend,
-)
-from tools.rag_tools import search_runbooks, search_incidents
-from tools.mlops_tools import (
-    check_model_health,
-    trigger_retraining,
-    check_training_status,
-    rollback_model,
-)
-
-# Composio tools are optional — only load if COMPOSIO_API_KEY is set
-try:
-    from tools.composio_tools import get_composio_tools
-    composio_tools = get_composio_tools()
-except Exception:
-    composio_tools = []
-
-# Configure LLM based on available API keys
-if settings.anthropic_api_key:
-    _llm = LLM(model="anthropic/claude-sonnet-4-20250514", api_key=settings.anthropic_api_key)
-elif settings.openai_api_key:
-    _llm = LLM(model="openai/gpt-4o", api_key=settings.openai_api_key)
-else:
-    _llm = None  # CrewAI default
-
-monitor_agent = Agent(
-    role="ML Model Monitor",
-    goal="Continuously monitor ML model health and data pipeline quality. "
-         "Detect anomalies including model drift, accuracy drops, latency spikes, "
-         "and data quality issues. Raise structured alerts when thresholds are breached.",
-    backstory="You are a senior SRE specializing in ML systems. You monitor "
-              "production ML models for a fraud detection platform. You know the "
-              "healthy baselines: F1 > 0.88, drift_score < 0.3, latency_p99 < 1000ms, "
-              "null_rate < 0.05, anomaly_rate < 0.10. When metrics breach these "
-              "thresholds, you raise alerts with severity and evidence.",
-    tools=[query_model_metrics, query_feature_drift, query_data_quality, check_model_health],
-    llm=_llm,
-    verbose=True,
-    allow_delegation=False,
-)
-
-investigator_agent = Agent(
-    role="ML Incident Investigator",
-    goal="Given an alert about ML model or data pipeline issues, determine the "
-         "root cause by searching operational runbooks and historical incident "
-         "reports. Provide a diagnosis with evidence and recommended actions.",
-    backstory="You are a senior ML engineer who has debugged hundreds of production "
-              "ML incidents. You always start by checking runbooks, then look at "
-              "historical incidents for similar patterns. You examine metric trends "
-              "to pinpoint when the problem started. You provide clear root cause "
-              "analysis with confidence levels and cite your sources.",
-    tools=[search_runbooks, search_incidents, query_metric_trend, query_feature_drift],
-    llm=_llm,
-    verbose=True,
-    allow_delegation=False,
-)
-
-remediator_agent = Agent(
-    role="ML Operations Remediator",
-    goal="Execute recommended remediation actions from the investigation. "
-         "Send notifications, create tracking issues, and trigger model "
-         "retraining or rollback as needed. Always check training status "
-         "after triggering retraining.",
-    backstory="You are a DevOps engineer responsible for ML model lifecycle. "
-              "You follow runbook procedures precisely. For low-risk actions "
-              "(notifications, issue creation) you execute immediately. For "
-              "high-risk actions (retraining, rollback) you clearly state what "
-              "you're about to do and why. You always verify the outcome of "
-              "your actions.",
-    tools=[trigger_retraining, check_training_status, rollback_model,
-           check_model_health] + composio_tools,
-    llm=_llm,
-    verbose=True,
-    allow_delegation=False,
-)
+
+_llm = None
+_llm_ready = False
+_agents: dict = {}
+_lock = threading.RLock()
+
+
+def get_llm():
+    """The configured, response-caching LLM (None means the CrewAI default), built once."""
+    global _llm, _llm_ready
+    with _lock:
+        if not _llm_ready:
+            from llm.crewai_llm import CachedLLM as LLM
+
+            # Configure LLM based on available API keys (responses cached by prompt)
+            if settings.anthropic_api_key:
+                _llm = LLM(model="anthropic/claude-sonnet-4-20250514", api_key=settings.anthropic_api_key)
+            elif settings.openai_api_key:
+                _llm = LLM(model="openai/gpt-4o", api_key=settings.openai_api_key)
+            else:
+                _llm = None  # CrewAI default
+            _llm_ready = True
+        return _llm
+
+
+def _build_monitor():
+    from crewai import Agent
+    from monitoring.rules import get_rule_engine
+    from tools.mlops_tools import check_model_health
+    from tools.snowflake_tools import query_data_quality, query_feature_drift, query_model_metrics
+
+    return Agent(
+        role="ML Model Monitor",
+        goal="Continuously monitor ML model health and data pipeline quality. "
+             "Detect anomalies including model drift, accuracy drops, latency spikes, "
+             "and data quality issues. Raise structured alerts when thresholds are breached.",
+        backstory="You are a senior SRE specializing in ML systems. You monitor "
+                  "production ML models for a fraud detection platform. You know the "
+                  f"healthy baselines: {get_rule_engine().healthy_baselines_text()}. "
+                  "When metrics breach these thresholds, you raise alerts with "
+                  "severity and evidence.",
+        tools=[query_model_metrics, query_feature_drift, query_data_quality, check_model_health],
+        llm=get_llm(),
+        verbose=True,
+        allow_delegation=False,
+    )
+
+
+def _build_investigator():
+    from crewai import Agent
+    from tools.rag_tools import search_incidents, search_runbooks, search_runbooks_batch
+    from tools.snowflake_tools import detect_metric_change_points, query_feature_drift, query_metric_trend
+
+    return Agent(
+        role="ML Incident Investigator",
+        goal="Given an alert about ML model or data pipeline issues, determine the "
+             "root cause by searching operational runbooks and historical incident "
+             "reports. Provide a diagnosis with evidence and recommended actions.",
+        backstory="You are a senior ML engineer who has debugged hundreds of production "
+                  "ML incidents. You always start by checking runbooks, then look at "
+                  "historical incidents for similar patterns. You examine metric trends "
+                  "to pinpoint when the problem started. You provide clear root cause "
+                  "analysis with confidence levels and cite your sources.",
+        tools=[search_runbooks, search_runbooks_batch, search_incidents, query_metric_trend,
+               detect_metric_change_points, query_feature_drift],
+        llm=get_llm(),
+        verbose=True,
+        allow_delegation=False,
+    )
+
+
+def _build_remediator():
+    from crewai import Agent
+    from tools.mlops_tools import check_model_health, check_training_status, rollback_model, trigger_retraining
+    from tools.notify_tools import report_github_issue, send_slack_notification
+
+    return Agent(
+        role="ML Operations Remediator",
+        goal="Execute recommended remediation actions from the investigation. "
+             "Send notifications, create tracking issues, and trigger model "
+             "retraining or rollback as needed. After triggering retraining, "
+             "check its status once — a background tracker follows the job.",
+        backstory="You are a DevOps engineer responsible for ML model lifecycle. "
+                  "You follow runbook procedures precisely. For low-risk actions "
+                  "(notifications, issue creation) you execute immediately. For "
+                  "high-risk actions (retraining, rollback) you clearly state what "
+                  "you're about to do and why. You confirm each action was accepted "
+                  "and don't poll long-running jobs — the platform tracks them.",
+        tools=[trigger_retraining, check_training_status, rollback_model,
+               check_model_health, send_slack_notification, report_github_issue],
+        llm=get_llm(),
+        verbose=True,
+        allow_delegation=False,
+    )
+
+
+AGENT_BUILDERS: dict[str, Callable] = {
+    "monitor": _build_monitor,
+    "investigator": _build_investigator,
+    "remediator": _build_remediator,
+}
+
+
+def get_agent(name: str):
+    """Cached Agent by name ("monitor", "investigator", "remediator")."""
+    agent = _agents.get(name)
+    if agent is None:
+        with _lock:
+            agent = _agents.get(name)
+            if agent is None:
+                agent = _agents[name] = AGENT_BUILDERS[name]()
+    return agent
+
+
+def warm_up() -> dict[str, str | None]:
+    """Build the LLM, tools, clients and agents ahead of the first crew run.
+
+    Returns {component: error or None}; failures are left for first use to report.
+    """
+    from integrations import registry
+
+    errors = dict(registry.warm_up())
+    for name in AGENT_BUILDERS:
+        try:
+            get_agent(name)
+            errors[name] = None
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+    return errors
+
+
+def __getattr__(name: str):
+    # Backwards-compatible module attributes: crew.agents.monitor_agent etc.
+    if name.endswith("_agent") and name[: -len("_agent")] in AGENT_BUILDERS:
+        return get_agent(name[: -len("_agent")])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
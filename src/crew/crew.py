@@ -1,11 +1,57 @@
-"""AgentOpsCrew — orchestrates the monitor → investigate → remediate pipeline."""
-from crewai import Crew, Process
+"""AgentOpsCrew — orchestrates the monitor → investigate → remediate pipeline.
 
-from crew.agents import monitor_agent, investigator_agent, remediator_agent
+CrewAI is imported on first run, not at import, so importing this module is cheap.
+Each run is instrumented: tasks (and the agents running them) are timed as
+they complete, with the LLM tokens they consumed, and the run's telemetry —
+tools, LLM calls, tasks, plus CrewAI's exact token usage — is kept in
+`last_telemetry` for the run log.
+"""
+import time
+
+import telemetry
+from crew.agents import get_agent
 from crew.tasks import create_monitor_task, create_investigation_task, create_remediation_task
 
 
 class AgentOpsCrew:
+    def __init__(self):
+        self.last_telemetry: dict | None = None
+
+    def _kickoff(self, agents: list[tuple[str, object]], tasks: list) -> str:
+        """Run a sequential crew; `agents` pairs each task's name with its agent."""
+        from crewai import Crew, Process
+
+        with telemetry.run_scope() as run:
+            mark = {"at": time.perf_counter(), "llm": run.totals("llm"), "index": 0}
+
+            def on_task_done(output):
+                # Sequential process: a task runs from the previous completion to this one.
+                now, llm = time.perf_counter(), run.totals("llm")
+                name, agent = agents[min(mark["index"], len(agents) - 1)]
+                sec = now - mark["at"]
+                tokens_in = llm["tokens_in"] - mark["llm"]["tokens_in"]
+                tokens_out = llm["tokens_out"] - mark["llm"]["tokens_out"]
+                role = getattr(output, "agent", None) or getattr(agent, "role", name)
+                telemetry.record("task", name, sec, tokens_in=tokens_in, tokens_out=tokens_out)
+                telemetry.record("agent", str(role), sec, tokens_in=tokens_in, tokens_out=tokens_out)
+                mark.update(at=now, llm=llm, index=mark["index"] + 1)
+
+            crew = Crew(
+                agents=[agent for _, agent in agents],
+                tasks=tasks,
+                process=Process.sequential,
+                verbose=True,
+                task_callback=on_task_done,
+            )
+            try:
+                result = crew.kickoff()
+            finally:
+                usage = getattr(crew, "usage_metrics", None)
+                if usage is not None and hasattr(usage, "model_dump"):
+                    usage = usage.model_dump()
+                self.last_telemetry = telemetry.run_report(run, usage)
+        return str(result)
+
     def run(self, context: str = "") -> str:
         """Run the full monitor → investigate → remediate pipeline."""
         monitor_task = create_monitor_task(context)
@@ -16,21 +62,12 @@ class AgentOpsCrew:
         investigate_task.context = [monitor_task]
         remediate_task.context = [monitor_task, investigate_task]
 
-        crew = Crew(
-            agents=[monitor_agent, investigator_agent, remediator_agent],
-            tasks=[monitor_task, investigate_task, remediate_task],
-            process=Process.sequential,
-            verbose=True,
+        return self._kickoff(
+            [("monitor", get_agent("monitor")), ("investigate", get_agent("investigator")),
+             ("remediate", get_agent("remediator"))],
+            [monitor_task, investigate_task, remediate_task],
         )
-        result = crew.kickoff()
-        return str(result)
 
     def run_monitor_only(self, context: str = "") -> str:
         """Run just the monitor task (for polling mode)."""
-        crew = Crew(
-            agents=[monitor_agent],
-            tasks=[create_monitor_task(context)],
-            process=Process.sequential,
-            verbose=True,
-        )
-        return str(crew.kickoff())
+        return self._kickoff([("monitor", get_agent("monitor"))], [create_monitor_task(context)])
@@ -1,9 +1,16 @@
-from .rag_client import RAGClient
-from .mlmonitoring_client import MLMonitoringClient
+# Clients are imported on first attribute access: snowflake-connector-python
+# in particular is slow to import and optional when only HTTP clients are needed.
+_EXPORTS = {
+    "RAGClient": "rag_client",
+    "MLMonitoringClient": "mlmonitoring_client",
+    "SnowflakeClient": "snowflake_client",
+}
 
-# Snowflake requires snowflake-connector-python; import lazily to avoid
-# hard dependency when only HTTP clients are needed.
-try:
-    from .snowflake_client import SnowflakeClient
-except ImportError:
-    SnowflakeClient = None  # type: ignore[assignment,misc]
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    return getattr(import_module(f"{__name__}.{module}"), name)
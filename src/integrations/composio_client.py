@@ -1,21 +1,49 @@
-"""Composio integration for Slack and GitHub actions."""
-from composio_crewai import ComposioToolSet, Action
-
-
-def get_composio_tools():
-    """Get Composio tools for CrewAI agents.
-
-    Returns a list of CrewAI-compatible tools for:
-    - Slack: send messages
-    - GitHub: create issues
-
-    Must have COMPOSIO_API_KEY set and integrations connected.
-    """
-    toolset = ComposioToolSet()
-    tools = toolset.get_tools(
-        actions=[
-            Action.SLACK_SENDS_A_MESSAGE_TO_A_SLACK_CHANNEL,
-            Action.GITHUB_CREATE_AN_ISSUE,
-        ]
-    )
-    return tools
+"""Composio integration for Slack.
+
+The Notifier posts Slack messages through here — for the backend's Slack
+action and the agents' notify tools alike (GitHub goes through the REST
+client). The toolset is created once per process, on first use; building it
+talks to the Composio API, so it is kept off import and startup paths (see
+warm_up).
+"""
+import threading
+
+from config import settings
+from integrations.resilience import get_policy
+
+_toolset = None
+_lock = threading.Lock()
+
+
+def get_toolset():
+    """Process-wide ComposioToolSet (created lazily)."""
+    global _toolset
+    if _toolset is None:
+        with _lock:
+            if _toolset is None:
+                from composio_crewai import ComposioToolSet
+
+                _toolset = ComposioToolSet()
+    return _toolset
+
+
+def send_slack_message(channel: str, text: str) -> dict:
+    """Post to Slack through the shared toolset; returns Composio's result dict."""
+    from composio_crewai import Action
+
+    kwargs = {"action": Action.SLACK_SENDS_A_MESSAGE_TO_A_SLACK_CHANNEL, "params": {"channel": channel, "text": text}}
+    if settings.composio_slack_connection_id:
+        kwargs["connected_account_id"] = settings.composio_slack_connection_id
+    # Composio wraps every failure alike, so any error counts against the breaker.
+    policy = get_policy("slack", is_transient=lambda e: True)
+    return policy.call(lambda: get_toolset().execute_action(**kwargs))
+
+
+def warm_up():
+    """Build the toolset the Slack sends use ahead of first use (errors are ignored)."""
+    if not settings.composio_api_key:
+        return
+    try:
+        get_toolset()
+    except Exception:
+        pass
@@ -0,0 +1,80 @@
+"""GitHub REST client for remediation issues.
+
+One pooled httpx.Client per process keeps the TLS connection to
+api.github.com alive between issues. Requests pass a token bucket that
+follows GitHub's rate-limit headers.
+"""
+import threading
+
+import httpx
+from config import settings
+from integrations.resilience import RateLimitedError, TokenBucket, get_policy
+
+
+class GitHubClient:
+    def __init__(self, repo: str, token: str, transport: httpx.BaseTransport | None = None):
+        self.repo = repo
+        self._client = httpx.Client(
+            base_url="https://api.github.com",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "X-GitHub-Api-Version": "2022-11-28",
+            },
+            timeout=httpx.Timeout(15.0, connect=settings.http_connect_timeout_sec),
+            limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=300),
+            transport=transport,
+        )
+        self._policy = get_policy("github")
+        self.bucket = TokenBucket("github", settings.github_rate_per_sec, burst=5)
+
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        self.bucket.acquire(timeout=settings.notify_max_wait_sec)
+        resp = self._client.request(method, path, **kwargs)
+        pause = self.bucket.observe_headers(resp.headers)
+        if resp.status_code in (403, 429) and pause:
+            raise RateLimitedError("github", pause)
+        resp.raise_for_status()
+        return resp
+
+    def create_issue(self, title: str, body: str, labels: list[str] | None = None) -> dict:
+        """Open an issue; raises httpx.HTTPStatusError on API errors. Never retried."""
+        resp = self._policy.call(
+            self._request, "POST", f"/repos/{self.repo}/issues",
+            json={"title": title, "body": body, "labels": labels or []},
+        )
+        return resp.json()
+
+    def comment_issue(self, number: int, body: str) -> dict:
+        resp = self._policy.call(
+            self._request, "POST", f"/repos/{self.repo}/issues/{number}/comments", json={"body": body},
+        )
+        return resp.json()
+
+    def find_open_issue(self, marker: str) -> dict | None:
+        """Most recently updated open issue whose body contains `marker`."""
+        resp = self._policy.call(
+            self._request, "GET", "/search/issues",
+            params={"q": f'repo:{self.repo} is:issue is:open in:body "{marker}"', "sort": "updated", "per_page": 1},
+            idempotent=True,
+        )
+        items = resp.json().get("items", [])
+        return items[0] if items else None
+
+    def close(self):
+        self._client.close()
+
+
+_github: GitHubClient | None = None
+_lock = threading.Lock()
+
+
+def get_github() -> GitHubClient | None:
+    """Shared client for GITHUB_REPO, or None when GitHub isn't configured."""
+    global _github
+    if not (settings.github_repo and settings.github_token):
+        return None
+    with _lock:
+        if _github is None or _github.repo != settings.github_repo:
+            _github = GitHubClient(settings.github_repo, settings.github_token)
+        return _github
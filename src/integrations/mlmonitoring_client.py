@@ -1,47 +1,69 @@
 """HTTP client for the ML Monitoring API."""
+from typing import Callable
+
 import httpx
 from config import settings
+from integrations.resilience import get_policy, http_timeout
 
 
 class MLMonitoringClient:
     def __init__(self):
-        self._client = httpx.Client(base_url=settings.mlmonitoring_url, timeout=120.0)
+        self._client = httpx.Client(base_url=settings.mlmonitoring_url, timeout=http_timeout())
+        self._observers: list[Callable[[dict], None]] = []
+        self._policy = get_policy("mlmonitor")
+
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        resp = self._client.request(method, path, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    def _read(self, path: str, **kwargs) -> httpx.Response:
+        """GET through the breaker, retried and hedged."""
+        return self._policy.call(self._request, "GET", path, idempotent=True, hedge=True, **kwargs)
 
-    def health(self) -> dict:
-        return self._client.get("/health").json()
+    def _write(self, path: str, **kwargs) -> httpx.Response:
+        """POST through the breaker, never retried (it changes server state)."""
+        return self._policy.call(self._request, "POST", path, **kwargs)
+
+    def add_observer(self, fn: Callable[[dict], None]):
+        """Call `fn(features)` for every successful prediction (e.g. streaming drift)."""
+        self._observers.append(fn)
+
+    def health(self, timeout: float | None = None) -> dict:
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        return self._policy.call(self._request, "GET", "/health", retries=0, **kwargs).json()
 
     def ready(self) -> dict:
-        return self._client.get("/ready").json()
+        return self._read("/ready").json()
 
     def model_info(self) -> dict:
-        return self._client.get("/model/info").json()
+        return self._read("/model/info").json()
 
     def trigger_retraining(self, model_type: str = "classifier") -> dict:
-        resp = self._client.post("/training/trigger", json={"model_type": model_type})
-        resp.raise_for_status()
-        return resp.json()
+        return self._write("/training/trigger", json={"model_type": model_type}).json()
 
     def training_status(self, model_type: str | None = None) -> list[dict]:
         params = {}
         if model_type:
             params["model_type"] = model_type
-        return self._client.get("/training/status", params=params).json()
+        return self._read("/training/status", params=params).json()
 
     def rollback_model(self) -> dict:
-        resp = self._client.post("/model/rollback")
-        resp.raise_for_status()
-        return resp.json()
+        return self._write("/model/rollback").json()
 
     def reload_model(self) -> dict:
-        resp = self._client.post("/model/reload")
-        resp.raise_for_status()
-        return resp.json()
+        return self._write("/model/reload").json()
 
     def predict(self, features: dict) -> dict:
-        resp = self._client.post("/predict", json=features)
-        resp.raise_for_status()
+        # Scoring is side-effect free: retry, but don't hedge (it doubles model load).
+        resp = self._policy.call(self._request, "POST", "/predict", json=features, idempotent=True)
+        for fn in self._observers:
+            try:
+                fn(features)
+            except Exception:
+                pass
         return resp.json()
 
     def metrics(self) -> str:
         """Get Prometheus metrics as text."""
-        return self._client.get("/metrics").text
+        return self._read("/metrics").text
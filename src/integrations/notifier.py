@@ -0,0 +1,226 @@
+"""Notification aggregation for Slack and GitHub.
+
+During an alert storm every alert and action would otherwise post its own
+Slack message and open its own GitHub issue. The Notifier sits in front of
+both:
+
+- Slack: the first message to a channel goes out immediately; anything else
+  for that channel within `window_sec` is held and sent as one digest when
+  the window closes. Sends pass a per-channel token bucket.
+- GitHub: issues are keyed (by alert fingerprint). A report for a key that
+  already has an open issue becomes a comment on it. Keys map to issue
+  numbers in memory, falling back to a search for the hidden marker that
+  every issue body carries, so restarts don't reopen duplicates.
+"""
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Callable
+
+from config import settings
+from integrations.resilience import TokenBucket
+
+_DIGEST_MAX_CHARS = 3500
+_ISSUE_CACHE_SEC = 3600  # re-check via search after this, in case the issue was closed
+
+
+def issue_key(alert: dict) -> str:
+    """Alert fingerprint used to find the issue tracking it (type:component)."""
+    return f"{alert.get('alert_type', 'unknown')}:{alert.get('affected_component', 'unknown')}"
+
+
+def issue_marker(key: str) -> str:
+    return f"agentops-key:{key}"
+
+
+class _Channel:
+    def __init__(self, bucket: TokenBucket):
+        self.bucket = bucket
+        self.last_sent = 0.0
+        self.pending: list[tuple[str, Future]] = []
+        self.timer: threading.Timer | None = None
+
+
+class Notifier:
+    def __init__(
+        self,
+        send_slack: Callable[[str, str], dict],
+        github: Callable[[], object | None],
+        window_sec: float = 30.0,
+        slack_rate_per_sec: float = 1.0,
+        max_wait_sec: float = 60.0,
+    ):
+        """`send_slack(channel, text)` posts one message; `github()` returns a GitHubClient or None."""
+        self.send_slack = send_slack
+        self.github = github
+        self.window_sec = window_sec
+        self.slack_rate_per_sec = slack_rate_per_sec
+        self.max_wait_sec = max_wait_sec
+        self.stats = dict.fromkeys(
+            ("slack_messages", "slack_sends", "slack_digests", "slack_failures",
+             "issues_created", "issues_commented"), 0
+        )
+        self.last_error: str | None = None
+        self._channels: dict[str, _Channel] = {}
+        self._issues: dict[str, dict] = {}
+        self._issue_locks: dict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    # -- Slack ---------------------------------------------------------------
+
+    def _channel(self, name: str) -> _Channel:
+        ch = self._channels.get(name)
+        if ch is None:
+            ch = self._channels[name] = _Channel(
+                TokenBucket(f"slack:{name}", self.slack_rate_per_sec, burst=1)
+            )
+        return ch
+
+    def slack(self, channel: str, text: str) -> Future:
+        """Queue a message; the future resolves to the Slack result once it is sent.
+
+        Resolves immediately when the channel has been quiet for a window,
+        otherwise when the digest it joined is flushed.
+        """
+        fut: Future = Future()
+        now = time.monotonic()
+        with self._lock:
+            self.stats["slack_messages"] += 1
+            ch = self._channel(channel)
+            immediate = ch.timer is None and now - ch.last_sent >= self.window_sec
+            if immediate:
+                ch.last_sent = now
+            else:
+                ch.pending.append((text, fut))
+                if ch.timer is None:
+                    delay = max(0.0, ch.last_sent + self.window_sec - now)
+                    ch.timer = threading.Timer(delay, self.flush, args=(channel,))
+                    ch.timer.daemon = True
+                    ch.timer.start()
+        if immediate:
+            self._send(channel, text, [fut])
+        return fut
+
+    def flush(self, channel: str):
+        """Send everything pending for a channel as one digest."""
+        with self._lock:
+            ch = self._channel(channel)
+            if ch.timer is not None:
+                ch.timer.cancel()
+                ch.timer = None
+            pending, ch.pending = ch.pending, []
+            if pending:
+                ch.last_sent = time.monotonic()
+        if not pending:
+            return
+        texts = [t for t, _ in pending]
+        text = texts[0] if len(texts) == 1 else self._digest(texts)
+        if len(texts) > 1:
+            with self._lock:
+                self.stats["slack_digests"] += 1
+        self._send(channel, text, [f for _, f in pending])
+
+    def flush_all(self):
+        for channel in list(self._channels):
+            self.flush(channel)
+
+    def _digest(self, texts: list[str]) -> str:
+        header = f"*[AgentOps] {len(texts)} notifications in the last {self.window_sec:.0f}s*"
+        parts, used = [header], len(header)
+        for i, text in enumerate(texts):
+            chunk = "\n———\n" + text
+            if used + len(chunk) > _DIGEST_MAX_CHARS:
+                parts.append(f"\n———\n…and {len(texts) - i} more")
+                break
+            parts.append(chunk)
+            used += len(chunk)
+        return "".join(parts)
+
+    def _send(self, channel: str, text: str, futures: list[Future]):
+        try:
+            self._channel(channel).bucket.acquire(timeout=self.max_wait_sec)
+            result = self.send_slack(channel, text)
+            if (result.get("data") or {}).get("error") == "ratelimited":
+                self._channel(channel).bucket.pause(self.window_sec)
+        except Exception as e:
+            with self._lock:
+                self.stats["slack_failures"] += 1
+                self.last_error = f"slack: {type(e).__name__}: {e}"[:300]
+            for f in futures:
+                f.set_exception(e)
+            return
+        with self._lock:
+            self.stats["slack_sends"] += 1
+        for f in futures:
+            f.set_result(result)
+
+    # -- GitHub --------------------------------------------------------------
+
+    def github_issue(self, key: str, title: str, body: str, labels: list[str] | None = None) -> dict | None:
+        """Open an issue for `key`, or comment on its open issue.
+
+        Returns {"action": "created"|"commented", "number", "url"}, or None when
+        GitHub isn't configured.
+        """
+        client = self.github()
+        if client is None:
+            return None
+        with self._lock:
+            key_lock = self._issue_locks[key]
+        with key_lock:  # one issue per key even when reports race
+            issue = self._issues.get(key)
+            if issue is None or time.time() - issue["cached_at"] > _ISSUE_CACHE_SEC:
+                found = client.find_open_issue(issue_marker(key))
+                issue = None if found is None else self._remember(key, found)
+            if issue is not None:
+                client.comment_issue(issue["number"], f"**Update:** {title}\n\n{body}")
+                with self._lock:
+                    self.stats["issues_commented"] += 1
+                return {"action": "commented", "number": issue["number"], "url": issue["url"]}
+            created = client.create_issue(title, f"{body}\n\n<!-- {issue_marker(key)} -->", labels)
+            issue = self._remember(key, created)
+            with self._lock:
+                self.stats["issues_created"] += 1
+            return {"action": "created", "number": issue["number"], "url": issue["url"]}
+
+    def _remember(self, key: str, issue: dict) -> dict:
+        entry = self._issues[key] = {
+            "number": issue["number"], "url": issue.get("html_url", ""), "cached_at": time.time(),
+        }
+        return entry
+
+    def forget_issue(self, key: str):
+        """Drop the cached issue for a key (e.g. after it was closed)."""
+        self._issues.pop(key, None)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "stats": dict(self.stats),
+                "last_error": self.last_error,
+                "pending": {name: len(ch.pending) for name, ch in self._channels.items() if ch.pending},
+                "window_sec": self.window_sec,
+            }
+
+
+_notifier: Notifier | None = None
+_notifier_lock = threading.Lock()
+
+
+def get_notifier() -> Notifier:
+    """Process-wide notifier shared by backend actions and agent tools."""
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            from integrations.composio_client import send_slack_message
+            from integrations.github_client import get_github
+
+            _notifier = Notifier(
+                send_slack_message,
+                get_github,
+                window_sec=settings.notify_digest_window_sec,
+                slack_rate_per_sec=settings.slack_rate_per_sec,
+                max_wait_sec=settings.notify_max_wait_sec,
+            )
+        return _notifier
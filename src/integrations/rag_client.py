@@ -1,27 +1,65 @@
 """HTTP client for the RAG system API."""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import httpx
 from config import settings
+from integrations.resilience import CircuitOpenError, get_policy, http_timeout
+
+
+LOCAL_FALLBACK_NOTICE = "(RAG service unavailable — excerpts from the local index)"
+LOCAL_NO_HITS = "No relevant information found in the local index."
+
+
+def is_local_fallback(answer: str) -> bool:
+    """Whether a search_* answer came from the local index instead of the RAG service."""
+    return answer.startswith(LOCAL_FALLBACK_NOTICE) or answer == LOCAL_NO_HITS
+
+
+def _format_answer(result: dict, fallback: str) -> str:
+    citations = ""
+    if result.get("citations"):
+        citations = "\n\nSources:\n" + "\n".join(
+            f"- {c.get('source_path', 'unknown')}" for c in result["citations"]
+        )
+    return result.get("answer", fallback) + citations
 
 
 class RAGClient:
-    def __init__(self):
+    def __init__(self, transport: httpx.BaseTransport | None = None):
+        """`transport` lets tests swap in an in-process stand-in (httpx.MockTransport)."""
         self._token: str | None = None
-        self._client = httpx.Client(base_url=settings.ragsystem_url, timeout=120.0)
+        self._auth_lock = threading.Lock()
+        # None = not probed yet; False once the service answers 404/405 on /query/batch.
+        self._batch_supported: bool | None = None
+        self._client = httpx.Client(
+            base_url=settings.ragsystem_url, timeout=http_timeout(), transport=transport
+        )
+        self._policy = get_policy("rag")
+
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        resp = self._client.request(method, path, **kwargs)
+        resp.raise_for_status()
+        return resp
 
     def _ensure_auth(self):
         if self._token:
             return
+        with self._auth_lock:
+            if not self._token:
+                self._login()
+
+    def _login(self):
         # Register user (ignore if already exists)
         self._client.post("/auth/register", json={
             "username": settings.rag_username,
             "password": settings.rag_password,
         })
         # Get token
-        resp = self._client.post("/auth/token", json={
+        resp = self._policy.call(self._request, "POST", "/auth/token", json={
             "username": settings.rag_username,
             "password": settings.rag_password,
-        })
-        resp.raise_for_status()
+        }, idempotent=True)
         self._token = resp.json()["access_token"]
 
     def _headers(self) -> dict:
@@ -33,41 +71,140 @@ class RAGClient:
         body = {"query": question, "top_k": top_k}
         if filters:
             body["filters"] = filters
-        resp = self._client.post("/query", json=body, headers=self._headers())
-        resp.raise_for_status()
+        # Queries are reads, so they may be retried and hedged.
+        resp = self._policy.call(
+            self._request, "POST", "/query", json=body, headers=self._headers(),
+            idempotent=True, hedge=True,
+        )
         return resp.json()
 
+    def _query_batch(self, questions: list[str], top_k: int, filters: dict | None) -> list[dict] | None:
+        """Try the service's /query/batch endpoint. Returns None if it has none."""
+        if self._batch_supported is False:
+            return None
+        body = {"queries": [{"query": q, "top_k": top_k} for q in questions]}
+        if filters:
+            for item in body["queries"]:
+                item["filters"] = filters
+        try:
+            resp = self._policy.call(
+                self._request, "POST", "/query/batch", json=body, headers=self._headers(),
+                idempotent=True,
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in (404, 405):
+                self._batch_supported = False
+                return None
+            raise
+        self._batch_supported = True
+        results = resp.json().get("results", [])
+        if len(results) != len(questions):
+            raise ValueError(
+                f"/query/batch returned {len(results)} results for {len(questions)} queries"
+            )
+        return results
+
+    def query_many(
+        self,
+        questions: list[str],
+        top_k: int = 5,
+        filters: dict | None = None,
+        max_workers: int = 8,
+    ) -> list[dict]:
+        """Run several RAG queries at once. Results come back in input order.
+
+        Duplicate questions are sent once. Uses /query/batch when the service
+        provides it, otherwise issues the queries concurrently. A question that
+        fails yields {"error": "..."} instead of failing the whole batch.
+        """
+        unique = list(dict.fromkeys(questions))
+        if not unique:
+            return []
+
+        results = None
+        try:
+            results = self._query_batch(unique, top_k, filters)
+        except CircuitOpenError as e:
+            return [{"error": str(e)} for _ in questions]
+        except httpx.HTTPError:
+            results = None
+
+        if results is None:
+            def one(q: str) -> dict:
+                try:
+                    return self.query(q, top_k, filters)
+                except Exception as e:
+                    return {"error": str(e)}
+
+            self._ensure_auth()
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as pool:
+                results = list(pool.map(one, unique))
+
+        by_question = dict(zip(unique, results))
+        return [by_question[q] for q in questions]
+
     def search_runbooks(self, question: str) -> str:
         """Search runbooks and return the answer with citations."""
-        result = self.query(question, top_k=5)
-        citations = ""
-        if result.get("citations"):
-            citations = "\n\nSources:\n" + "\n".join(
-                f"- {c.get('source_path', 'unknown')}" for c in result["citations"]
-            )
-        return result.get("answer", "No relevant information found.") + citations
+        try:
+            result = self.query(question, top_k=5)
+        except (httpx.HTTPError, CircuitOpenError):
+            if not settings.rag_local_fallback:
+                raise
+            return self.search_local(question, kind="runbook")
+        return _format_answer(result, "No relevant information found.")
 
     def search_incidents(self, question: str) -> str:
         """Search historical incidents and return the answer with citations."""
-        result = self.query(question, top_k=5)
-        citations = ""
-        if result.get("citations"):
-            citations = "\n\nSources:\n" + "\n".join(
-                f"- {c.get('source_path', 'unknown')}" for c in result["citations"]
-            )
-        return result.get("answer", "No relevant incidents found.") + citations
+        try:
+            result = self.query(question, top_k=5)
+        except (httpx.HTTPError, CircuitOpenError):
+            if not settings.rag_local_fallback:
+                raise
+            return self.search_local(question, kind="incident")
+        return _format_answer(result, "No relevant incidents found.")
+
+    def search_runbooks_many(self, questions: list[str]) -> list[str]:
+        """Search runbooks for several questions in one round of requests."""
+        answers = []
+        for q, r in zip(questions, self.query_many(questions, top_k=5)):
+            if "error" not in r:
+                answers.append(_format_answer(r, "No relevant information found."))
+            elif settings.rag_local_fallback:
+                answers.append(self.search_local(q, kind="runbook"))
+            else:
+                answers.append(f"Search failed: {r['error']}")
+        return answers
+
+    def search_local(self, question: str, kind: str | None = None, k: int = 3) -> str:
+        """Answer from the in-process index (runbooks/ and incidents/ on disk).
+
+        Returns the best-matching sections verbatim rather than a generated
+        answer; used when the RAG service is unreachable.
+        """
+        from retrieval.local_index import get_local_index
+
+        hits = get_local_index().search(question, k=k, kind=kind)
+        if not hits:
+            return LOCAL_NO_HITS
+        parts = [f"[{i}] {h['heading']}\n{h['text'][:600]}" for i, h in enumerate(hits, 1)]
+        return _format_answer(
+            {
+                "answer": LOCAL_FALLBACK_NOTICE + "\n\n" + "\n\n".join(parts),
+                "citations": [{"source_path": h["source_path"]} for h in hits],
+            },
+            "",
+        )
 
     def ingest_file(self, file_path: str) -> dict:
         """Upload a document for ingestion."""
         with open(file_path, "rb") as f:
-            resp = self._client.post(
-                "/ingest",
+            resp = self._policy.call(
+                self._request, "POST", "/ingest",
                 files={"file": (file_path.split("/")[-1], f)},
                 headers=self._headers(),
             )
-        resp.raise_for_status()
         return resp.json()
 
-    def health(self) -> dict:
-        resp = self._client.get("/health")
-        return resp.json()
+    def health(self, timeout: float | None = None) -> dict:
+        kwargs = {"timeout": timeout} if timeout is not None else {}
+        return self._policy.call(self._request, "GET", "/health", retries=0, **kwargs).json()
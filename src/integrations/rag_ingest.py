@@ -0,0 +1,236 @@
+"""Incremental, concurrent document ingestion into the RAG system.
+
+A JSON manifest records the content hash of every file that was ingested
+successfully, so repeated runs only upload new or changed documents.
+"""
+import hashlib
+import json
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import httpx
+
+from integrations.rag_client import RAGClient
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+DOC_DIRS = {
+    "runbook": ROOT_DIR / "runbooks",
+    "incident": ROOT_DIR / "incidents",
+}
+MANIFEST_PATH = ROOT_DIR / ".ingest_manifest.json"
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def discover_documents(doc_dirs: dict[str, Path] | None = None) -> list[tuple[str, Path]]:
+    """Return (kind, path) for every markdown document, sorted by path."""
+    docs = []
+    for kind, directory in (doc_dirs or DOC_DIRS).items():
+        docs.extend((kind, p) for p in sorted(directory.glob("*.md")))
+    return docs
+
+
+class Manifest:
+    """Content-hash manifest of ingested files, keyed by repo-relative path."""
+
+    def __init__(self, path: Path = MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text()).get("files", {})
+            except (OSError, ValueError):
+                self.entries = {}
+
+    @staticmethod
+    def key(path: Path) -> str:
+        try:
+            return str(path.resolve().relative_to(ROOT_DIR))
+        except ValueError:
+            return str(path.resolve())
+
+    def changed(self, path: Path, st: os.stat_result) -> str | None:
+        """Return the new hash if the file differs from the manifest, else None.
+
+        `st` is the file's stat() taken before hashing. The file is only hashed
+        when its size or mtime moved, so scanning a large unchanged corpus
+        costs one stat() per file.
+        """
+        entry = self.entries.get(self.key(path))
+        if entry and entry.get("size") == st.st_size and entry.get("mtime") == st.st_mtime:
+            return None
+        digest = file_sha256(path)
+        if entry and entry.get("sha256") == digest:
+            # Touched but not modified — refresh the stat cache only.
+            with self._lock:
+                entry.update(size=st.st_size, mtime=st.st_mtime)
+            return None
+        return digest
+
+    def record(self, path: Path, digest: str, kind: str, st: os.stat_result):
+        """Remember an upload; `st` is the stat() taken before `digest` was computed,
+        so an edit saved since then still looks changed on the next scan."""
+        with self._lock:
+            self.entries[self.key(path)] = {
+                "sha256": digest,
+                "kind": kind,
+                "size": st.st_size,
+                "mtime": st.st_mtime,
+                "ingested_at": time.time(),
+            }
+
+    def prune(self, existing: list[Path]):
+        """Forget files that no longer exist on disk."""
+        keep = {self.key(p) for p in existing}
+        with self._lock:
+            for k in list(self.entries):
+                if k not in keep:
+                    del self.entries[k]
+
+    def save(self):
+        with self._lock:
+            payload = json.dumps({"files": self.entries}, indent=2, sort_keys=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(payload)
+        os.replace(tmp, self.path)
+
+    def version(self) -> str:
+        """Stable hash over all ingested content hashes (the corpus version)."""
+        with self._lock:
+            digests = sorted(f"{k}:{v['sha256']}" for k, v in self.entries.items())
+        return hashlib.sha256("\n".join(digests).encode()).hexdigest()[:16]
+
+
+def corpus_version(path: Path = MANIFEST_PATH) -> str:
+    return Manifest(path).version()
+
+
+@dataclass
+class IngestReport:
+    uploaded: list[str] = field(default_factory=list)
+    skipped: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def upload_with_retry(
+    client: RAGClient,
+    path: Path,
+    retries: int = 4,
+    backoff: float = 0.5,
+    max_backoff: float = 10.0,
+) -> dict:
+    """Upload one file, retrying transient errors with jittered backoff."""
+    attempt = 0
+    while True:
+        try:
+            return client.ingest_file(str(path))
+        except Exception as e:
+            if attempt >= retries or not _is_retryable(e):
+                raise
+            delay = min(max_backoff, backoff * 2 ** attempt)
+            time.sleep(random.uniform(delay / 2, delay))
+            attempt += 1
+
+
+class Ingestor:
+    """Uploads new or changed documents on a bounded thread pool."""
+
+    def __init__(
+        self,
+        client: RAGClient | None = None,
+        manifest: Manifest | None = None,
+        doc_dirs: dict[str, Path] | None = None,
+        workers: int = 8,
+        retries: int = 4,
+    ):
+        self.client = client or RAGClient()
+        self.manifest = manifest or Manifest()
+        self.doc_dirs = doc_dirs or DOC_DIRS
+        self.workers = workers
+        self.retries = retries
+
+    def pending(self, force: bool = False) -> list[tuple[str, Path, str, os.stat_result]]:
+        """Return (kind, path, sha256, stat) for every file that needs uploading."""
+        docs = discover_documents(self.doc_dirs)
+        self.manifest.prune([p for _, p in docs])
+        out = []
+        for kind, path in docs:
+            try:
+                st = path.stat()
+                digest = file_sha256(path) if force else self.manifest.changed(path, st)
+            except FileNotFoundError:
+                continue  # removed since discovery; pruned on the next scan
+            if digest:
+                out.append((kind, path, digest, st))
+        return out
+
+    def run(self, force: bool = False, on_result=None) -> IngestReport:
+        report = IngestReport()
+        todo = self.pending(force)
+        todo_paths = {p for _, p, _, _ in todo}
+        report.skipped = [
+            p.name for _, p in discover_documents(self.doc_dirs) if p not in todo_paths
+        ]
+        if not todo:
+            self.manifest.save()
+            return report
+
+        with ThreadPoolExecutor(max_workers=max(1, self.workers)) as pool:
+            futures = {
+                pool.submit(upload_with_retry, self.client, path, self.retries): (kind, path, digest, st)
+                for kind, path, digest, st in todo
+            }
+            # A failure is confined to its file: the others' uploads are still recorded and saved.
+            for fut in as_completed(futures):
+                kind, path, digest, st = futures[fut]
+                try:
+                    result = fut.result()
+                    self.manifest.record(path, digest, kind, st)
+                    report.uploaded.append(path.name)
+                except Exception as e:
+                    report.failed[path.name] = str(e)
+                    result = e
+                if on_result:
+                    try:
+                        on_result(kind, path, result)
+                    except Exception:
+                        logger.exception("on_result failed for %s", path)
+
+        self.manifest.save()
+        return report
+
+    def watch(self, interval: float = 2.0, on_result=None, on_cycle=None):
+        """Poll the document directories and ingest files as they change.
+
+        A failed cycle (e.g. the manifest can't be written) is logged and retried
+        on the next poll instead of stopping the watcher.
+        """
+        while True:
+            try:
+                report = self.run(on_result=on_result)
+                if on_cycle and (report.uploaded or report.failed):
+                    on_cycle(report)
+            except Exception:
+                logger.exception("Ingest cycle failed; retrying in %.0fs", interval)
+            time.sleep(interval)
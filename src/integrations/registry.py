@@ -0,0 +1,76 @@
+"""Process-wide integration clients, created on first use.
+
+The backend, the agent tools and the trackers all share one client per
+dependency (and so one connection pool and one resilience policy). Nothing
+is constructed — or even imported, in the Snowflake connector's case — until
+a client is first asked for.
+"""
+import threading
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from integrations.mlmonitoring_client import MLMonitoringClient
+    from integrations.rag_client import RAGClient
+    from integrations.snowflake_client import SnowflakeClient
+
+
+def _snowflake():
+    from integrations.snowflake_client import SnowflakeClient
+
+    return SnowflakeClient()
+
+
+def _rag():
+    from integrations.rag_client import RAGClient
+
+    return RAGClient()
+
+
+def _mlmonitor():
+    from integrations.mlmonitoring_client import MLMonitoringClient
+
+    return MLMonitoringClient()
+
+
+FACTORIES: dict[str, Callable[[], Any]] = {
+    "snowflake": _snowflake,
+    "rag": _rag,
+    "mlmonitor": _mlmonitor,
+}
+
+_clients: dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def get_client(name: str) -> Any:
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = FACTORIES[name]()
+    return client
+
+
+def get_snowflake() -> "SnowflakeClient":
+    return get_client("snowflake")
+
+
+def get_rag() -> "RAGClient":
+    return get_client("rag")
+
+
+def get_mlmonitor() -> "MLMonitoringClient":
+    return get_client("mlmonitor")
+
+
+def warm_up(names: tuple[str, ...] = tuple(FACTORIES)) -> dict[str, str | None]:
+    """Construct clients ahead of first use; returns {name: error or None}."""
+    errors = {}
+    for name in names:
+        try:
+            get_client(name)
+            errors[name] = None
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+    return errors
@@ -0,0 +1,455 @@
+"""Shared resilience layer for outbound integrations.
+
+Every dependency (snowflake, rag, mlmonitor, slack, github) gets one
+process-wide Policy: a circuit breaker, jittered exponential retries capped
+by a retry budget, optional hedged requests for idempotent reads, and call
+metrics. Breakers are registered by dependency name, so the health
+aggregator and the clients see and drive the same state: once a dependency
+fails repeatedly, callers fail fast until a trial call after the cool-down
+succeeds. TokenBucket rate-limits outbound notifications and honours the
+server's rate-limit headers.
+"""
+import bisect
+import functools
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable
+
+import httpx
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+    def __init__(self, name: str, retry_in: float):
+        super().__init__(f"{name} unavailable (circuit open, retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class RateLimitedError(CircuitOpenError):
+    """Raised when a rate limiter would make the caller wait longer than it allows."""
+
+    def __init__(self, name: str, retry_in: float):
+        RuntimeError.__init__(self, f"{name} rate limited (retry in {retry_in:.0f}s)")
+        self.name = name
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """closed → open after `failure_threshold` consecutive failures;
+    open → half-open after `reset_timeout_sec`; half-open lets one trial
+    call through and closes on success or re-opens on failure.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout_sec: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_sec = reset_timeout_sec
+        self._state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == "open" and time.monotonic() - self._opened_at >= self.reset_timeout_sec:
+                return "half_open"
+            return self._state
+
+    def allow(self) -> bool:
+        """Whether a call may proceed now (claims the half-open trial slot)."""
+        with self._lock:
+            if self._state == "closed":
+                return True
+            if self._state == "open":
+                if time.monotonic() - self._opened_at < self.reset_timeout_sec:
+                    return False
+                self._state = "half_open"
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def retry_in(self) -> float:
+        with self._lock:
+            if self._state != "open":
+                return 0.0
+            return max(0.0, self.reset_timeout_sec - (time.monotonic() - self._opened_at))
+
+    def check(self):
+        """Raise CircuitOpenError unless a call may proceed."""
+        if not self.allow():
+            raise CircuitOpenError(self.name, self.retry_in())
+
+    def record_success(self):
+        with self._lock:
+            self._state = "closed"
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == "half_open" or self._failures >= self.failure_threshold:
+                self._state = "open"
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "retry_in_sec": round(self.retry_in(), 1),
+        }
+
+
+class LatencyHistogram:
+    """Cumulative latency histogram (milliseconds) with Prometheus-style buckets."""
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self, buckets_ms: tuple[float, ...] = BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._sum_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets_ms, ms)] += 1
+            self._sum_ms += ms
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bucket bound containing the q-quantile (None when empty)."""
+        with self._lock:
+            total = sum(self._counts)
+            if not total:
+                return None
+            rank = q * total
+            seen = 0
+            for bound, n in zip(self.buckets_ms + (float("inf"),), self._counts):
+                seen += n
+                if seen >= rank:
+                    return bound
+        return float("inf")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = sum(counts)
+            sum_ms = self._sum_ms
+        cumulative, running = {}, 0
+        for bound, n in zip([str(b) for b in self.buckets_ms] + ["+Inf"], counts):
+            running += n
+            cumulative[bound] = running
+        return {
+            "count": total,
+            "mean_ms": round(sum_ms / total, 2) if total else None,
+            "p50_ms": self.quantile(0.5),
+            "p99_ms": self.quantile(0.99),
+            "buckets": cumulative,
+        }
+
+
+class RetryBudget:
+    """Retries may add at most `ratio` extra load: each call earns `ratio`
+    tokens (capped at `max_tokens`), each retry spends one."""
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class TokenBucket:
+    """Client-side rate limiter: `rate_per_sec` sustained, bursts up to `burst`.
+
+    observe_headers() pauses the bucket when the server says so (Retry-After,
+    or X-RateLimit-Remaining: 0 with X-RateLimit-Reset), so callers queue here
+    instead of collecting 429s.
+    """
+
+    def __init__(self, name: str, rate_per_sec: float, burst: int = 1):
+        self.name = name
+        self.rate_per_sec = rate_per_sec
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _wait_needed(self, now: float) -> float:
+        if now < self._paused_until:
+            return self._paused_until - now
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_sec)
+        self._updated = now
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate_per_sec
+
+    def acquire(self, timeout: float | None = None):
+        """Take one token, sleeping as needed; RateLimitedError if that exceeds `timeout`."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait_sec = self._wait_needed(now)
+                if wait_sec == 0.0:
+                    self._tokens -= 1.0
+                    return
+            if deadline is not None and now + wait_sec > deadline:
+                raise RateLimitedError(self.name, wait_sec)
+            time.sleep(min(wait_sec, 1.0))
+
+    def pause(self, seconds: float):
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def observe_headers(self, headers) -> float:
+        """Apply server rate-limit headers; returns the pause imposed (0 if none)."""
+        pause = 0.0
+        retry_after = headers.get("retry-after")
+        if retry_after:
+            try:
+                pause = float(retry_after)
+            except ValueError:
+                pass
+        elif headers.get("x-ratelimit-remaining") == "0" and headers.get("x-ratelimit-reset"):
+            try:
+                pause = float(headers["x-ratelimit-reset"]) - time.time()
+            except ValueError:
+                pass
+        if pause > 0:
+            self.pause(pause)
+        return max(pause, 0.0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "rate_per_sec": self.rate_per_sec,
+                "burst": self.burst,
+                "paused_for_sec": round(max(0.0, self._paused_until - now), 1),
+            }
+
+
+def is_transient_http(exc: BaseException) -> bool:
+    """Timeouts, connection errors, 429 and 5xx are worth retrying; other 4xx are not."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+        return code == 429 or code >= 500
+    return isinstance(exc, httpx.TransportError)
+
+
+def fail_fast_message(exc: BaseException) -> str:
+    """Tool-facing text for a dependency that is down, worded to stop agent retry loops."""
+    return f"{exc}. The service is temporarily unavailable — do not retry; continue with the information you have."
+
+
+def fail_fast(fn: Callable) -> Callable:
+    """Decorator for agent tools: an open circuit becomes a fail_fast_message."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        try:
+            return fn(*args, **kwargs)
+        except CircuitOpenError as e:
+            return fail_fast_message(e)
+
+    return wrapper
+
+
+_hedge_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+
+class Policy:
+    def __init__(
+        self,
+        name: str,
+        retries: int = 2,
+        base_delay_sec: float = 0.2,
+        max_delay_sec: float = 2.0,
+        retry_budget_ratio: float = 0.2,
+        hedge_after_ms: float = 0.0,
+        is_transient: Callable[[BaseException], bool] = is_transient_http,
+        failure_threshold: int = 5,
+        reset_timeout_sec: float = 30.0,
+    ):
+        """`hedge_after_ms=0` hedges at the observed p95 latency once there is enough history."""
+        self.name = name
+        self.retries = retries
+        self.base_delay_sec = base_delay_sec
+        self.max_delay_sec = max_delay_sec
+        self.hedge_after_ms = hedge_after_ms
+        self.is_transient = is_transient
+        self.breaker = get_breaker(name, failure_threshold, reset_timeout_sec)
+        self.budget = RetryBudget(retry_budget_ratio)
+        self.latency = LatencyHistogram()
+        self.counters = dict.fromkeys(
+            ("calls", "successes", "failures", "retries", "short_circuited", "hedges", "hedge_wins"), 0
+        )
+        self._lock = threading.Lock()
+
+    def _count(self, key: str, n: int = 1):
+        with self._lock:
+            self.counters[key] += n
+
+    def _hedge_delay_sec(self) -> float | None:
+        if self.hedge_after_ms:
+            return self.hedge_after_ms / 1000
+        if self.latency.count < 20:
+            return None
+        p95 = self.latency.quantile(0.95)
+        return p95 / 1000 if p95 and p95 != float("inf") else None
+
+    def _hedged(self, fn: Callable[[], Any]) -> Any:
+        """Run fn; if it is slower than the hedge delay, race a second copy."""
+        delay = self._hedge_delay_sec()
+        if delay is None:
+            return fn()
+        primary = _hedge_pool.submit(fn)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+        self._count("hedges")
+        backup = _hedge_pool.submit(fn)
+        pending = {primary, backup}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                if fut.exception() is None:
+                    if fut is backup:
+                        self._count("hedge_wins")
+                    return fut.result()
+                error = fut.exception()
+        raise error
+
+    def call(
+        self,
+        fn: Callable,
+        *args,
+        idempotent: bool = False,
+        hedge: bool = False,
+        retries: int | None = None,
+        **kwargs,
+    ) -> Any:
+        """Call fn through the breaker. Only idempotent calls are retried or hedged.
+
+        `retries` overrides the policy's retry count (e.g. 0 for health probes).
+        """
+        max_retries = self.retries if retries is None else retries
+        if not self.breaker.allow():
+            self._count("short_circuited")
+            raise CircuitOpenError(self.name, self.breaker.retry_in())
+        self._count("calls")
+        self.budget.deposit()
+        attempt = 0
+        start = time.perf_counter()
+        while True:
+            try:
+                if hedge and idempotent:
+                    result = self._hedged(lambda: fn(*args, **kwargs))
+                else:
+                    result = fn(*args, **kwargs)
+            except Exception as e:
+                transient = self.is_transient(e)
+                if transient and idempotent and attempt < max_retries and self.budget.try_spend():
+                    attempt += 1
+                    self._count("retries")
+                    cap = min(self.max_delay_sec, self.base_delay_sec * 2 ** attempt)
+                    time.sleep(random.uniform(0, cap))  # full jitter
+                    continue
+                if transient:
+                    self._count("failures")
+                    self.breaker.record_failure()
+                else:
+                    # The dependency answered (e.g. 4xx); that is not an outage.
+                    self.breaker.record_success()
+                raise
+            self.latency.observe((time.perf_counter() - start) * 1000)
+            self._count("successes")
+            self.breaker.record_success()
+            return result
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        return {**counters, "latency": self.latency.snapshot(), "breaker": self.breaker.snapshot()}
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_policies: dict[str, Policy] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str, failure_threshold: int = 5, reset_timeout_sec: float = 30.0) -> CircuitBreaker:
+    """Process-wide breaker for a dependency (created on first use)."""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name, failure_threshold, reset_timeout_sec)
+        return breaker
+
+
+def breakers() -> dict[str, CircuitBreaker]:
+    with _registry_lock:
+        return dict(_breakers)
+
+
+def get_policy(name: str, **kwargs) -> Policy:
+    """Process-wide policy for a dependency; `kwargs` apply on first creation only.
+
+    Defaults come from settings (BREAKER_*, RETRY_*, HEDGE_AFTER_MS).
+    """
+    from config import settings
+
+    with _registry_lock:
+        policy = _policies.get(name)
+    if policy is not None:
+        return policy
+    options = {
+        "retries": settings.retry_max_attempts,
+        "retry_budget_ratio": settings.retry_budget_ratio,
+        "hedge_after_ms": settings.hedge_after_ms,
+        "failure_threshold": settings.breaker_failure_threshold,
+        "reset_timeout_sec": settings.breaker_reset_sec,
+        **kwargs,
+    }
+    policy = Policy(name, **options)
+    with _registry_lock:
+        return _policies.setdefault(name, policy)
+
+
+def policies() -> dict[str, Policy]:
+    with _registry_lock:
+        return dict(_policies)
+
+
+def http_timeout() -> httpx.Timeout:
+    """Shared httpx timeout for integration clients (HTTP_TIMEOUT_SEC / HTTP_CONNECT_TIMEOUT_SEC)."""
+    from config import settings
+
+    return httpx.Timeout(settings.http_timeout_sec, connect=settings.http_connect_timeout_sec)
@@ -1,7 +1,13 @@
-"""Snowflake client for querying model metrics and data quality."""
+"""Snowflake client for querying model metrics and data quality.
+
+snowflake-connector-python is imported on first connection; it takes
+seconds to import and most processes that import this module never query.
+"""
+
+import contextlib
 
-import snowflake.connector
 from config import settings
+from integrations.resilience import get_policy
 
 METRIC_COLUMNS = frozenset({
     "f1_score", "precision_score", "recall_score", "auc_roc",
@@ -10,12 +16,29 @@ METRIC_COLUMNS = frozenset({
 })
 
 
+_READ_PREFIXES = ("SELECT", "WITH", "SHOW", "DESCRIBE")
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """Connection/network errors; SQL errors (ProgrammingError) are not."""
+    try:
+        from snowflake.connector import errors as sf_errors
+    except ImportError:
+        return False
+    return isinstance(exc, (sf_errors.OperationalError, sf_errors.InterfaceError))
+
+
 class SnowflakeClient:
     def __init__(self):
         self._conn = None
+        # The policy is process-wide, so its predicate must not hold on to this instance.
+        self._policy = get_policy("snowflake", is_transient=_is_transient)
 
-    def _get_conn(self):
+    def _get_conn(self, login_timeout: float | None = None):
+        """The shared connection, opened on first use; `login_timeout` bounds the connect."""
         if self._conn is None or self._conn.is_closed():
+            import snowflake.connector
+
             self._conn = snowflake.connector.connect(
                 account=settings.snowflake_account,
                 user=settings.snowflake_user,
@@ -23,21 +46,60 @@ class SnowflakeClient:
                 database=settings.snowflake_database,
                 schema=settings.snowflake_schema,
                 warehouse=settings.snowflake_warehouse,
+                login_timeout=login_timeout or settings.snowflake_login_timeout_sec,
+                network_timeout=settings.http_timeout_sec,
             )
         return self._conn
 
-    def query(self, sql: str, params: tuple | None = None) -> list[dict]:
-        """Run SQL and return rows as list of dicts."""
-        conn = self._get_conn()
+    @contextlib.contextmanager
+    def _cursor(self, login_timeout: float | None = None):
+        """(connection, cursor); a connection error drops the connection so the retry reconnects."""
+        conn = self._get_conn(login_timeout)
         cur = conn.cursor()
         try:
+            yield conn, cur
+        except Exception as e:
+            if _is_transient(e):
+                self._conn = None
+            raise
+        finally:
+            cur.close()
+
+    def query(self, sql: str, params: tuple | None = None) -> list[dict]:
+        """Run SQL and return rows as list of dicts (reads are retried)."""
+        idempotent = sql.lstrip().upper().startswith(_READ_PREFIXES)
+        return self._policy.call(self._query, sql, params, idempotent=idempotent)
+
+    def _query(self, sql: str, params: tuple | None) -> list[dict]:
+        with self._cursor() as (_, cur):
             cur.execute(sql, params or ())
             if cur.description is None:
                 return []
             cols = [d[0].lower() for d in cur.description]
             return [dict(zip(cols, row)) for row in cur.fetchall()]
-        finally:
-            cur.close()
+
+    def ping(self, timeout: float | None = None) -> bool:
+        """Round-trip `SELECT 1`, cancelled server-side after `timeout` seconds."""
+        return self._policy.call(self._ping, timeout, retries=0)
+
+    def _ping(self, timeout: float | None) -> bool:
+        # A health check must not sit out the full login timeout on a cold connection.
+        login = max(1, int(min(timeout, settings.snowflake_login_timeout_sec))) if timeout else None
+        with self._cursor(login_timeout=login) as (_, cur):
+            cur.execute("SELECT 1", timeout=max(1, int(timeout)) if timeout else None)
+            return True
+
+    def executemany(self, sql: str, rows: list[tuple]) -> int:
+        """Run a parameterized statement for many rows in one round trip and commit."""
+        if not rows:
+            return 0
+        return self._policy.call(self._executemany, sql, rows)
+
+    def _executemany(self, sql: str, rows: list[tuple]) -> int:
+        with self._cursor() as (conn, cur):
+            cur.executemany(sql, rows)
+            conn.commit()
+            return len(rows)
 
     def get_latest_model_metrics(
         self, model_name: str = "classifier_v2", hours: int = 1
@@ -81,6 +143,20 @@ class SnowflakeClient:
             (model_name, -hours),
         )
 
+    def get_metric_trends(
+        self, model_name: str, metrics: list[str], hours: int = 24
+    ) -> list[dict]:
+        """Several MODEL_METRICS columns over time in one query (ascending ts)."""
+        invalid = [m for m in metrics if m not in METRIC_COLUMNS]
+        if invalid:
+            raise ValueError(f"Invalid metric(s): {invalid}. Must be one of {METRIC_COLUMNS}")
+        return self.query(
+            f"SELECT ts, {', '.join(metrics)} FROM MODEL_METRICS "
+            "WHERE model_name = %s AND ts > DATEADD(hour, %s, CURRENT_TIMESTAMP()) "
+            "ORDER BY ts ASC",
+            (model_name, -hours),
+        )
+
     def get_incidents(self, status: str | None = None, limit: int = 10) -> list[dict]:
         if status:
             return self.query(
@@ -92,6 +168,36 @@ class SnowflakeClient:
             (limit,),
         )
 
+    def get_incidents_since(self, since, limit: int = 1000) -> list[dict]:
+        """Incidents at or after `since` (inclusive: a row landing later with the same ts isn't skipped)."""
+        return self.query(
+            "SELECT * FROM INCIDENTS WHERE ts >= %s ORDER BY ts ASC LIMIT %s",
+            (since, limit),
+        )
+
+    def get_incident_drift(self, start, end, window_hours: int) -> list[dict]:
+        """Max PSI per feature within ±window_hours of each incident between start and end.
+
+        One query for the whole batch: rows are (incident_row_id, feature_name,
+        psi_score), incident_row_id being INCIDENTS.id.
+        """
+        return self.query(
+            "SELECT i.id AS incident_row_id, d.feature_name, MAX(d.psi_score) AS psi_score "
+            "FROM INCIDENTS i JOIN FEATURE_DRIFT d ON d.model_name = i.affected_component "
+            "AND d.ts BETWEEN DATEADD(hour, %s, i.ts) AND DATEADD(hour, %s, i.ts) "
+            "WHERE i.ts BETWEEN %s AND %s "
+            "GROUP BY i.id, d.feature_name",
+            (-window_hours, window_hours, start, end),
+        )
+
+    def insert_feature_drift(self, rows: list[tuple]) -> int:
+        """Bulk insert (ts, model_name, feature_name, psi, ks, mean_shift, std_shift) rows."""
+        return self.executemany(
+            "INSERT INTO FEATURE_DRIFT (ts, model_name, feature_name, psi_score, "
+            "ks_statistic, mean_shift, std_shift) VALUES (%s, %s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+
     def close(self):
         if self._conn and not self._conn.is_closed():
             self._conn.close()
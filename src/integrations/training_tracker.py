@@ -0,0 +1,211 @@
+"""Background tracking of retraining jobs.
+
+trigger() starts retraining through the ML Monitoring client and then
+follows the run in a daemon thread: /training/status is polled with adaptive
+backoff (fast while the run is changing, slower while it is not), progress
+and the new model's metrics are cached, and listeners are called on every
+change and on completion. Agents and the dashboard read the cached state
+instead of polling the service themselves.
+"""
+import threading
+import time
+from datetime import datetime, UTC
+from typing import Callable
+
+from config import settings
+
+TERMINAL_STATUSES = frozenset({"completed", "succeeded", "success", "failed", "error", "cancelled"})
+CLOCK_SKEW_SEC = 30.0  # allowed difference between our clock and the service's run timestamps
+
+
+def _run_status(run: dict) -> str:
+    return str(run.get("status") or run.get("state") or "unknown").lower()
+
+
+def _run_id(data: dict):
+    for key in ("run_id", "job_id", "training_id", "id"):
+        if data.get(key) is not None:
+            return data[key]
+    return None
+
+
+def _started_ts(run: dict) -> float | None:
+    """Epoch seconds the run started, from an epoch or an ISO timestamp (naive means UTC)."""
+    value = run.get("started_at") or run.get("created_at")
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value / 1000 if value > 1e11 else float(value)  # epoch millis
+    if isinstance(value, str):
+        try:
+            ts = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        return (ts if ts.tzinfo else ts.replace(tzinfo=UTC)).timestamp()
+    return None
+
+
+def _pick_run(runs: list[dict], run_id, since: float) -> dict | None:
+    """The tracked run: matched by id when the trigger returned one, else the newest
+    run started after `since` (the trigger time).
+
+    A run that started up to CLOCK_SKEW_SEC before the trigger, or that carries no
+    usable timestamp, is taken only while it is still in progress — otherwise the
+    previous, already finished run would be reported as the outcome.
+    """
+    if run_id is not None:
+        for run in runs:
+            if _run_id(run) == run_id:
+                return run
+    candidates = []
+    for run in runs:
+        started = _started_ts(run)
+        if started is not None and started >= since:
+            candidates.append((started, run))
+        elif (started is None or started >= since - CLOCK_SKEW_SEC) and _run_status(run) not in TERMINAL_STATUSES:
+            candidates.append((started or since, run))
+    if not candidates:
+        return None
+    return max(candidates, key=lambda c: c[0])[1]
+
+
+class TrainingTracker:
+    def __init__(
+        self,
+        client,
+        min_interval_sec: float = 5.0,
+        max_interval_sec: float = 60.0,
+        backoff: float = 1.5,
+        max_duration_sec: float = 6 * 3600,
+    ):
+        """`client` is an MLMonitoringClient (trigger_retraining / training_status)."""
+        self.client = client
+        self.min_interval_sec = min_interval_sec
+        self.max_interval_sec = max_interval_sec
+        self.backoff = backoff
+        self.max_duration_sec = max_duration_sec
+        self._jobs: dict[str, dict] = {}
+        self._listeners: list[Callable[[dict], None]] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, fn: Callable[[dict], None]):
+        """Call `fn(job)` whenever a tracked job changes (job["done"] marks completion)."""
+        self._listeners.append(fn)
+
+    def trigger(self, model_type: str = "classifier") -> dict:
+        """Start retraining and track it; returns the service's trigger response."""
+        since = time.time()
+        result = self.client.trigger_retraining(model_type)
+        self.track(model_type, run_id=_run_id(result) if isinstance(result, dict) else None, since=since)
+        return result
+
+    def track(self, model_type: str, run_id=None, since: float | None = None):
+        """Follow a run; without `run_id`, only runs started after `since` (default: now) qualify."""
+        now = time.time()
+        job = {
+            "model_type": model_type,
+            "run_id": run_id,
+            "status": "triggered",
+            "progress": None,
+            "metrics": None,
+            "last_run": None,
+            "error": None,
+            "done": False,
+            "started_at": since or now,
+            "updated_at": now,
+            "completed_at": None,
+            "polls": 0,
+            "next_poll_in_sec": self.min_interval_sec,
+        }
+        with self._lock:
+            self._jobs[model_type] = job  # a poller of an older job for this model stops
+        threading.Thread(
+            target=self._poll, args=(model_type, job), name=f"training-{model_type}", daemon=True
+        ).start()
+        self._notify(job)
+
+    def status(self, model_type: str) -> dict | None:
+        """Cached state of the latest tracked job for a model type (no HTTP)."""
+        with self._lock:
+            job = self._jobs.get(model_type)
+            return dict(job) if job else None
+
+    def snapshot(self) -> dict[str, dict]:
+        with self._lock:
+            return {m: dict(j) for m, j in self._jobs.items()}
+
+    def _notify(self, job: dict):
+        for fn in self._listeners:
+            try:
+                fn(dict(job))
+            except Exception:
+                pass
+
+    def _update(self, model_type: str, job: dict, **changes) -> dict | None:
+        """Apply changes to `job` if it is still the current job for the model."""
+        with self._lock:
+            if self._jobs.get(model_type) is not job:
+                return None
+            job.update(changes, updated_at=time.time())
+            return dict(job)
+
+    def _poll(self, model_type: str, job: dict):
+        interval = self.min_interval_sec
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if self._jobs.get(model_type) is not job or job["done"]:
+                    return
+                run_id, started_at, polls = job["run_id"], job["started_at"], job["polls"]
+                previous, metrics = (job["status"], job["progress"]), job["metrics"]
+            try:
+                run = _pick_run(self.client.training_status(model_type), run_id, started_at)
+                error = None
+            except Exception as e:
+                run, error = None, f"{type(e).__name__}: {e}"[:300]
+
+            changes: dict = {"polls": polls + 1, "error": error}
+            if run is not None:
+                status = _run_status(run)
+                changes.update(
+                    status=status,
+                    progress=run.get("progress"),
+                    metrics=run.get("metrics") or run.get("new_model_metrics") or metrics,
+                    last_run=run,
+                )
+                if status in TERMINAL_STATUSES:
+                    changes.update(done=True, completed_at=time.time())
+            if not changes.get("done") and time.time() - started_at > self.max_duration_sec:
+                changes.update(status="timeout", done=True, completed_at=time.time())
+
+            # Poll quickly while the run is moving, back off while it is idle or erroring.
+            moved = run is not None and (changes["status"], changes["progress"]) != previous
+            interval = self.min_interval_sec if moved else min(self.max_interval_sec, interval * self.backoff)
+            changes["next_poll_in_sec"] = None if changes.get("done") else round(interval, 1)
+
+            updated = self._update(model_type, job, **changes)
+            if updated is None:
+                return
+            if moved or updated["done"]:
+                self._notify(updated)
+            if updated["done"]:
+                return
+
+
+_tracker: TrainingTracker | None = None
+_tracker_lock = threading.Lock()
+
+
+def get_training_tracker(client=None) -> TrainingTracker:
+    """Process-wide tracker; `client` is used on first creation (default: the shared MLMonitoringClient)."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            if client is None:
+                from integrations.registry import get_mlmonitor
+
+                client = get_mlmonitor()
+            _tracker = TrainingTracker(
+                client,
+                min_interval_sec=settings.training_poll_min_sec,
+                max_interval_sec=settings.training_poll_max_sec,
+            )
+        return _tracker
@@ -0,0 +1 @@
+from .cache import LLMCache, cache_key, get_llm_cache
@@ -0,0 +1,167 @@
+"""Content-addressed cache of LLM responses.
+
+A response is keyed by a hash of the model, the messages and the generation
+parameters, so an identical request — the same summary asked for twice, or a
+monitor cycle over unchanged metrics — is answered from the cache without an
+API call. Entries live in a small in-memory LRU in front of a SQLite file
+(shared by processes, survives restarts); the file is LRU-bounded too, by
+last use, and entries older than the TTL are ignored.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from config import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0,
+    response TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_last_used ON llm_cache(last_used);
+"""
+
+MEMORY_ENTRIES = 256
+
+
+def cache_key(model: str, messages, params: dict | None = None) -> str:
+    """sha256 over model + messages + generation params (order-insensitive for dict keys)."""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": params or {}},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMCache:
+    def __init__(self, path: str | Path | None = None, max_entries: int = 2000,
+                 ttl_sec: float = 7 * 86400, memory_entries: int = MEMORY_ENTRIES):
+        """`path` None/"" keeps the cache in memory only."""
+        self.path = str(path) if path else None
+        self.max_entries = max_entries
+        self.ttl_sec = ttl_sec
+        self.memory_entries = min(memory_entries, max_entries)
+        self._memory: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self.hits = 0
+        self.misses = 0
+        if self.path:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA busy_timeout=5000")
+            self._conn.executescript(SCHEMA)
+
+    def _remember(self, key: str, created_at: float, response: str):
+        self._memory[key] = (created_at, response)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None and self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT created_at, response FROM llm_cache WHERE key = ?", (key,)
+                ).fetchone()
+                entry = tuple(row) if row else None
+            if entry is None or now - entry[0] > self.ttl_sec:
+                if entry is not None:
+                    self._memory.pop(key, None)
+                self.misses += 1
+                return None
+            self._remember(key, *entry)
+            if self._conn is not None:
+                self._conn.execute(
+                    "UPDATE llm_cache SET last_used = ?, hits = hits + 1 WHERE key = ?", (now, key)
+                )
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, response: str, model: str = ""):
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, response)
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT INTO llm_cache (key, model, created_at, last_used, response) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET created_at = excluded.created_at, "
+                "last_used = excluded.last_used, response = excluded.response",
+                (key, model, now, now, response),
+            )
+            # LRU bound on disk: drop the least recently used beyond max_entries.
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN (SELECT key FROM llm_cache "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def get_or_call(self, model: str, messages, params: dict | None, call) -> tuple[str, bool]:
+        """(response, cached): the cached response, or `call()`'s result, stored."""
+        key = cache_key(model, messages, params)
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        response = call()
+        if isinstance(response, str) and response:
+            self.put(key, response, model)
+        return response, False
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM llm_cache")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            entries = (
+                self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+                if self._conn is not None else len(self._memory)
+            )
+            total = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl_sec,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else None,
+            }
+
+
+_cache: LLMCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache | None:
+    """Process-wide cache, or None when LLM_CACHE_ENABLED is off."""
+    global _cache
+    if not settings.llm_cache_enabled:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMCache(
+                settings.llm_cache_path,
+                max_entries=settings.llm_cache_max_entries,
+                ttl_sec=settings.llm_cache_ttl_sec,
+            )
+        return _cache
@@ -0,0 +1,148 @@
+"""Compaction of tool outputs before they reach an agent's context.
+
+Agents rarely need every row of a metric series or every feature's drift
+score — they need the shape: where the series started and ended, its range
+and slope, whether and when it shifted, and which features are drifting.
+The helpers here turn raw rows into that shape, and token_budget() caps any
+tool result at a hard token budget (larger when the agent asks for verbose
+output) so a long window can't blow up a turn.
+"""
+import functools
+import inspect
+from datetime import datetime
+
+import numpy as np
+
+from config import settings
+from monitoring.changepoint import detect_metric_changes
+from monitoring.rules import get_rule_engine
+from telemetry import CHARS_PER_TOKEN, approx_tokens
+
+SKETCH_POINTS = 8
+
+
+def fit_budget(text: str, max_tokens: int, hint: str = "") -> str:
+    """Truncate `text` at a line boundary so it fits `max_tokens`, noting what was cut."""
+    if max_tokens <= 0 or approx_tokens(text) <= max_tokens:
+        return text
+    lines = text.splitlines()
+    limit = max_tokens * CHARS_PER_TOKEN - 120  # room for the note
+    kept: list[str] = []
+    used = 0
+    for line in lines:
+        if used + len(line) + 1 > limit:
+            break
+        kept.append(line)
+        used += len(line) + 1
+    if not kept:  # one very long line
+        kept = [text[:max(limit, 0)]]
+        omitted = "the rest of the output"
+    else:
+        omitted = f"{len(lines) - len(kept)} more line(s)"
+    kept.append(f"... [{omitted} truncated to fit {max_tokens} tokens{hint}]")
+    return "\n".join(kept)
+
+
+def token_budget(fn=None, *, verbose: bool = False):
+    """Cap a tool's string result at TOOL_OUTPUT_MAX_TOKENS, or at
+    TOOL_OUTPUT_VERBOSE_MAX_TOKENS when called with verbose=True (always, for
+    `@token_budget(verbose=True)`). Keeps the signature for CrewAI's schema."""
+    if fn is None:
+        return functools.partial(token_budget, verbose=verbose)
+    accepts_verbose = "verbose" in inspect.signature(fn).parameters
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        result = fn(*args, **kwargs)
+        if not isinstance(result, str):
+            return result
+        wide = verbose or (accepts_verbose and bool(kwargs.get("verbose")))
+        budget = settings.tool_output_verbose_max_tokens if wide else settings.tool_output_max_tokens
+        hint = "; call again with verbose=True for more" if accepts_verbose and not wide else ""
+        return fit_budget(result, budget, hint)
+
+    return wrapper
+
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.4f}"
+    return str(value)
+
+
+def _hours(ts: list) -> np.ndarray | None:
+    """Hours since the first timestamp, or None if the timestamps aren't datetimes."""
+    parsed = []
+    for t in ts:
+        if isinstance(t, str):
+            try:
+                t = datetime.fromisoformat(t)
+            except ValueError:
+                return None
+        if not isinstance(t, datetime):
+            return None
+        parsed.append(t.timestamp())
+    arr = np.asarray(parsed, dtype=np.float64)
+    return (arr - arr[0]) / 3600.0
+
+
+def summarize_series(rows: list[dict], metric: str) -> list[str]:
+    """Statistical summary of a metric series (ascending ts): endpoints, range, slope,
+    change point, plus a few evenly spaced sample points."""
+    pairs = [(r.get("ts", r.get("timestamp")), r.get(metric)) for r in rows]
+    pairs = [(t, v) for t, v in pairs if isinstance(v, (int, float))]
+    if not pairs:
+        return [f"No numeric values for {metric}."]
+    ts = [t for t, _ in pairs]
+    x = np.asarray([v for _, v in pairs], dtype=np.float64)
+    i_min, i_max = int(x.argmin()), int(x.argmax())
+
+    lines = [
+        f"Window: {ts[0]} → {ts[-1]}",
+        f"First: {_fmt(float(x[0]))} | Last: {_fmt(float(x[-1]))} | Mean: {_fmt(float(x.mean()))} "
+        f"| Std: {_fmt(float(x.std()))}",
+        f"Min: {_fmt(float(x[i_min]))} at {ts[i_min]} | Max: {_fmt(float(x[i_max]))} at {ts[i_max]}",
+    ]
+    if len(x) >= 2:
+        hours = _hours(ts)
+        if hours is not None and hours[-1] > 0:
+            slope, unit = float(np.polyfit(hours, x, 1)[0]), "per hour"
+        else:
+            slope, unit = float(np.polyfit(np.arange(len(x)), x, 1)[0]), "per point"
+        lines.append(f"Slope: {slope:+.4g} {unit}")
+
+    change = detect_metric_changes(rows, metric)
+    onset_index = None
+    if change["detected"]:
+        s = change["summary"]
+        onset_index = s.get("onset_index")
+        lines.append(
+            f"Change point ({change['votes']}/3 detectors): onset {s['onset_ts']}, "
+            f"{s['baseline_mean']:.4f} → {s['shifted_mean']:.4f} "
+            f"({s['magnitude']:+.4f}, {s['relative_magnitude']:+.1%})"
+        )
+    else:
+        lines.append("Change point: none — stable against its baseline")
+
+    # A handful of points to show the shape, always including the onset and the extremes.
+    picks = set(np.linspace(0, len(x) - 1, min(SKETCH_POINTS, len(x))).round().astype(int).tolist())
+    picks |= {i_min, i_max}
+    if onset_index is not None and 0 <= onset_index < len(x):
+        picks.add(int(onset_index))
+    lines.append("Samples: " + ", ".join(f"{ts[i]}={_fmt(float(x[i]))}" for i in sorted(picks)))
+    return lines
+
+
+def drift_status(psi: float, model: str = "*") -> str:
+    """CRITICAL / WARNING / ok for a feature's PSI, by the drift_score alert rules."""
+    severity = get_rule_engine().severity("drift_score", psi, model)
+    return {"critical": "CRITICAL", "warning": "WARNING"}.get(severity, "ok")
+
+
+def rollup_drift(rows: list[dict], top_k: int, model: str = "*") -> tuple[list[dict], list[dict]]:
+    """(shown, rolled_up): every flagged feature plus the top_k by PSI; the rest roll up."""
+    ranked = sorted(rows, key=lambda r: -(r.get("psi_score") or 0))
+    shown = [r for i, r in enumerate(ranked)
+             if i < top_k or drift_status(r.get("psi_score") or 0, model) != "ok"]
+    rolled = ranked[len(shown):]
+    return shown, rolled
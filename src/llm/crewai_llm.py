@@ -0,0 +1,46 @@
+"""CrewAI LLM that answers repeated prompts from the response cache.
+
+Only plain completions are cached: a call that passes tools or functions for
+the model to invoke goes straight to the provider, since replaying it would
+skip the side effects. Every call is recorded in telemetry (wall time,
+estimated tokens, cache hit, error).
+"""
+import time
+
+from crewai import LLM
+
+from llm.cache import get_llm_cache
+from telemetry import approx_tokens, record
+
+# LLM attributes that change the completion and so belong in the cache key.
+_KEY_PARAMS = ("temperature", "top_p", "max_tokens", "max_completion_tokens", "stop", "seed", "response_format")
+
+
+class CachedLLM(LLM):
+    def _cache_params(self) -> dict:
+        return {name: getattr(self, name, None) for name in _KEY_PARAMS}
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        start = time.perf_counter()
+        cached = False
+        try:
+            cache = get_llm_cache()
+            if cache is None or tools or available_functions:
+                response = super().call(messages, tools=tools, callbacks=callbacks,
+                                        available_functions=available_functions, **kwargs)
+            else:
+                response, cached = cache.get_or_call(
+                    self.model,
+                    messages,
+                    self._cache_params(),
+                    lambda: super(CachedLLM, self).call(messages, tools=tools, callbacks=callbacks,
+                                                        available_functions=available_functions, **kwargs),
+                )
+        except Exception:
+            record("llm", self.model, time.perf_counter() - start, error=True,
+                   tokens_in=approx_tokens(messages))
+            raise
+        record("llm", self.model, time.perf_counter() - start, cached=cached,
+               tokens_in=0 if cached else approx_tokens(messages),
+               tokens_out=0 if cached else approx_tokens(response))
+        return response
@@ -0,0 +1,138 @@
+"""Long-lived LLM provider clients for direct (non-agent) completions.
+
+One sync and one async SDK client per provider, created on first use and
+reused, so requests share the SDK's connection pool instead of paying a TLS
+handshake each time. astream() relays text deltas from the providers'
+streaming APIs as they arrive.
+"""
+import threading
+from typing import AsyncIterator
+
+import httpx
+
+from config import settings
+
+
+def _timeout() -> httpx.Timeout:
+    return httpx.Timeout(settings.http_timeout_sec, connect=settings.http_connect_timeout_sec)
+
+
+class Provider:
+    name = ""
+    model = ""  # provider's model id
+
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self._client = None
+        self._aclient = None
+        self._lock = threading.Lock()
+
+    @property
+    def cache_model(self) -> str:
+        """Model name as used in LLM cache keys ("<provider>/<model>", as CrewAI spells it)."""
+        return f"{self.name}/{self.model}"
+
+    def _make_clients(self) -> tuple:
+        raise NotImplementedError
+
+    def _clients(self) -> tuple:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    self._client, self._aclient = self._make_clients()
+        return self._client, self._aclient
+
+    @property
+    def client(self):
+        return self._clients()[0]
+
+    @property
+    def aclient(self):
+        return self._clients()[1]
+
+    def complete(self, messages: list[dict], max_tokens: int) -> str:
+        raise NotImplementedError
+
+    def astream(self, messages: list[dict], max_tokens: int) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+    async def aclose(self):
+        if self._aclient is not None:
+            await self._aclient.close()
+        if self._client is not None:
+            self._client.close()
+        self._client = self._aclient = None
+
+
+class AnthropicProvider(Provider):
+    name = "anthropic"
+    model = "claude-sonnet-4-20250514"
+
+    def _make_clients(self) -> tuple:
+        import anthropic
+
+        return (
+            anthropic.Anthropic(api_key=self.api_key, timeout=_timeout()),
+            anthropic.AsyncAnthropic(api_key=self.api_key, timeout=_timeout()),
+        )
+
+    def complete(self, messages: list[dict], max_tokens: int) -> str:
+        msg = self.client.messages.create(model=self.model, max_tokens=max_tokens, messages=messages)
+        return msg.content[0].text
+
+    async def astream(self, messages: list[dict], max_tokens: int) -> AsyncIterator[str]:
+        async with self.aclient.messages.stream(
+            model=self.model, max_tokens=max_tokens, messages=messages
+        ) as stream:
+            async for text in stream.text_stream:
+                if text:
+                    yield text
+
+
+class OpenAIProvider(Provider):
+    name = "openai"
+    model = "gpt-4o"
+
+    def _make_clients(self) -> tuple:
+        import openai
+
+        return (
+            openai.OpenAI(api_key=self.api_key, timeout=_timeout()),
+            openai.AsyncOpenAI(api_key=self.api_key, timeout=_timeout()),
+        )
+
+    def complete(self, messages: list[dict], max_tokens: int) -> str:
+        resp = self.client.chat.completions.create(model=self.model, max_tokens=max_tokens, messages=messages)
+        return resp.choices[0].message.content
+
+    async def astream(self, messages: list[dict], max_tokens: int) -> AsyncIterator[str]:
+        stream = await self.aclient.chat.completions.create(
+            model=self.model, max_tokens=max_tokens, messages=messages, stream=True
+        )
+        async for chunk in stream:
+            text = chunk.choices[0].delta.content if chunk.choices else None
+            if text:
+                yield text
+
+
+_provider: Provider | None = None
+_provider_ready = False
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> Provider | None:
+    """The configured provider (Anthropic, else OpenAI), or None without an API key."""
+    global _provider, _provider_ready
+    with _provider_lock:
+        if not _provider_ready:
+            if settings.anthropic_api_key:
+                _provider = AnthropicProvider(settings.anthropic_api_key)
+            elif settings.openai_api_key:
+                _provider = OpenAIProvider(settings.openai_api_key)
+            _provider_ready = True
+        return _provider
+
+
+async def close_providers():
+    if _provider is not None:
+        await _provider.aclose()
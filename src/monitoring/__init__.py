@@ -0,0 +1,3 @@
+from .drift import FEATURES, ReferenceProfile, DriftResult, compute_drift
+from .sketches import DriftSketch, StreamingDriftMonitor
+from .rules import Rule, RuleEngine, get_rule_engine
@@ -0,0 +1,236 @@
+"""Change-point and anomaly detection on metric time series.
+
+CUSUM, EWMA control charts and Page–Hinkley, each evaluated over a whole
+series with NumPy cumulative operations. Every detector reports whether it
+alarmed, the estimated onset (when the shift began, not when it was
+noticed) and the magnitude of the shift relative to the baseline.
+"""
+from dataclasses import asdict, dataclass
+
+import numpy as np
+
+# Direction in which each MODEL_METRICS column degrades.
+DEGRADATION_DIRECTION = {
+    "f1_score": "down",
+    "precision_score": "down",
+    "recall_score": "down",
+    "auc_roc": "down",
+    "drift_score": "up",
+    "latency_p50_ms": "up",
+    "latency_p95_ms": "up",
+    "latency_p99_ms": "up",
+    "anomaly_rate": "up",
+    "prediction_count": "both",
+}
+
+
+@dataclass
+class ChangePoint:
+    method: str
+    detected: bool
+    direction: str = ""
+    onset_index: int | None = None
+    alarm_index: int | None = None
+    onset_ts: str | None = None
+    alarm_ts: str | None = None
+    baseline_mean: float = 0.0
+    shifted_mean: float = 0.0
+    magnitude: float = 0.0  # shifted_mean - baseline_mean
+    relative_magnitude: float = 0.0  # magnitude / |baseline_mean|
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def baseline_stats(x: np.ndarray, baseline: int | None = None) -> tuple[float, float, int]:
+    """Mean/std of the leading `baseline` points (default: first half, at least 5)."""
+    n = len(x)
+    b = baseline or max(5, n // 2)
+    b = min(b, n)
+    ref = x[:b]
+    mu = float(ref.mean())
+    sigma = float(ref.std())
+    # Floor sigma so a perfectly flat baseline doesn't alarm on float noise.
+    sigma = max(sigma, 1e-3 * abs(mu), 1e-9)
+    return mu, sigma, b
+
+
+def _one_sided_cusum(z: np.ndarray, k: float) -> tuple[np.ndarray, np.ndarray]:
+    """S_t = max(0, S_{t-1} + z_t - k), computed as C_t - min_{s<=t} C_s.
+
+    Returns (S, reset) where reset[t] is the last index at which S was zero.
+    """
+    c = np.concatenate(([0.0], np.cumsum(z - k)))
+    running_min = np.minimum.accumulate(c)
+    s = (c - running_min)[1:]
+    # Index of the running minimum = the last reset before t.
+    is_new_min = c <= running_min
+    idx = np.where(is_new_min, np.arange(len(c)), 0)
+    reset = np.maximum.accumulate(idx)[1:]
+    return s, reset
+
+
+def _result(method, x, ts, direction, alarm, onset, mu) -> ChangePoint:
+    if alarm is None:
+        return ChangePoint(method=method, detected=False, baseline_mean=mu, shifted_mean=mu)
+    onset = int(min(max(onset, 0), alarm))
+    shifted = float(x[onset:].mean())
+    mag = shifted - mu
+    return ChangePoint(
+        method=method,
+        detected=True,
+        direction=direction,
+        onset_index=onset,
+        alarm_index=int(alarm),
+        onset_ts=str(ts[onset]) if ts is not None else None,
+        alarm_ts=str(ts[alarm]) if ts is not None else None,
+        baseline_mean=mu,
+        shifted_mean=shifted,
+        magnitude=mag,
+        relative_magnitude=mag / abs(mu) if mu else 0.0,
+    )
+
+
+def _directions(direction: str) -> list[str]:
+    return ["up", "down"] if direction == "both" else [direction]
+
+
+def cusum(
+    values,
+    ts=None,
+    direction: str = "both",
+    k: float = 0.5,
+    h: float = 8.0,
+    baseline: int | None = None,
+) -> ChangePoint:
+    """Tabular CUSUM on the standardized series (k, h in baseline sigmas)."""
+    x = np.asarray(values, dtype=np.float64)
+    if len(x) < 3:
+        return ChangePoint(method="cusum", detected=False)
+    mu, sigma, _ = baseline_stats(x, baseline)
+    z = (x - mu) / sigma
+    best = None
+    for d in _directions(direction):
+        s, reset = _one_sided_cusum(z if d == "up" else -z, k)
+        hits = np.flatnonzero(s > h)
+        if len(hits) and (best is None or hits[0] < best[1]):
+            best = (d, int(hits[0]), int(reset[hits[0]]))
+    if best is None:
+        return _result("cusum", x, ts, "", None, None, mu)
+    return _result("cusum", x, ts, best[0], best[1], best[2], mu)
+
+
+def ewma(values, lam: float = 0.2) -> np.ndarray:
+    """Exponentially weighted moving average, z_0 = x_0.
+
+    Evaluated in blocks with the closed form so long series don't overflow
+    the (1 - lam)^-t scaling.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    out = np.empty_like(x)
+    if not len(x):
+        return out
+    decay = 1.0 - lam
+    prev = x[0]
+    block = 512
+    for start in range(0, len(x), block):
+        chunk = x[start:start + block]
+        t = np.arange(1, len(chunk) + 1)
+        w = decay ** -t
+        out[start:start + len(chunk)] = decay ** t * (prev + lam * np.cumsum(chunk * w))
+        prev = out[start + len(chunk) - 1]
+    return out
+
+
+def ewma_chart(
+    values,
+    ts=None,
+    direction: str = "both",
+    lam: float = 0.2,
+    L: float = 3.5,
+    baseline: int | None = None,
+) -> ChangePoint:
+    """EWMA control chart with time-varying L-sigma limits around the baseline."""
+    x = np.asarray(values, dtype=np.float64)
+    if len(x) < 3:
+        return ChangePoint(method="ewma", detected=False)
+    mu, sigma, _ = baseline_stats(x, baseline)
+    z = ewma(np.concatenate(([mu], x)), lam)[1:]
+    t = np.arange(1, len(x) + 1)
+    width = L * sigma * np.sqrt(lam / (2 - lam) * (1 - (1 - lam) ** (2 * t)))
+    best = None
+    for d in _directions(direction):
+        out = z > mu + width if d == "up" else z < mu - width
+        hits = np.flatnonzero(out)
+        if len(hits) and (best is None or hits[0] < best[1]):
+            alarm = int(hits[0])
+            # Onset: last point at or before the alarm on the baseline side.
+            side = x[: alarm + 1] <= mu if d == "up" else x[: alarm + 1] >= mu
+            before = np.flatnonzero(side)
+            onset = int(before[-1]) + 1 if len(before) else 0
+            best = (d, alarm, onset)
+    if best is None:
+        return _result("ewma", x, ts, "", None, None, mu)
+    return _result("ewma", x, ts, best[0], best[1], best[2], mu)
+
+
+def page_hinkley(
+    values,
+    ts=None,
+    direction: str = "both",
+    delta: float = 0.5,
+    threshold: float = 8.0,
+    baseline: int | None = None,
+) -> ChangePoint:
+    """Page–Hinkley test on the standardized series (delta, threshold in sigmas).
+
+    Uses the running mean of the series itself, so it adapts to slow trends
+    and reacts to abrupt shifts.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    if len(x) < 3:
+        return ChangePoint(method="page_hinkley", detected=False)
+    mu, sigma, _ = baseline_stats(x, baseline)
+    z = (x - mu) / sigma
+    running_mean = np.cumsum(z) / np.arange(1, len(z) + 1)
+    best = None
+    for d in _directions(direction):
+        dev = (z - running_mean) if d == "up" else (running_mean - z)
+        s, reset = _one_sided_cusum(dev, delta)
+        hits = np.flatnonzero(s > threshold)
+        if len(hits) and (best is None or hits[0] < best[1]):
+            best = (d, int(hits[0]), int(reset[hits[0]]))
+    if best is None:
+        return _result("page_hinkley", x, ts, "", None, None, mu)
+    return _result("page_hinkley", x, ts, best[0], best[1], best[2], mu)
+
+
+DETECTORS = {"cusum": cusum, "ewma": ewma_chart, "page_hinkley": page_hinkley}
+
+
+def detect_changes(values, ts=None, direction: str = "both", **kwargs) -> dict:
+    """Run every detector; the summary is the detector that alarmed first.
+
+    `votes` counts the detectors that alarmed — callers that act on the
+    result (alerting) should require at least two. `kwargs` is forwarded to
+    all detectors (e.g. baseline=24).
+    """
+    results = {name: fn(values, ts, direction, **kwargs) for name, fn in DETECTORS.items()}
+    fired = [r for r in results.values() if r.detected]
+    summary = min(fired, key=lambda r: (r.alarm_index, r.onset_index)) if fired else None
+    return {
+        "detected": bool(fired),
+        "votes": len(fired),
+        "summary": summary.to_dict() if summary else None,
+        "methods": {name: r.to_dict() for name, r in results.items()},
+    }
+
+
+def detect_metric_changes(rows: list[dict], metric: str, **kwargs) -> dict:
+    """detect_changes over MODEL_METRICS rows (ascending ts), watching the degradation side."""
+    pairs = [(r.get("ts"), r.get(metric)) for r in rows if r.get(metric) is not None]
+    if not pairs:
+        return {"detected": False, "votes": 0, "summary": None, "methods": {}}
+    ts, values = zip(*pairs)
+    direction = DEGRADATION_DIRECTION.get(metric, "both")
+    return detect_changes(np.asarray(values, dtype=np.float64), list(ts), direction, **kwargs)
@@ -0,0 +1,214 @@
+"""Alert rule engine — the single source of alert thresholds.
+
+Rules are declared per metric (and optionally per model or pipeline) by
+default_rules() and can be overridden or extended by name from a JSON file
+(ALERT_RULES_PATH). A RuleEngine
+compiles them into flat NumPy arrays once; evaluating every rule against
+every model is then a gather plus a vectorized comparison over a metrics
+frame, so tens of thousands of rules per poll stay cheap.
+"""
+import json
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+from config import settings
+
+OPS = {"<": 0, "<=": 1, ">": 2, ">=": 3}
+SEVERITY_RANK = {"info": 0, "warning": 1, "critical": 2}
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    metric: str
+    op: str
+    threshold: float
+    severity: str
+    alert_type: str
+    model: str = "*"  # model or pipeline name; "*" matches all
+    enabled: bool = True
+
+    def __post_init__(self):
+        if self.op not in OPS:
+            raise ValueError(f"Rule {self.name}: unknown op {self.op!r}")
+        if self.severity not in SEVERITY_RANK:
+            raise ValueError(f"Rule {self.name}: unknown severity {self.severity!r}")
+
+
+def default_rules() -> list[Rule]:
+    f1_baseline = 0.88
+    return [
+        Rule("f1_warning", "f1_score", "<", f1_baseline, "warning", "accuracy_drop"),
+        Rule("f1_critical", "f1_score", "<", round(f1_baseline - settings.accuracy_drop_threshold, 4),
+             "critical", "accuracy_drop"),
+        Rule("drift_warning", "drift_score", ">", 0.2, "warning", "model_drift"),
+        Rule("drift_critical", "drift_score", ">", settings.drift_threshold, "critical", "model_drift"),
+        Rule("latency_warning", "latency_p99_ms", ">", 1000, "warning", "latency"),
+        Rule("latency_critical", "latency_p99_ms", ">", 2000, "critical", "latency"),
+        Rule("anomaly_warning", "anomaly_rate", ">", 0.10, "warning", "anomaly_spike"),
+        Rule("null_rate_warning", "null_rate", ">", 0.05, "warning", "data_quality"),
+        Rule("null_rate_critical", "null_rate", ">", 0.10, "critical", "data_quality"),
+    ]
+
+
+def load_rules(path: str | None = None) -> list[Rule]:
+    """Default rules, overridden/extended by name from a JSON list at `path`."""
+    rules = {r.name: r for r in default_rules()}
+    path = path if path is not None else settings.alert_rules_path
+    if path:
+        for item in json.loads(Path(path).read_text()):
+            base = asdict(rules[item["name"]]) if item.get("name") in rules else {}
+            rules[item["name"]] = Rule(**{**base, **item})
+    return [r for r in rules.values() if r.enabled]
+
+
+@dataclass
+class Breach:
+    rule: Rule
+    model: str
+    value: float
+
+    def describe(self) -> str:
+        r = self.rule
+        return f"{r.metric}={self.value:.4g} {r.op} {r.threshold:g} ({r.alert_type})"
+
+    def message(self) -> str:
+        r = self.rule
+        return f"{self.model}: {r.metric} is {self.value:.4g} ({r.severity} threshold {r.op} {r.threshold:g})"
+
+
+@dataclass
+class Assessment:
+    status: str  # healthy / warning / critical / unknown
+    breaches: list[Breach]
+
+    def worst_by_alert_type(self) -> dict[str, Breach]:
+        out: dict[str, Breach] = {}
+        for b in self.breaches:
+            cur = out.get(b.rule.alert_type)
+            if cur is None or SEVERITY_RANK[b.rule.severity] > SEVERITY_RANK[cur.rule.severity]:
+                out[b.rule.alert_type] = b
+        return out
+
+
+class RuleEngine:
+    def __init__(self, rules: list[Rule]):
+        self.rules = list(rules)
+        self.metrics = sorted({r.metric for r in self.rules})
+        metric_idx = {m: i for i, m in enumerate(self.metrics)}
+        self._metric = np.array([metric_idx[r.metric] for r in self.rules], dtype=np.int64)
+        self._threshold = np.array([r.threshold for r in self.rules], dtype=np.float64)
+        self._op = np.array([OPS[r.op] for r in self.rules], dtype=np.int8)
+        self._wildcard = np.flatnonzero([r.model == "*" for r in self.rules])
+        self._scoped: dict[str, np.ndarray] = {}
+        for i, r in enumerate(self.rules):
+            if r.model != "*":
+                self._scoped.setdefault(r.model, []).append(i)
+        self._scoped = {m: np.array(ix, dtype=np.int64) for m, ix in self._scoped.items()}
+        self._pairs_cache: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+
+    def _pairs(self, models: tuple[str, ...]) -> tuple[np.ndarray, np.ndarray]:
+        """(model index, rule index) for every rule that applies to every model."""
+        cached = self._pairs_cache.get(models)
+        if cached is not None:
+            return cached
+        n = len(models)
+        model_ix = [np.repeat(np.arange(n), len(self._wildcard))]
+        rule_ix = [np.tile(self._wildcard, n)]
+        for i, m in enumerate(models):
+            scoped = self._scoped.get(m)
+            if scoped is not None:
+                model_ix.append(np.full(len(scoped), i))
+                rule_ix.append(scoped)
+        pairs = (np.concatenate(model_ix), np.concatenate(rule_ix))
+        if len(self._pairs_cache) > 64:
+            self._pairs_cache.clear()
+        self._pairs_cache[models] = pairs
+        return pairs
+
+    def evaluate(self, frame: dict[str, dict]) -> list[Breach]:
+        """Check all rules against {model: {metric: value}} in one pass.
+
+        Missing or non-numeric metrics never breach.
+        """
+        models = tuple(frame)
+        if not models or not self.rules:
+            return []
+        matrix = np.full((len(models), len(self.metrics)), np.nan)
+        for i, m in enumerate(models):
+            row = frame[m]
+            for j, metric in enumerate(self.metrics):
+                v = row.get(metric)
+                if isinstance(v, (int, float)) and not isinstance(v, bool):
+                    matrix[i, j] = v
+
+        model_ix, rule_ix = self._pairs(models)
+        values = matrix[model_ix, self._metric[rule_ix]]
+        t = self._threshold[rule_ix]
+        op = self._op[rule_ix]
+        breached = np.select(
+            [op == 0, op == 1, op == 2, op == 3],
+            [values < t, values <= t, values > t, values >= t],
+            default=False,
+        )
+        hits = np.flatnonzero(breached)
+        return [
+            Breach(self.rules[rule_ix[h]], models[model_ix[h]], float(values[h])) for h in hits
+        ]
+
+    def assess(self, frame: dict[str, dict]) -> dict[str, Assessment]:
+        """Per-model status (worst breached severity) and breaches."""
+        out = {m: Assessment("healthy", []) for m in frame}
+        for b in self.evaluate(frame):
+            out[b.model].breaches.append(b)
+        for a in out.values():
+            if a.breaches:
+                a.status = max((b.rule.severity for b in a.breaches), key=SEVERITY_RANK.get)
+                if a.status == "info":
+                    a.status = "healthy"
+        return out
+
+    def severity(self, metric: str, value: float, model: str = "*") -> str | None:
+        """Worst severity of the rules `value` breaches for `metric` (and `model`), or None."""
+        breaches = [b for b in self.evaluate({model: {metric: value}}) if b.rule.metric == metric]
+        if not breaches:
+            return None
+        return max((b.rule.severity for b in breaches), key=SEVERITY_RANK.get)
+
+    def assess_one(self, name: str, row: dict | None) -> Assessment:
+        if not row:
+            return Assessment("unknown", [])
+        return self.assess({name: row})[name]
+
+    def thresholds_text(self) -> str:
+        """Prompt-ready thresholds, one line per metric and alert type."""
+        grouped: dict[tuple[str, str], list[Rule]] = {}
+        for r in self.rules:
+            if r.model == "*":
+                grouped.setdefault((r.metric, r.alert_type), []).append(r)
+        lines = []
+        for (metric, alert_type), rules in grouped.items():
+            levels = ", ".join(
+                f"{r.op} {r.threshold:g} ({r.severity})"
+                for r in sorted(rules, key=lambda r: SEVERITY_RANK[r.severity])
+            )
+            lines.append(f"- {metric} {levels} → {alert_type} alert")
+        return "\n".join(lines)
+
+    def healthy_baselines_text(self) -> str:
+        """'f1_score >= 0.88, drift_score <= 0.2, ...' from the warning-level rules."""
+        flip = {"<": ">=", "<=": ">", ">": "<=", ">=": "<"}
+        return ", ".join(
+            f"{r.metric} {flip[r.op]} {r.threshold:g}"
+            for r in self.rules
+            if r.severity == "warning" and r.model == "*"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_rule_engine() -> RuleEngine:
+    """Process-wide engine compiled from the configured rules."""
+    return RuleEngine(load_rules())
@@ -0,0 +1,185 @@
+"""Streaming, mergeable drift sketches for continuous monitoring.
+
+A DriftSketch keeps, per feature, fixed-bin counts on the reference profile's
+bin edges plus Welford/Chan running moments. Memory is O(features x bins)
+no matter how much traffic is observed, sketches from different worker
+processes merge exactly, and current PSI can be read at any moment.
+"""
+import threading
+from datetime import datetime, UTC
+
+import numpy as np
+
+from monitoring.drift import (
+    DriftResult,
+    ReferenceProfile,
+    drift_from_proportions,
+    histogram,
+    to_matrix,
+    to_proportions,
+)
+
+
+class DriftSketch:
+    def __init__(self, reference: ReferenceProfile):
+        self.reference = reference
+        n_feat = len(reference.features)
+        self.counts = np.zeros((n_feat, reference.n_bins))
+        self.n = np.zeros(n_feat)
+        self.mean = np.zeros(n_feat)
+        self.m2 = np.zeros(n_feat)
+        self.started_at = datetime.now(UTC).isoformat()
+
+    def _combine(self, n_b: np.ndarray, mean_b: np.ndarray, m2_b: np.ndarray):
+        """Chan et al. parallel update of the running moments."""
+        n_a = self.n
+        total = n_a + n_b
+        safe = np.where(total > 0, total, 1.0)
+        delta = mean_b - self.mean
+        self.mean = np.where(total > 0, self.mean + delta * n_b / safe, self.mean)
+        self.m2 = self.m2 + m2_b + delta ** 2 * n_a * n_b / safe
+        self.n = total
+
+    def update(self, batch: np.ndarray):
+        """Fold an (N, F) batch of observations into the sketch. NaNs are skipped."""
+        batch = np.asarray(batch, dtype=np.float64)
+        if batch.size == 0:
+            return
+        self.counts += histogram(batch, self.reference.edges)
+        valid = ~np.isnan(batch)
+        n_b = valid.sum(axis=0).astype(np.float64)
+        filled = np.where(valid, batch, 0.0)
+        mean_b = filled.sum(axis=0) / np.maximum(n_b, 1.0)
+        m2_b = (np.where(valid, batch - mean_b, 0.0) ** 2).sum(axis=0)
+        self._combine(n_b, mean_b, m2_b)
+
+    def update_rows(self, rows: list[dict]):
+        self.update(to_matrix(rows, self.reference.features))
+
+    def merge(self, other: "DriftSketch") -> "DriftSketch":
+        """Fold another sketch (same reference) into this one."""
+        if other.reference.features != self.reference.features or not np.array_equal(
+            other.reference.edges, self.reference.edges
+        ):
+            raise ValueError("Cannot merge sketches built on different reference profiles")
+        self.counts += other.counts
+        self._combine(other.n, other.mean, other.m2)
+        return self
+
+    def decay(self, factor: float):
+        """Exponentially forget old traffic (0 < factor <= 1). Mean/std are preserved."""
+        self.counts *= factor
+        self.n *= factor
+        self.m2 *= factor
+
+    @property
+    def std(self) -> np.ndarray:
+        return np.sqrt(self.m2 / np.maximum(self.n, 1.0))
+
+    def report(self) -> DriftResult:
+        """Current drift against the reference."""
+        ref = self.reference
+        psi, ks, js = drift_from_proportions(ref.proportions, to_proportions(self.counts))
+        ref_std = np.where(ref.std > 0, ref.std, 1.0)
+        seen = self.n > 0
+        return DriftResult(
+            features=ref.features,
+            psi=np.where(seen, psi, 0.0),
+            ks=np.where(seen, ks, 0.0),
+            js=np.where(seen, js, 0.0),
+            mean_shift=np.where(seen, (self.mean - ref.mean) / ref_std, 0.0),
+            std_shift=np.where(seen, self.std / ref_std - 1.0, 0.0),
+            count=int(self.n.max()) if len(self.n) else 0,
+        )
+
+    def to_dict(self) -> dict:
+        """JSON-safe state for shipping between worker processes."""
+        return {
+            "features": self.reference.features,
+            "edges": self.reference.edges.tolist(),
+            "counts": self.counts.tolist(),
+            "n": self.n.tolist(),
+            "mean": self.mean.tolist(),
+            "m2": self.m2.tolist(),
+            "started_at": self.started_at,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict, reference: ReferenceProfile) -> "DriftSketch":
+        if data["features"] != reference.features or not np.allclose(
+            np.asarray(data["edges"]), reference.edges
+        ):
+            raise ValueError("Sketch was built on a different reference profile")
+        sketch = cls(reference)
+        sketch.counts = np.asarray(data["counts"], dtype=np.float64)
+        sketch.n = np.asarray(data["n"], dtype=np.float64)
+        sketch.mean = np.asarray(data["mean"], dtype=np.float64)
+        sketch.m2 = np.asarray(data["m2"], dtype=np.float64)
+        n_feat = len(reference.features)
+        if sketch.counts.shape != (n_feat, reference.n_bins) or any(
+            a.shape != (n_feat,) for a in (sketch.n, sketch.mean, sketch.m2)
+        ):
+            raise ValueError("Sketch arrays do not match the reference profile's shape")
+        sketch.started_at = data.get("started_at", sketch.started_at)
+        return sketch
+
+
+class StreamingDriftMonitor:
+    """Thread-safe front end that buffers single observations into batches.
+
+    Register `observe` as an MLMonitoringClient observer to feed it from
+    prediction traffic. Each observation is converted as it arrives, so a
+    malformed one is rejected (and counted) without touching the buffer.
+    """
+
+    def __init__(self, reference: ReferenceProfile, batch_size: int = 256):
+        self.sketch = DriftSketch(reference)
+        self.batch_size = batch_size
+        self.rejected = 0
+        self._buffer: list[np.ndarray] = []
+        self._lock = threading.Lock()
+
+    def observe(self, features: dict):
+        """Buffer one observation; raises ValueError/TypeError for a non-numeric feature."""
+        try:
+            row = to_matrix([features], self.sketch.reference.features)[0]
+        except (TypeError, ValueError):
+            with self._lock:
+                self.rejected += 1
+            raise
+        with self._lock:
+            self._buffer.append(row)
+            if len(self._buffer) >= self.batch_size:
+                self._flush()
+
+    def observe_batch(self, batch: np.ndarray):
+        with self._lock:
+            self._flush()
+            self.sketch.update(batch)
+
+    def _flush(self):
+        if self._buffer:
+            batch, self._buffer = np.vstack(self._buffer), []
+            self.sketch.update(batch)
+
+    def report(self) -> DriftResult:
+        with self._lock:
+            self._flush()
+            return self.sketch.report()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            self._flush()
+            return self.sketch.to_dict()
+
+    def merge(self, data: dict):
+        """Merge a sketch exported by another worker (see DriftSketch.to_dict)."""
+        other = DriftSketch.from_dict(data, self.sketch.reference)
+        with self._lock:
+            self.sketch.merge(other)
+
+    def reset(self):
+        with self._lock:
+            self._buffer = []
+            self.rejected = 0
+            self.sketch = DriftSketch(self.sketch.reference)
@@ -69,6 +69,7 @@ def run_demo():
         "ended_at": datetime.fromtimestamp(t_end, tz=timezone.utc).isoformat(),
         "elapsed_sec": round(elapsed, 2),
         "result": result,
+        "telemetry": crew.last_telemetry,
     }
     log_path = _save_log(run_id, log_data)
 
@@ -102,6 +103,7 @@ def run_monitor(interval: int):
             print(f"[Cycle {cycle}] Monitoring at {datetime.now(timezone.utc).isoformat()}...")
 
             monitor_result = crew.run_monitor_only(context="Routine health check")
+            monitor_telemetry = crew.last_telemetry
 
             is_healthy = "ALL_HEALTHY" in monitor_result.upper()
 
@@ -114,6 +116,7 @@ def run_monitor(interval: int):
                     "status": "healthy",
                     "result": monitor_result,
                     "elapsed_sec": round(time.time() - t_start, 2),
+                    "telemetry": monitor_telemetry,
                 }
                 _save_log(run_id, log_data)
             else:
@@ -129,6 +132,7 @@ def run_monitor(interval: int):
                     "monitor_result": monitor_result,
                     "full_result": full_result,
                     "elapsed_sec": round(time.time() - t_start, 2),
+                    "telemetry": {"monitor": monitor_telemetry, "full": crew.last_telemetry},
                 }
                 _save_log(run_id, log_data)
                 print(f"[Cycle {cycle}] Resolution complete. Resuming monitoring.")
@@ -164,6 +168,7 @@ def run_investigate(query: str):
         "ended_at": datetime.fromtimestamp(t_end, tz=timezone.utc).isoformat(),
         "elapsed_sec": round(elapsed, 2),
         "result": result,
+        "telemetry": crew.last_telemetry,
     }
     log_path = _save_log(run_id, log_data)
 
@@ -0,0 +1,2 @@
+from .local_index import LocalIndex, get_local_index
+from .incident_index import IncidentIndex
@@ -0,0 +1,204 @@
+"""Structured similarity search over past incidents.
+
+Each INCIDENTS row becomes a fingerprint vector:
+
+    [alert_type one-hot | affected_component one-hot | per-feature PSI]
+
+The PSI block comes from the FEATURE_DRIFT snapshot closest to the incident
+(or, for incidents older than the drift history, from features named in the
+root cause). Ranking a new alert is one matrix-vector product — no RAG or
+LLM call. Loading is two queries per refresh (new incidents, then their drift
+in one join), and the backend refreshes on a background thread, so a search
+never waits on Snowflake.
+"""
+import re
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+_FEATURE_RE = re.compile(r"\b(V\d{1,2}|Amount|Time)\b")
+
+# Block weights: alert type dominates, then component, then drift shape.
+TYPE_WEIGHT = 1.0
+COMPONENT_WEIGHT = 0.6
+PSI_WEIGHT = 0.8
+# PSI assigned to a feature that is only mentioned in the root-cause text.
+MENTION_PSI = 0.5
+
+
+def psi_by_feature(drift_rows: list[dict]) -> dict[str, float]:
+    """Collapse FEATURE_DRIFT rows to the max PSI seen per feature."""
+    out: dict[str, float] = {}
+    for r in drift_rows:
+        name = r.get("feature_name")
+        if name:
+            out[name] = max(out.get(name, 0.0), float(r.get("psi_score") or 0.0))
+    return out
+
+
+class IncidentIndex:
+    """In-memory kNN index over INCIDENTS, refreshed incrementally."""
+
+    def __init__(self, drift_window_hours: int = 2):
+        self.drift_window_hours = drift_window_hours
+        self.incidents: list[dict] = []
+        self._fingerprints: list[tuple[str, str, dict[str, float]]] = []
+        self._types: dict[str, int] = {}
+        self._components: dict[str, int] = {}
+        self._features: dict[str, int] = {}
+        self._seen: set[str] = set()
+        self._latest_ts: datetime | None = None
+        self._matrix: np.ndarray | None = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self.refreshed_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.incidents)
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+
+    def add(self, incident: dict, drift_rows: list[dict] | None = None):
+        """Add one incident with the FEATURE_DRIFT rows observed around it."""
+        inc_id = str(incident.get("incident_id") or incident.get("id"))
+        with self._lock:
+            if inc_id in self._seen:
+                return
+            psi = psi_by_feature(drift_rows or [])
+            if not psi:
+                for name in _FEATURE_RE.findall(incident.get("root_cause") or ""):
+                    psi[name] = MENTION_PSI
+            alert_type = incident.get("alert_type") or "unknown"
+            component = incident.get("affected_component") or "unknown"
+            self._types.setdefault(alert_type, len(self._types))
+            self._components.setdefault(component, len(self._components))
+            for name in psi:
+                self._features.setdefault(name, len(self._features))
+            self._seen.add(inc_id)
+            self.incidents.append(incident)
+            self._fingerprints.append((alert_type, component, psi))
+            ts = incident.get("ts")
+            if isinstance(ts, datetime) and (self._latest_ts is None or ts > self._latest_ts):
+                self._latest_ts = ts
+            self._matrix = None
+
+    def refresh(self, sf) -> int:
+        """Pull incidents newer than the last one seen. Returns how many were added."""
+        with self._refresh_lock:
+            return self._refresh(sf)
+
+    def _refresh(self, sf) -> int:
+        if self._latest_ts is None:
+            rows = sf.get_incidents(limit=10000)
+        else:
+            rows = sf.get_incidents_since(self._latest_ts)
+        stamps = [r["ts"] for r in rows if isinstance(r.get("ts"), datetime)]
+        drift: dict = defaultdict(list)
+        if stamps:
+            try:
+                for r in sf.get_incident_drift(min(stamps), max(stamps), self.drift_window_hours):
+                    drift[r.get("incident_row_id")].append(r)
+            except Exception:
+                drift.clear()  # fall back to features named in the root cause
+        added = 0
+        for inc in sorted(rows, key=lambda r: str(r.get("ts"))):
+            before = len(self.incidents)
+            self.add(inc, drift.get(inc.get("id")))
+            added += len(self.incidents) - before
+        self.refreshed_at = time.time()
+        return added
+
+    def refresh_in_background(self, sf, max_age_sec: float = 60.0) -> bool:
+        """Start a refresh on a daemon thread if the index is stale and none is running."""
+        if time.time() - self.refreshed_at < max_age_sec or self._refresh_lock.locked():
+            return False
+        threading.Thread(target=self._background_refresh, args=(sf,), name="incident-index", daemon=True).start()
+        return True
+
+    def _background_refresh(self, sf):
+        if not self._refresh_lock.acquire(blocking=False):
+            return
+        try:
+            self._refresh(sf)
+        except Exception:
+            self.refreshed_at = time.time()  # Snowflake is down; try again after max_age_sec
+        finally:
+            self._refresh_lock.release()
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def _vector(self, alert_type: str, component: str, psi: dict[str, float]) -> np.ndarray:
+        nt, nc = len(self._types), len(self._components)
+        vec = np.zeros(nt + nc + len(self._features), dtype=np.float32)
+        if alert_type in self._types:
+            vec[self._types[alert_type]] = TYPE_WEIGHT
+        if component in self._components:
+            vec[nt + self._components[component]] = COMPONENT_WEIGHT
+        feats = [(self._features[f], v) for f, v in psi.items() if f in self._features]
+        if feats:
+            cols, vals = zip(*feats)
+            block = np.asarray(vals, dtype=np.float32)
+            norm = np.linalg.norm(block)
+            if norm > 0:
+                vec[nt + nc + np.asarray(cols)] = PSI_WEIGHT * block / norm
+        return vec
+
+    def _get_matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            mat = np.stack([self._vector(*fp) for fp in self._fingerprints])
+            norms = np.linalg.norm(mat, axis=1, keepdims=True)
+            self._matrix = mat / np.maximum(norms, 1e-12)
+        return self._matrix
+
+    def search(
+        self,
+        alert_type: str,
+        component: str,
+        drift_rows: list[dict] | None = None,
+        k: int = 3,
+        min_similarity: float = 0.3,
+    ) -> list[dict]:
+        """Rank past incidents by cosine similarity to the current alert.
+
+        Matches below `min_similarity` (e.g. same component, different failure
+        mode) are dropped.
+        """
+        with self._lock:
+            if not self.incidents:
+                return []
+            mat = self._get_matrix()
+            q = self._vector(alert_type, component, psi_by_feature(drift_rows or []))
+            norm = np.linalg.norm(q)
+            if norm == 0:
+                return []
+            scores = mat @ (q / norm)
+            k = min(k, len(scores))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                {**self.incidents[i], "similarity": round(float(scores[i]), 4)}
+                for i in top
+                if scores[i] >= min_similarity
+            ]
+
+
+def format_similar_incidents(matches: list[dict]) -> str:
+    if not matches:
+        return "No similar incidents found."
+    lines = []
+    for m in matches:
+        lines.append(
+            f"- {m.get('incident_id', '?')} ({m.get('alert_type', '?')}, "
+            f"{m.get('affected_component', '?')}, similarity {m['similarity']:.2f}): "
+            f"{m.get('root_cause', '')}"
+        )
+        if m.get("resolution"):
+            lines.append(f"  Resolution: {m['resolution']}")
+    return "\n".join(lines)
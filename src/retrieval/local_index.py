@@ -0,0 +1,287 @@
+"""In-process hybrid retrieval over runbooks/ and incidents/.
+
+Markdown files are split into heading-level chunks and indexed with BM25
+(CSR postings with precomputed term weights) plus, optionally, a dense
+embedding matrix. Arrays are persisted as .npy files and memory-mapped on
+load, so a warm index opens instantly and top-k search is a handful of
+NumPy operations.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+
+from config import settings
+from integrations.rag_ingest import DOC_DIRS, ROOT_DIR
+
+Embedder = Callable[[list[str]], np.ndarray]
+
+_TOKEN_RE = re.compile(r"[a-z0-9_]+")
+_HEADING_RE = re.compile(r"^(#{1,3})\s+(.*)$")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the "
+    "this to was were will with what when how do does i we you".split()
+)
+
+_ARRAYS = ("indptr", "postings", "weights", "kinds", "embeddings")
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def chunk_markdown(text: str) -> list[tuple[str, str]]:
+    """Split markdown into (heading, body) sections at #, ## and ### headings."""
+    sections: list[tuple[str, list[str]]] = [("", [])]
+    title = ""
+    for line in text.splitlines():
+        m = _HEADING_RE.match(line)
+        if m:
+            heading = m.group(2).strip()
+            if len(m.group(1)) == 1 and not title:
+                title = heading
+            sections.append((heading, []))
+        else:
+            sections[-1][1].append(line)
+    out = []
+    for heading, lines in sections:
+        body = "\n".join(lines).strip()
+        if body:
+            label = f"{title} — {heading}" if title and heading != title else heading or title
+            out.append((label, body))
+    return out
+
+
+def sources_fingerprint(doc_dirs: dict[str, Path]) -> str:
+    h = hashlib.sha256()
+    for kind, directory in sorted(doc_dirs.items()):
+        for p in sorted(directory.glob("*.md")):
+            st = p.stat()
+            h.update(f"{kind}:{p.name}:{st.st_size}:{st.st_mtime_ns}\n".encode())
+    return h.hexdigest()[:16]
+
+
+class LocalIndex:
+    """BM25 + optional dense retrieval over a small markdown corpus."""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.vocab: dict[str, int] = {}
+        self.chunks: list[dict] = []
+        self.kind_names: list[str] = []
+        self.fingerprint = ""
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.postings = np.zeros(0, dtype=np.int32)
+        self.weights = np.zeros(0, dtype=np.float32)
+        self.kinds = np.zeros(0, dtype=np.int8)
+        self.embeddings: np.ndarray | None = None
+        self.embedder: Embedder | None = None
+
+    # ------------------------------------------------------------------
+    # Build
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def build(
+        cls,
+        doc_dirs: dict[str, Path] | None = None,
+        embedder: Embedder | None = None,
+        **bm25_params,
+    ) -> "LocalIndex":
+        doc_dirs = doc_dirs or DOC_DIRS
+        idx = cls(**bm25_params)
+        idx.embedder = embedder
+        idx.kind_names = sorted(doc_dirs)
+        idx.fingerprint = sources_fingerprint(doc_dirs)
+
+        texts, kinds = [], []
+        for kind in idx.kind_names:
+            for path in sorted(doc_dirs[kind].glob("*.md")):
+                try:
+                    rel = str(path.resolve().relative_to(ROOT_DIR))
+                except ValueError:
+                    rel = str(path)
+                for heading, body in chunk_markdown(path.read_text(encoding="utf-8")):
+                    idx.chunks.append({"source_path": rel, "heading": heading, "text": body})
+                    texts.append(f"{heading}\n{body}")
+                    kinds.append(idx.kind_names.index(kind))
+        idx.kinds = np.asarray(kinds, dtype=np.int8)
+        idx._build_bm25([tokenize(t) for t in texts])
+        if embedder is not None and texts:
+            idx.embeddings = _normalize(np.asarray(embedder(texts), dtype=np.float32))
+        return idx
+
+    def _build_bm25(self, docs: list[list[str]]):
+        n_docs = len(docs)
+        doc_len = np.array([len(d) for d in docs], dtype=np.float32)
+        avgdl = float(doc_len.mean()) if n_docs else 0.0
+
+        per_term: dict[int, list[tuple[int, int]]] = {}
+        for doc_id, tokens in enumerate(docs):
+            for term, tf in Counter(tokens).items():
+                tid = self.vocab.setdefault(term, len(self.vocab))
+                per_term.setdefault(tid, []).append((doc_id, tf))
+
+        indptr = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+        postings, tfs = [], []
+        for tid in range(len(self.vocab)):
+            plist = per_term[tid]
+            indptr[tid + 1] = indptr[tid] + len(plist)
+            postings.extend(d for d, _ in plist)
+            tfs.extend(tf for _, tf in plist)
+
+        self.indptr = indptr
+        self.postings = np.asarray(postings, dtype=np.int32)
+        tf = np.asarray(tfs, dtype=np.float32)
+        df = np.diff(indptr).astype(np.float32)
+        idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        term_of_posting = np.repeat(np.arange(len(self.vocab)), np.diff(indptr))
+        norm = self.k1 * (1 - self.b + self.b * doc_len[self.postings] / max(avgdl, 1e-9))
+        # Full BM25 contribution per posting, so a query is just a gather + bincount.
+        self.weights = (idf[term_of_posting] * tf * (self.k1 + 1) / (tf + norm)).astype(np.float32)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def save(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAYS:
+            arr = getattr(self, name)
+            path = directory / f"{name}.npy"
+            if arr is None:
+                path.unlink(missing_ok=True)
+            else:
+                np.save(path, np.ascontiguousarray(arr))
+        meta = {
+            "k1": self.k1,
+            "b": self.b,
+            "fingerprint": self.fingerprint,
+            "kind_names": self.kind_names,
+            "vocab": self.vocab,
+            "chunks": self.chunks,
+        }
+        (directory / "meta.json").write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, directory: Path) -> "LocalIndex":
+        meta = json.loads((directory / "meta.json").read_text())
+        idx = cls(k1=meta["k1"], b=meta["b"])
+        idx.fingerprint = meta["fingerprint"]
+        idx.kind_names = meta["kind_names"]
+        idx.vocab = meta["vocab"]
+        idx.chunks = meta["chunks"]
+        for name in _ARRAYS:
+            path = directory / f"{name}.npy"
+            if path.exists():
+                setattr(idx, name, np.load(path, mmap_mode="r"))
+        return idx
+
+    @classmethod
+    def load_or_build(
+        cls,
+        directory: Path,
+        doc_dirs: dict[str, Path] | None = None,
+        embedder: Embedder | None = None,
+    ) -> "LocalIndex":
+        """Open the persisted index, rebuilding it if the sources changed."""
+        doc_dirs = doc_dirs or DOC_DIRS
+        if (directory / "meta.json").exists():
+            try:
+                idx = cls.load(directory)
+                if idx.fingerprint == sources_fingerprint(doc_dirs) and (
+                    embedder is None or idx.embeddings is not None
+                ):
+                    idx.embedder = embedder
+                    return idx
+            except (OSError, ValueError, KeyError):
+                pass
+        idx = cls.build(doc_dirs, embedder)
+        idx.save(directory)
+        return idx
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def bm25_scores(self, query: str) -> np.ndarray:
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        tids = [self.vocab[t] for t in set(tokenize(query)) if t in self.vocab]
+        if not tids:
+            return scores
+        spans = [np.arange(self.indptr[t], self.indptr[t + 1]) for t in tids]
+        sel = np.concatenate(spans)
+        scores += np.bincount(
+            self.postings[sel], weights=self.weights[sel], minlength=len(self.chunks)
+        ).astype(np.float32)
+        return scores
+
+    def search(
+        self, query: str, k: int = 5, kind: str | None = None, alpha: float = 0.5
+    ) -> list[dict]:
+        """Top-k chunks for `query`, optionally restricted to one source kind.
+
+        With embeddings available the BM25 and cosine scores are max-normalized
+        and blended: (1 - alpha) * bm25 + alpha * cosine.
+        """
+        if not self.chunks:
+            return []
+        scores = self.bm25_scores(query)
+        if self.embeddings is not None and self.embedder is not None:
+            top = scores.max()
+            if top > 0:
+                scores = scores / top
+            q = _normalize(np.asarray(self.embedder([query]), dtype=np.float32))[0]
+            scores = (1 - alpha) * scores + alpha * np.clip(self.embeddings @ q, 0, None)
+        if kind is not None:
+            if kind not in self.kind_names:
+                return []
+            scores = np.where(self.kinds == self.kind_names.index(kind), scores, 0)
+
+        k = min(k, len(scores))
+        top_idx = np.argpartition(-scores, k - 1)[:k]
+        top_idx = top_idx[np.argsort(-scores[top_idx])]
+        return [
+            {**self.chunks[i], "score": float(scores[i])}
+            for i in top_idx
+            if scores[i] > 0
+        ]
+
+
+def _normalize(mat: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    return mat / np.maximum(norms, 1e-12)
+
+
+_index: LocalIndex | None = None
+_index_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_local_index() -> LocalIndex:
+    """Process-wide index, opened (or rebuilt) on first use.
+
+    The sources are re-fingerprinted at most every RAG_LOCAL_INDEX_CHECK_SEC;
+    edited or newly added runbooks/incidents trigger a rebuild.
+    """
+    global _index, _index_checked_at
+    now = time.monotonic()
+    if _index is not None and now - _index_checked_at < settings.rag_local_index_check_sec:
+        return _index
+    with _index_lock:
+        if _index is not None and now - _index_checked_at < settings.rag_local_index_check_sec:
+            return _index
+        if _index is None or _index.fingerprint != sources_fingerprint(DOC_DIRS):
+            directory = Path(settings.rag_local_index_dir)
+            if not directory.is_absolute():
+                directory = ROOT_DIR / directory
+            _index = LocalIndex.load_or_build(directory)
+        _index_checked_at = time.monotonic()
+    return _index
@@ -0,0 +1,220 @@
+"""Time, token and error accounting for tools, LLM calls, tasks and agents.
+
+Every instrumented call is recorded as (kind, name): kind is "tool", "llm",
+"task" or "agent". Records go to process-wide totals — exported by the
+backend as Prometheus metrics on /metrics — and to the run scopes open in the
+calling context, so a crew run's log carries its own breakdown. Scopes are
+held in a contextvar: a sequential crew makes its tool and LLM calls in the
+kickoff's thread, so they are counted, while calls other requests make
+meanwhile (e.g. the backend's summarize endpoints) are not. Work moved to
+another thread counts only if it runs in a copy of the context. Token counts
+for tools are the approximate size of what they hand the agent; LLM calls
+report the provider's usage when known and an estimate otherwise.
+"""
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from typing import Callable
+
+from integrations.resilience import LatencyHistogram, policies
+
+DURATION_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000, 120000, 300000)
+CHARS_PER_TOKEN = 4  # rough average for English + numbers; good enough for budgeting
+
+
+def approx_tokens(value) -> int:
+    """Rough token count of a string or a list of chat messages."""
+    if value is None:
+        return 0
+    if isinstance(value, list):
+        return sum(approx_tokens(m.get("content") if isinstance(m, dict) else m) for m in value)
+    text = value if isinstance(value, str) else str(value)
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+class Stat:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.tokens_in = 0
+        self.tokens_out = 0
+        self.total_sec = 0.0
+        self.max_sec = 0.0
+        self.latency = LatencyHistogram(DURATION_BUCKETS_MS)
+
+    def add(self, sec: float, error: bool, cached: bool, tokens_in: int, tokens_out: int):
+        self.calls += 1
+        self.errors += int(error)
+        self.cache_hits += int(cached)
+        self.tokens_in += tokens_in
+        self.tokens_out += tokens_out
+        self.total_sec += sec
+        self.max_sec = max(self.max_sec, sec)
+        self.latency.observe(sec * 1000)
+
+    def to_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "tokens_in": self.tokens_in,
+            "tokens_out": self.tokens_out,
+            "total_sec": round(self.total_sec, 3),
+            "mean_sec": round(self.total_sec / self.calls, 3) if self.calls else None,
+            "max_sec": round(self.max_sec, 3),
+        }
+
+
+class Telemetry:
+    def __init__(self):
+        self._stats: dict[tuple[str, str], Stat] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, sec: float, error: bool = False, cached: bool = False,
+               tokens_in: int = 0, tokens_out: int = 0):
+        with self._lock:
+            stat = self._stats.get((kind, name))
+            if stat is None:
+                stat = self._stats[(kind, name)] = Stat()
+            stat.add(sec, error, cached, tokens_in, tokens_out)
+
+    def totals(self, kind: str) -> dict:
+        """Summed counters over every name of a kind."""
+        out = {"calls": 0, "errors": 0, "cache_hits": 0, "tokens_in": 0, "tokens_out": 0, "total_sec": 0.0}
+        with self._lock:
+            for (k, _), stat in self._stats.items():
+                if k == kind:
+                    for key, value in stat.to_dict().items():
+                        if key in out:
+                            out[key] += value
+        out["total_sec"] = round(out["total_sec"], 3)
+        return out
+
+    def snapshot(self) -> dict[str, dict[str, dict]]:
+        """{kind: {name: stats}}, slowest first."""
+        with self._lock:
+            items = [(k, n, s.to_dict()) for (k, n), s in self._stats.items()]
+        out: dict[str, dict[str, dict]] = {}
+        for kind, name, stats in sorted(items, key=lambda i: -i[2]["total_sec"]):
+            out.setdefault(kind, {})[name] = stats
+        return out
+
+    def stats(self) -> list[tuple[str, str, Stat]]:
+        with self._lock:
+            return [(k, n, s) for (k, n), s in sorted(self._stats.items())]
+
+
+telemetry = Telemetry()
+_runs: contextvars.ContextVar[tuple[Telemetry, ...]] = contextvars.ContextVar("telemetry_runs", default=())
+
+
+def record(kind: str, name: str, sec: float, error: bool = False, cached: bool = False,
+           tokens_in: int = 0, tokens_out: int = 0):
+    """Record one call in the process totals and in the caller's open run scopes."""
+    telemetry.record(kind, name, sec, error, cached, tokens_in, tokens_out)
+    for run in _runs.get():
+        run.record(kind, name, sec, error, cached, tokens_in, tokens_out)
+
+
+@contextlib.contextmanager
+def run_scope():
+    """Collect the calls made within the block's context: `with run_scope() as run: ...; run.snapshot()`."""
+    run = Telemetry()
+    token = _runs.set(_runs.get() + (run,))
+    try:
+        yield run
+    finally:
+        _runs.reset(token)
+
+
+def run_report(run: Telemetry, usage=None) -> dict:
+    """Per-run telemetry for the JSON run log; `usage` is CrewAI's exact token usage, if any."""
+    report = {
+        "totals": {kind: run.totals(kind) for kind in ("task", "tool", "llm")},
+        "breakdown": run.snapshot(),
+    }
+    if usage is not None:
+        report["llm_usage"] = usage
+    return report
+
+
+def instrument(kind: str, name: str | None = None) -> Callable:
+    """Decorator: record wall time, errors and the approximate size of the result.
+
+    Place it under @tool so CrewAI still sees the wrapped signature.
+    """
+    def decorator(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception:
+                record(kind, label, time.perf_counter() - start, error=True,
+                       tokens_in=approx_tokens(str(kwargs or args)))
+                raise
+            record(kind, label, time.perf_counter() - start,
+                   tokens_in=approx_tokens(str(kwargs or args)), tokens_out=approx_tokens(result))
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + "}"
+
+
+def prometheus_text() -> str:
+    """Prometheus text exposition of the process totals and the integration policies."""
+    lines = []
+
+    def family(metric: str, mtype: str, help_text: str):
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} {mtype}")
+
+    stats = telemetry.stats()
+    for metric, attr, help_text in (
+        ("agentops_calls_total", "calls", "Instrumented calls by kind (tool/llm/task/agent) and name."),
+        ("agentops_errors_total", "errors", "Instrumented calls that raised."),
+        ("agentops_cache_hits_total", "cache_hits", "Calls answered from a cache."),
+    ):
+        family(metric, "counter", help_text)
+        for kind, name, s in stats:
+            lines.append(f"{metric}{_labels(kind=kind, name=name)} {getattr(s, attr)}")
+
+    family("agentops_tokens_total", "counter", "Tokens in/out (provider usage or ~4 chars/token).")
+    for kind, name, s in stats:
+        lines.append(f"agentops_tokens_total{_labels(kind=kind, name=name, direction='in')} {s.tokens_in}")
+        lines.append(f"agentops_tokens_total{_labels(kind=kind, name=name, direction='out')} {s.tokens_out}")
+
+    family("agentops_duration_seconds", "histogram", "Wall time of instrumented calls.")
+    for kind, name, s in stats:
+        snap = s.latency.snapshot()
+        for bound, count in snap["buckets"].items():
+            le = bound if bound == "+Inf" else f"{float(bound) / 1000:g}"
+            lines.append(f"agentops_duration_seconds_bucket{_labels(kind=kind, name=name, le=le)} {count}")
+        lines.append(f"agentops_duration_seconds_sum{_labels(kind=kind, name=name)} {s.total_sec:.6f}")
+        lines.append(f"agentops_duration_seconds_count{_labels(kind=kind, name=name)} {snap['count']}")
+
+    snapshots = {name: p.snapshot() for name, p in policies().items()}
+    family("agentops_dependency_calls_total", "counter", "Integration calls by dependency and outcome.")
+    for dep, snap in snapshots.items():
+        for outcome in ("calls", "successes", "failures", "retries", "short_circuited", "hedges", "hedge_wins"):
+            lines.append(f"agentops_dependency_calls_total{_labels(dependency=dep, outcome=outcome)} "
+                         f"{snap.get(outcome, 0)}")
+    family("agentops_dependency_breaker_open", "gauge", "1 while the dependency's circuit breaker is open.")
+    for dep, snap in snapshots.items():
+        open_ = int(snap["breaker"]["state"] != "closed")
+        lines.append(f"agentops_dependency_breaker_open{_labels(dependency=dep)} {open_}")
+    return "\n".join(lines) + "\n"
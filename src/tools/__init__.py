@@ -3,11 +3,13 @@ from .snowflake_tools import (
     query_feature_drift,
     query_data_quality,
     query_metric_trend,
+    detect_metric_change_points,
 )
-from .rag_tools import search_runbooks, search_incidents
+from .rag_tools import search_runbooks, search_runbooks_batch, search_incidents
 from .mlops_tools import (
     check_model_health,
     trigger_retraining,
     check_training_status,
     rollback_model,
 )
+from .notify_tools import send_slack_notification, report_github_issue
@@ -1,11 +1,15 @@
 """CrewAI tools for ML model lifecycle operations."""
-from crewai.tools import tool
-from integrations.mlmonitoring_client import MLMonitoringClient
+import time
 
-_ml = MLMonitoringClient()
+from crewai.tools import tool
+from telemetry import instrument
+from integrations.registry import get_mlmonitor
+from integrations.resilience import CircuitOpenError, fail_fast_message
+from integrations.training_tracker import get_training_tracker
 
 
 @tool("Check Model Health")
+@instrument("tool")
 def check_model_health() -> str:
     """Check the health and readiness of the ML model serving system.
 
@@ -13,17 +17,19 @@ def check_model_health() -> str:
     model version information including blue-green deployment state.
     """
     try:
-        health = _ml.health()
+        health = get_mlmonitor().health()
+    except CircuitOpenError as e:
+        return fail_fast_message(e)
     except Exception as e:
         return f"ML monitoring service unreachable: {e}"
 
     try:
-        ready = _ml.ready()
+        ready = get_mlmonitor().ready()
     except Exception:
         ready = {"detail": "readiness check failed"}
 
     try:
-        info = _ml.model_info()
+        info = get_mlmonitor().model_info()
     except Exception:
         info = {"error": "could not retrieve model info"}
 
@@ -36,40 +42,76 @@ def check_model_health() -> str:
 
 
 @tool("Trigger Retraining")
+@instrument("tool")
 def trigger_retraining(model_type: str = "classifier") -> str:
     """Trigger model retraining on the ML monitoring service.
 
-    This starts a retraining job for the specified model type.
-    After triggering, use 'Check Training Status' to monitor progress.
-    This is a high-impact action — verify the need for retraining first.
+    This starts a retraining job for the specified model type. The job is
+    then tracked in the background; 'Check Training Status' returns its
+    latest known state. This is a high-impact action — verify the need for
+    retraining first.
     """
     try:
-        result = _ml.trigger_retraining(model_type)
-        return f"Retraining triggered for {model_type}: {result}"
+        result = get_training_tracker().trigger(model_type)
+        return (
+            f"Retraining triggered for {model_type}: {result}\n"
+            "Progress is tracked in the background; check its status once before reporting."
+        )
+    except CircuitOpenError as e:
+        return fail_fast_message(e)
     except Exception as e:
         return f"Failed to trigger retraining: {e}"
 
 
 @tool("Check Training Status")
+@instrument("tool")
 def check_training_status(model_type: str = "classifier") -> str:
     """Check the status of a model retraining job.
 
     Returns training status (running/completed/failed), metrics of the
     new model if training is complete, and comparison against production.
+    Jobs started with 'Trigger Retraining' are answered from the background
+    tracker without calling the service; calling this repeatedly won't
+    return anything newer than the tracker has seen.
     """
+    job = get_training_tracker().status(model_type)
+    if job is not None:
+        return _format_tracked(job)
     try:
-        status = _ml.training_status(model_type)
+        status = get_mlmonitor().training_status(model_type)
         if not status:
             return f"No training runs found for {model_type}."
         lines = [f"Training status for {model_type}:"]
         for run in status[:3]:
             lines.append(f"  {run}")
         return "\n".join(lines)
+    except CircuitOpenError as e:
+        return fail_fast_message(e)
     except Exception as e:
         return f"Failed to check training status: {e}"
 
 
+def _format_tracked(job: dict) -> str:
+    elapsed = int(time.time() - job["started_at"])
+    lines = [f"Training status for {job['model_type']} (tracked, {elapsed}s since trigger): {job['status']}"]
+    if job["progress"] is not None:
+        lines.append(f"  Progress: {job['progress']}")
+    if job["metrics"]:
+        lines.append(f"  New model metrics: {job['metrics']}")
+    if job["error"]:
+        lines.append(f"  Last poll error: {job['error']}")
+    if job["done"]:
+        lines.append("  The job has finished.")
+    else:
+        lines.append(
+            f"  Still running; the tracker re-checks in ~{job['next_poll_in_sec']}s. "
+            "Report it as in progress rather than checking again."
+        )
+    return "\n".join(lines)
+
+
 @tool("Rollback Model")
+@instrument("tool")
 def rollback_model() -> str:
     """Rollback the production model to the previous version.
 
@@ -78,7 +120,9 @@ def rollback_model() -> str:
     After rollback, check model health to confirm recovery.
     """
     try:
-        result = _ml.rollback_model()
+        result = get_mlmonitor().rollback_model()
         return f"Rollback result: {result}"
+    except CircuitOpenError as e:
+        return fail_fast_message(e)
     except Exception as e:
         return f"Rollback failed: {e}"
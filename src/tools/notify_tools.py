@@ -0,0 +1,78 @@
+"""CrewAI tools for Slack notifications and GitHub issues, via the shared Notifier.
+
+Slack messages are digested per channel and GitHub reports for an alert that
+already has an open issue become comments, so an agent working through an
+incident storm doesn't flood either service.
+"""
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from crewai.tools import tool
+from telemetry import instrument
+from config import settings
+from integrations.notifier import get_notifier, issue_key
+from integrations.resilience import CircuitOpenError, fail_fast_message
+
+
+# channel → error of a digest that failed after its messages were reported queued;
+# the next send to that channel tells the agent.
+_digest_failures: dict[str, str] = {}
+
+
+def _on_digest_sent(channel: str, fut):
+    exc = fut.exception()
+    if exc is None:
+        error = (fut.result().get("data") or {}).get("error")
+    else:
+        error = f"{type(exc).__name__}: {exc}"[:200]
+    if error:
+        _digest_failures[channel] = error
+
+
+@tool("Send Slack Notification")
+@instrument("tool")
+def send_slack_notification(message: str, channel: str = "") -> str:
+    """Send a message to a Slack channel (default: the configured alerts channel).
+
+    Messages sent shortly after another one to the same channel are batched
+    into a digest, so send one message per update — no need to merge them.
+    """
+    channel = channel or settings.slack_channel or "#ml-alerts"
+    earlier = _digest_failures.pop(channel, None)
+    note = f"Note: an earlier digest to {channel} failed ({earlier}); resend what matters. " if earlier else ""
+    sent = get_notifier().slack(channel, message)
+    try:
+        result = sent.result(timeout=1.0)
+    except FutureTimeout:
+        sent.add_done_callback(lambda fut: _on_digest_sent(channel, fut))
+        return (f"{note}Not sent yet: queued for the next {channel} digest "
+                f"(within {settings.notify_digest_window_sec:.0f}s).")
+    except CircuitOpenError as e:
+        return note + fail_fast_message(e)
+    except Exception as e:
+        return f"{note}Slack send failed: {e}"
+    data = result.get("data") or {}
+    if data.get("ok"):
+        return f"{note}Slack message sent to {channel}"
+    return f"{note}Slack API error: {data.get('error') or result} (channel: {channel})"
+
+
+@tool("Report GitHub Issue")
+@instrument("tool")
+def report_github_issue(title: str, body: str, alert_type: str, affected_component: str,
+                        severity: str = "warning") -> str:
+    """Open a GitHub issue for an alert, or add a comment to its open issue.
+
+    Issues are keyed by alert_type and affected_component: reporting the same
+    alert again updates the existing issue instead of opening a duplicate.
+    """
+    key = issue_key({"alert_type": alert_type, "affected_component": affected_component})
+    try:
+        issue = get_notifier().github_issue(key, title, body, ["agentops", severity])
+    except CircuitOpenError as e:
+        return fail_fast_message(e)
+    except Exception as e:
+        return f"GitHub request failed: {e}"
+    if issue is None:
+        return "GitHub is not configured (GITHUB_REPO / GITHUB_TOKEN)."
+    verb = "created" if issue["action"] == "created" else "updated (comment added)"
+    return f"GitHub issue {verb}: {issue['url']}"
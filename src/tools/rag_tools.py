@@ -1,11 +1,15 @@
 """CrewAI tools for searching runbooks and historical incidents via RAG."""
 from crewai.tools import tool
-from integrations.rag_client import RAGClient
-
-_rag = RAGClient()
+from telemetry import instrument
+from integrations.registry import get_rag
+from integrations.resilience import fail_fast
+from llm.compaction import token_budget
 
 
 @tool("Search Runbooks")
+@instrument("tool")
+@fail_fast
+@token_budget(verbose=True)
 def search_runbooks(question: str) -> str:
     """Search operational runbooks for procedures related to ML model issues.
 
@@ -13,10 +17,35 @@ def search_runbooks(question: str) -> str:
     retraining procedures, rollback procedures, and incident response.
     Returns an answer with source citations.
     """
-    return _rag.search_runbooks(question)
+    return get_rag().search_runbooks(question)
+
+
+@tool("Search Runbooks (Batch)")
+@instrument("tool")
+@fail_fast
+@token_budget(verbose=True)
+def search_runbooks_batch(questions: list[str]) -> str:
+    """Search operational runbooks for several related questions in one call.
+
+    Pass a list of questions (e.g. diagnosis steps, remediation procedure and
+    escalation policy for the same alert). Questions are answered together,
+    which is faster than calling 'Search Runbooks' once per question.
+    Returns one answer with source citations per question, in order.
+    """
+    if isinstance(questions, str):
+        questions = [q.strip() for q in questions.splitlines() if q.strip()]
+    if not questions:
+        return "No questions provided."
+    answers = get_rag().search_runbooks_many(questions)
+    return "\n\n".join(
+        f"### Q{i}: {q}\n{a}" for i, (q, a) in enumerate(zip(questions, answers), 1)
+    )
 
 
 @tool("Search Incidents")
+@instrument("tool")
+@fail_fast
+@token_budget(verbose=True)
 def search_incidents(question: str) -> str:
     """Search historical incident reports for similar past ML system issues.
 
@@ -24,4 +53,4 @@ def search_incidents(question: str) -> str:
     accuracy drops, false positive spikes, schema changes, anomaly spikes,
     and retraining failures. Returns an answer with source citations.
     """
-    return _rag.search_incidents(question)
+    return get_rag().search_incidents(question)
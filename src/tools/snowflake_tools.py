@@ -1,12 +1,18 @@
 """CrewAI tools for querying Snowflake model metrics and data quality."""
 from crewai.tools import tool
+from telemetry import instrument
+from integrations.registry import get_snowflake
+from monitoring.changepoint import detect_metric_changes
+from monitoring.rules import get_rule_engine
+from integrations.resilience import fail_fast
 from config import settings
-from integrations.snowflake_client import SnowflakeClient
-
-_sf = SnowflakeClient()
+from llm.compaction import drift_status, rollup_drift, summarize_series, token_budget
 
 
 @tool("Query Model Metrics")
+@instrument("tool")
+@fail_fast
+@token_budget
 def query_model_metrics(model_name: str = "classifier_v2", hours: int = 1) -> str:
     """Query the latest ML model performance metrics from Snowflake.
 
@@ -14,7 +20,7 @@ def query_model_metrics(model_name: str = "classifier_v2", hours: int = 1) -> st
     and anomaly rate for the specified model over the last N hours.
     Includes an overall health assessment: HEALTHY, WARNING, or CRITICAL.
     """
-    rows = _sf.get_latest_model_metrics(model_name, hours)
+    rows = get_snowflake().get_latest_model_metrics(model_name, hours)
     if not rows:
         return f"No metrics found for {model_name} in the last {hours} hour(s)."
 
@@ -24,23 +30,9 @@ def query_model_metrics(model_name: str = "classifier_v2", hours: int = 1) -> st
     p99 = latest.get("latency_p99_ms", 0)
     anomaly = latest.get("anomaly_rate", 0)
 
-    # Determine health status
-    issues = []
-    if f1 < 0.88:
-        issues.append(f"F1={f1:.3f} < 0.88 (accuracy_drop)")
-    if drift > settings.drift_threshold:
-        issues.append(f"drift_score={drift:.3f} > {settings.drift_threshold} (model_drift)")
-    if p99 > 1000:
-        issues.append(f"latency_p99={p99:.0f}ms > 1000ms (latency)")
-    if anomaly > 0.10:
-        issues.append(f"anomaly_rate={anomaly:.3f} > 0.10 (anomaly_spike)")
-
-    if f1 < 0.70 or drift > 0.5 or p99 > 2000:
-        status = "CRITICAL"
-    elif issues:
-        status = "WARNING"
-    else:
-        status = "HEALTHY"
+    assessment = get_rule_engine().assess_one(model_name, latest)
+    issues = [b.describe() for b in assessment.worst_by_alert_type().values()]
+    status = assessment.status.upper()
 
     lines = [
         f"Model: {model_name} | Status: {status}",
@@ -63,60 +55,62 @@ def query_model_metrics(model_name: str = "classifier_v2", hours: int = 1) -> st
 
 
 @tool("Query Feature Drift")
-def query_feature_drift(model_name: str = "classifier_v2") -> str:
+@instrument("tool")
+@fail_fast
+@token_budget
+def query_feature_drift(model_name: str = "classifier_v2", verbose: bool = False) -> str:
     """Query per-feature drift scores (PSI, KS statistic) for an ML model.
 
-    Returns drift scores for all features sorted by PSI descending.
-    Highlights any feature with PSI > 0.2 (warning) or PSI > 0.3 (critical).
+    Returns every drifting feature (warning/critical by the drift_score alert
+    thresholds) plus the next highest by PSI; the remaining features are rolled up into
+    one "others ok" line. Pass verbose=True to list all features.
     Use this to identify which specific features are causing model drift.
     """
-    rows = _sf.get_feature_drift(model_name)
+    rows = get_snowflake().get_feature_drift(model_name)
     if not rows:
         return f"No feature drift data found for {model_name}."
 
+    shown, rolled = rollup_drift(rows, len(rows) if verbose else settings.tool_drift_top_k, model_name)
     lines = [f"Feature drift for {model_name} ({len(rows)} features):"]
     lines.append(f"{'Feature':<12} {'PSI':>8} {'KS':>8} {'Mean Shift':>12} {'Status'}")
     lines.append("-" * 55)
-    for r in rows:
+    for r in shown:
         psi = r.get("psi_score", 0)
-        if psi > 0.3:
-            flag = "CRITICAL"
-        elif psi > 0.2:
-            flag = "WARNING"
-        else:
-            flag = "ok"
         lines.append(
             f"{r.get('feature_name', '?'):<12} {psi:>8.4f} "
             f"{r.get('ks_statistic', 0):>8.4f} "
-            f"{r.get('mean_shift', 0):>12.4f} {flag}"
+            f"{r.get('mean_shift', 0):>12.4f} {drift_status(psi, model_name)}"
         )
+    if rolled:
+        max_psi = max(r.get("psi_score", 0) for r in rolled)
+        lines.append(f"... {len(rolled)} other features ok (PSI <= {max_psi:.4f})")
 
-    critical = [r for r in rows if r.get("psi_score", 0) > 0.3]
-    warning = [r for r in rows if 0.2 < r.get("psi_score", 0) <= 0.3]
-    lines.append(f"\nSummary: {len(critical)} critical, {len(warning)} warning features")
+    statuses = [drift_status(r.get("psi_score") or 0, model_name) for r in rows]
+    lines.append(f"\nSummary: {statuses.count('CRITICAL')} critical, {statuses.count('WARNING')} warning features")
     return "\n".join(lines)
 
 
 @tool("Query Data Quality")
+@instrument("tool")
+@fail_fast
+@token_budget
 def query_data_quality(pipeline_name: str = "transactions_ingest") -> str:
     """Query data quality metrics for a data pipeline from Snowflake.
 
     Returns null rates, schema violations, out-of-range counts, and overall
     status (healthy/warning/critical) for the specified pipeline.
     """
-    rows = _sf.get_data_quality(pipeline_name)
+    rows = get_snowflake().get_data_quality(pipeline_name)
     if not rows:
         return f"No data quality records found for {pipeline_name}."
 
     latest = rows[0]
     null_rate = latest.get("null_rate", 0)
 
-    if null_rate > 0.10:
-        assessment = "CRITICAL — null rate exceeds 10%"
-    elif null_rate > 0.05:
-        assessment = "WARNING — null rate exceeds 5%"
-    else:
-        assessment = "HEALTHY"
+    result = get_rule_engine().assess_one(pipeline_name, latest)
+    assessment = result.status.upper()
+    if result.breaches:
+        assessment += " — " + "; ".join(b.describe() for b in result.worst_by_alert_type().values())
 
     lines = [
         f"Pipeline: {pipeline_name} | Assessment: {assessment}",
@@ -133,18 +127,22 @@ def query_data_quality(pipeline_name: str = "transactions_ingest") -> str:
 
 
 @tool("Query Metric Trend")
-def query_metric_trend(model_name: str, metric: str, hours: int = 24) -> str:
+@instrument("tool")
+@fail_fast
+@token_budget
+def query_metric_trend(model_name: str, metric: str, hours: int = 24, verbose: bool = False) -> str:
     """Query the trend of a specific metric over time for an ML model.
 
     Valid metrics: f1_score, precision_score, recall_score, auc_roc,
     drift_score, latency_p50_ms, latency_p95_ms, latency_p99_ms,
     prediction_count, anomaly_rate.
 
-    Returns a time series showing when the metric started changing,
-    useful for pinpointing the onset of issues.
+    Returns a summary of the series — range, slope, change-point onset and
+    a few sample points — useful for pinpointing the onset of issues.
+    Pass verbose=True for the raw time series.
     """
     try:
-        rows = _sf.get_metric_trend(model_name, metric, hours)
+        rows = get_snowflake().get_metric_trend(model_name, metric, hours)
     except ValueError as e:
         return str(e)
 
@@ -152,6 +150,8 @@ def query_metric_trend(model_name: str, metric: str, hours: int = 24) -> str:
         return f"No trend data for {model_name}.{metric} in the last {hours}h."
 
     lines = [f"Trend: {model_name}.{metric} (last {hours}h, {len(rows)} points)"]
+    if not verbose:
+        return "\n".join(lines + summarize_series(rows, metric))
     lines.append(f"{'Timestamp':<25} {metric}")
     lines.append("-" * 40)
     for r in rows:
@@ -162,3 +162,43 @@ def query_metric_trend(model_name: str, metric: str, hours: int = 24) -> str:
         else:
             lines.append(f"{str(ts):<25} {val}")
     return "\n".join(lines)
+
+
+@tool("Detect Metric Changes")
+@instrument("tool")
+@fail_fast
+@token_budget
+def detect_metric_change_points(model_name: str, metric: str, hours: int = 24) -> str:
+    """Detect when a model metric started degrading, using statistical tests.
+
+    Runs CUSUM, EWMA control-chart and Page-Hinkley change-point detection
+    over the metric's time series and reports whether a shift occurred, its
+    onset timestamp and its magnitude versus the baseline. Prefer this over
+    reading raw trend output to pinpoint the onset of an issue.
+    Valid metrics are the same as for 'Query Metric Trend'.
+    """
+    try:
+        rows = get_snowflake().get_metric_trend(model_name, metric, hours)
+    except ValueError as e:
+        return str(e)
+
+    if not rows:
+        return f"No trend data for {model_name}.{metric} in the last {hours}h."
+
+    result = detect_metric_changes(rows, metric)
+    lines = [f"Change detection: {model_name}.{metric} (last {hours}h, {len(rows)} points)"]
+    if not result["detected"]:
+        lines.append("No change point detected — metric is stable against its baseline.")
+        return "\n".join(lines)
+
+    s = result["summary"]
+    lines += [
+        f"Change detected by {result['votes']}/3 detectors (first: {s['method']})",
+        f"Onset: {s['onset_ts']} | Detected at: {s['alarm_ts']}",
+        f"Baseline mean: {s['baseline_mean']:.4f} → since onset: {s['shifted_mean']:.4f} "
+        f"({s['magnitude']:+.4f}, {s['relative_magnitude']:+.1%})",
+    ]
+    for name, r in result["methods"].items():
+        status = f"onset {r['onset_ts']}, alarm {r['alarm_ts']}" if r["detected"] else "no alarm"
+        lines.append(f"  {name}: {status}")
+    return "\n".join(lines)
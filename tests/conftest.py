@@ -0,0 +1,8 @@
+"""Make src/ and the repo root importable, as backend/api.py and the scripts do."""
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+for path in (ROOT / "src", ROOT):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
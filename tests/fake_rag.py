@@ -0,0 +1,46 @@
+"""In-process stand-in for the RAG service, as an httpx.MockTransport.
+
+Serves /auth/register, /auth/token, /query and (optionally) /query/batch
+with deterministic answers, and records every request so tests can assert
+on what reached the "network".
+"""
+import json
+
+import httpx
+
+
+class FakeRAGService:
+    def __init__(self, batch: bool = True, batch_status: int = 404):
+        """`batch=False` makes /query/batch answer `batch_status` (404 or 405)."""
+        self.batch = batch
+        self.batch_status = batch_status
+        self.requests: list[tuple[str, dict | None]] = []
+        self.transport = httpx.MockTransport(self.handle)
+
+    @staticmethod
+    def answer(question: str) -> dict:
+        return {
+            "answer": f"answer to: {question}",
+            "citations": [{"source_path": f"runbooks/{abs(hash(question)) % 7}.md"}],
+        }
+
+    def calls(self, path: str) -> list[dict | None]:
+        return [body for p, body in self.requests if p == path]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        body = json.loads(request.content) if request.content else None
+        self.requests.append((path, body))
+        if path == "/auth/register":
+            return httpx.Response(409, json={"detail": "exists"})
+        if path == "/auth/token":
+            return httpx.Response(200, json={"access_token": "test-token"})
+        if request.headers.get("Authorization") != "Bearer test-token":
+            return httpx.Response(401, json={"detail": "unauthorized"})
+        if path == "/query":
+            return httpx.Response(200, json=self.answer(body["query"]))
+        if path == "/query/batch":
+            if not self.batch:
+                return httpx.Response(self.batch_status, json={"detail": "not found"})
+            return httpx.Response(200, json={"results": [self.answer(q["query"]) for q in body["queries"]]})
+        return httpx.Response(404, json={"detail": "not found"})
@@ -0,0 +1,95 @@
+import time
+
+import httpx
+import pytest
+
+from backend.action_queue import ActionQueue
+from backend.event_bus import EventBus
+from backend.store import Store
+
+
+def _raise(exc):
+    def handler(payload):
+        raise exc
+    return handler
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    def make(handlers, **kwargs):
+        return ActionQueue(Store(tmp_path / "agentops.db"), handlers, EventBus(), base_backoff_sec=0, **kwargs)
+    return make
+
+
+def _run_once(queue, kind):
+    job, _ = queue.submit(kind, {}, key=f"k-{kind}")
+    queue._run(queue.store.claim_job())
+    return queue.store.get_job(job["id"])
+
+
+def test_non_idempotent_job_is_not_retried_after_a_read_timeout(make_queue):
+    queue = make_queue({"retrain": _raise(httpx.ReadTimeout("timed out"))})
+    assert _run_once(queue, "retrain")["status"] == "failed"
+
+
+def test_non_idempotent_job_is_retried_when_it_never_connected(make_queue):
+    queue = make_queue({"retrain": _raise(httpx.ConnectError("refused"))})
+    assert _run_once(queue, "retrain")["status"] == "queued"
+
+
+def test_idempotent_job_is_retried_after_any_failure(make_queue):
+    queue = make_queue({"slack": _raise(httpx.ReadTimeout("timed out"))}, idempotent_kinds=frozenset({"slack"}))
+    assert _run_once(queue, "slack")["status"] == "queued"
+
+
+def test_worker_survives_a_bookkeeping_error(make_queue):
+    failed = []
+
+    def on_update(job):
+        if job["status"] == "running" and not failed:
+            failed.append(job["id"])
+            raise RuntimeError("database is locked")
+
+    queue = make_queue({"noop": lambda p: "ok"}, on_update=on_update, workers=1, poll_sec=0.01)
+    queue.submit("noop", {}, key="a")
+    queue.submit("noop", {}, key="b")
+    queue.start()
+    try:
+        for _ in range(200):
+            if any(j["status"] == "succeeded" for j in queue.store.list_jobs(None, None, 10)):
+                break
+            time.sleep(0.01)
+        assert queue.running
+        statuses = {j["id"]: j["status"] for j in queue.store.list_jobs(None, None, 10)}
+        # The job whose update failed is left running; the worker went on to the next one.
+        assert statuses.pop(failed[0]) == "running"
+        assert list(statuses.values()) == ["succeeded"]
+    finally:
+        queue.stop()
+
+
+def test_stale_jobs_are_requeued_only_when_idempotent(make_queue):
+    queue = make_queue({"slack": lambda p: "ok", "retrain": lambda p: "ok"},
+                       idempotent_kinds=frozenset({"slack"}))
+    queue.submit("slack", {}, key="s")
+    queue.submit("retrain", {}, key="r")
+    # Both claimed by a process that then crashed; a negative lease makes them stale now.
+    queue.store.claim_job()
+    queue.store.claim_job()
+
+    recovered = {j["kind"]: j for j in queue.store.recover_stale_jobs(-1, queue.idempotent_kinds)}
+    assert recovered["slack"]["status"] == "queued"
+    assert recovered["retrain"]["status"] == "failed"
+    assert "verify before retrying" in recovered["retrain"]["error"]
+
+
+def test_failed_job_can_be_resubmitted(make_queue):
+    queue = make_queue({"retrain": _raise(httpx.ReadTimeout("timed out"))})
+    failed = _run_once(queue, "retrain")
+    assert failed["status"] == "failed"
+
+    job, created = queue.submit("retrain", {}, key="k-retrain")
+    assert created and job["id"] == failed["id"]
+    assert (job["status"], job["attempts"], job["error"]) == ("queued", 0, None)
+    # A queued (or succeeded) job is still deduplicated.
+    assert queue.submit("retrain", {}, key="k-retrain") == (job, False)
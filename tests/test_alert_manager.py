@@ -0,0 +1,39 @@
+import threading
+
+from backend.alert_manager import AlertManager
+from backend.store import Store
+
+ALERT = {"alert_id": "a1", "alert_type": "feature_drift", "affected_component": "classifier_v2",
+         "severity": "warning"}
+
+
+def test_workers_sharing_a_store_open_an_alert_once(tmp_path):
+    # Separate Store objects stand in for separate processes on one database file.
+    managers = [AlertManager(store=Store(tmp_path / "agentops.db")) for _ in range(4)]
+    changes, start = [], threading.Barrier(len(managers))
+
+    def evaluate(manager):
+        start.wait()
+        changes.extend(manager.ingest([dict(ALERT)], component="classifier_v2"))
+
+    threads = [threading.Thread(target=evaluate, args=(m,)) for m in managers]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert [c["event"] for c in changes] == ["opened"]
+    assert managers[0].active()[0]["occurrences"] == 4
+
+
+def test_flapping_alert_reports_when_it_settles():
+    manager = AlertManager(flap_window_sec=100, flap_threshold=4)
+    events = []
+    now = 1000.0
+    for i in range(4):  # open/resolve until it flaps
+        events += [c["event"] for c in manager.ingest([dict(ALERT)], "classifier_v2", now=now + i * 2)]
+        events += [c["event"] for c in manager.ingest([], "classifier_v2", now=now + i * 2 + 1)]
+    assert "flapping" in events
+    settled = manager.ingest([], "classifier_v2", now=now + 500)
+    assert [(c["event"], c["alert"]["status"], c["alert"]["flapping"]) for c in settled] == [
+        ("settled", "resolved", False)
+    ]
@@ -0,0 +1,17 @@
+from config import settings
+from llm.compaction import drift_status, rollup_drift
+from monitoring.rules import get_rule_engine
+
+
+def test_drift_status_follows_the_alert_rules():
+    warning = min(r.threshold for r in get_rule_engine().rules if r.metric == "drift_score")
+    assert drift_status(warning / 2) == "ok"
+    assert drift_status((warning + settings.drift_threshold) / 2) == "WARNING"
+    assert drift_status(settings.drift_threshold + 0.01) == "CRITICAL"
+
+
+def test_rollup_keeps_every_flagged_feature():
+    rows = [{"feature_name": f"V{i}", "psi_score": psi} for i, psi in enumerate([0.9, 0.5, 0.01, 0.02, 0.4])]
+    shown, rolled = rollup_drift(rows, top_k=1)
+    assert [r["psi_score"] for r in shown] == [0.9, 0.5, 0.4]
+    assert len(rolled) == 2
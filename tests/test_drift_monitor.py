@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from monitoring.drift import ReferenceProfile
+from monitoring.sketches import StreamingDriftMonitor
+
+FEATURES = ["Amount", "V14"]
+
+
+@pytest.fixture
+def monitor():
+    rng = np.random.default_rng(0)
+    reference = ReferenceProfile.fit(rng.normal(size=(500, 2)), FEATURES, n_bins=5)
+    return StreamingDriftMonitor(reference, batch_size=4)
+
+
+def test_malformed_observation_is_rejected_without_poisoning_the_buffer(monitor):
+    with pytest.raises(ValueError):
+        monitor.observe({"Amount": "n/a", "V14": 0.1})
+    for i in range(10):
+        monitor.observe({"Amount": float(i), "V14": 0.1})
+    assert monitor.rejected == 1
+    assert monitor.report().count == 10
+    assert monitor.snapshot()["features"] == FEATURES
@@ -0,0 +1,24 @@
+import threading
+
+from backend.health import HealthAggregator
+from integrations.resilience import get_breaker
+
+
+def test_hung_probe_does_not_starve_the_others():
+    release = threading.Event()
+    health = HealthAggregator(
+        {"test-hung": lambda t: release.wait(), "test-fast-a": lambda t: None, "test-fast-b": lambda t: None},
+        timeout_sec=0.05,
+    )
+    failures = get_breaker("test-hung").snapshot()["consecutive_failures"]
+    try:
+        first = health.refresh()
+        assert first["test-hung"]["error"] == "timeout"
+        for _ in range(5):
+            details = health.refresh()
+            assert details["test-fast-a"]["ok"] and details["test-fast-b"]["ok"]
+            assert details["test-hung"]["stale"] and not details["test-hung"]["ok"]
+        # Only the overrun counts against the breaker, not the skipped refreshes.
+        assert get_breaker("test-hung").snapshot()["consecutive_failures"] == failures + 1
+    finally:
+        release.set()
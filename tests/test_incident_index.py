@@ -0,0 +1,60 @@
+import time
+from datetime import datetime, timedelta
+
+from retrieval.incident_index import IncidentIndex
+
+T0 = datetime(2025, 1, 1)
+
+
+class FakeSnowflake:
+    def __init__(self, incidents: int):
+        self.rows = [
+            {"id": i, "incident_id": f"INC-{i}", "ts": T0 + timedelta(hours=i), "alert_type": "feature_drift",
+             "affected_component": "classifier_v2", "root_cause": "drift"}
+            for i in range(incidents)
+        ]
+        self.calls = []
+
+    def get_incidents(self, limit=10):
+        self.calls.append("incidents")
+        return self.rows[-limit:]
+
+    def get_incidents_since(self, since, limit=1000):
+        self.calls.append("since")
+        return [r for r in self.rows if r["ts"] >= since][:limit]
+
+    def get_incident_drift(self, start, end, window_hours):
+        self.calls.append("drift")
+        return [{"incident_row_id": r["id"], "feature_name": "V14", "psi_score": 0.4}
+                for r in self.rows if start <= r["ts"] <= end]
+
+
+def test_refresh_loads_drift_in_one_query():
+    sf = FakeSnowflake(500)
+    index = IncidentIndex()
+    assert index.refresh(sf) == 500
+    assert sf.calls == ["incidents", "drift"]
+    top = index.search("feature_drift", "classifier_v2", [{"feature_name": "V14", "psi_score": 0.5}], k=1)
+    assert top and top[0]["similarity"] > 0.99
+
+
+def test_incremental_refresh_keeps_same_timestamp_rows():
+    sf = FakeSnowflake(3)
+    index = IncidentIndex()
+    index.refresh(sf)
+    # A row that lands later with the latest timestamp already seen.
+    sf.rows.append({**sf.rows[-1], "id": 99, "incident_id": "INC-99"})
+    assert index.refresh(sf) == 1
+    assert len(index) == 4
+
+
+def test_background_refresh_does_not_block():
+    sf = FakeSnowflake(3)
+    index = IncidentIndex()
+    assert index.refresh_in_background(sf)
+    for _ in range(100):
+        if len(index) == 3:
+            break
+        time.sleep(0.01)
+    assert len(index) == 3
+    assert not index.refresh_in_background(sf)  # fresh
@@ -0,0 +1,23 @@
+import os
+
+from config import settings
+from retrieval import local_index
+
+
+def test_get_local_index_picks_up_edited_sources(tmp_path, monkeypatch):
+    runbooks = tmp_path / "runbooks"
+    runbooks.mkdir()
+    doc = runbooks / "drift.md"
+    doc.write_text("# Drift\n\n## Steps\nCheck the PSI of every feature.\n")
+    monkeypatch.setattr(local_index, "DOC_DIRS", {"runbook": runbooks})
+    monkeypatch.setattr(local_index, "_index", None)
+    monkeypatch.setattr(settings, "rag_local_index_dir", str(tmp_path / "index"))
+    monkeypatch.setattr(settings, "rag_local_index_check_sec", 0.0)
+
+    assert local_index.get_local_index().search("rollback") == []
+
+    doc.write_text("# Drift\n\n## Rollback\nRoll back to the previous model version.\n")
+    os.utime(doc, ns=(doc.stat().st_atime_ns, doc.stat().st_mtime_ns + 10**9))
+
+    hits = local_index.get_local_index().search("rollback")
+    assert hits and "Roll back" in hits[0]["text"]
@@ -0,0 +1,51 @@
+from collections import Counter
+
+import pytest
+
+from integrations.rag_client import RAGClient
+from tests.fake_rag import FakeRAGService
+
+QUESTIONS = ["how to roll back", "drift runbook", "how to roll back", "escalation policy", "drift runbook"]
+
+
+def test_query_many_batch_dedups_and_keeps_order():
+    service = FakeRAGService(batch=True)
+    client = RAGClient(transport=service.transport)
+
+    results = client.query_many(QUESTIONS)
+
+    assert [r["answer"] for r in results] == [f"answer to: {q}" for q in QUESTIONS]
+    batches = service.calls("/query/batch")
+    assert len(batches) == 1
+    assert [q["query"] for q in batches[0]["queries"]] == list(dict.fromkeys(QUESTIONS))
+    assert service.calls("/query") == []
+
+
+@pytest.mark.parametrize("status", [404, 405])
+def test_query_many_falls_back_to_concurrent_queries(status):
+    service = FakeRAGService(batch=False, batch_status=status)
+    client = RAGClient(transport=service.transport)
+
+    results = client.query_many(QUESTIONS)
+
+    assert [r["answer"] for r in results] == [f"answer to: {q}" for q in QUESTIONS]
+    sent = Counter(body["query"] for body in service.calls("/query"))
+    assert set(sent) == set(QUESTIONS)
+    assert len(service.calls("/query/batch")) == 1
+
+    # The missing endpoint is remembered: the next batch goes straight to /query.
+    client.query_many(["another question"])
+    assert len(service.calls("/query/batch")) == 1
+
+
+def test_query_many_empty():
+    service = FakeRAGService()
+    assert RAGClient(transport=service.transport).query_many([]) == []
+    assert service.requests == []
+
+
+def test_search_runbooks_many_formats_citations():
+    service = FakeRAGService()
+    answers = RAGClient(transport=service.transport).search_runbooks_many(["drift runbook"])
+    assert answers[0].startswith("answer to: drift runbook")
+    assert "Sources:" in answers[0]
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+
+from integrations.rag_ingest import Ingestor, Manifest
+
+
+class FakeClient:
+    def __init__(self, on_upload=None):
+        self.on_upload = on_upload
+        self.uploaded = []
+
+    def ingest_file(self, path: str) -> dict:
+        if self.on_upload:
+            self.on_upload(path)
+        self.uploaded.append(os.path.basename(path))
+        return {"status": "ok"}
+
+
+@pytest.fixture
+def docs(tmp_path):
+    directory = tmp_path / "runbooks"
+    directory.mkdir()
+    for name in ("a.md", "b.md"):
+        (directory / name).write_text(f"# {name}\n")
+    return directory
+
+
+def _ingestor(docs, client):
+    return Ingestor(client, Manifest(docs.parent / "manifest.json"), {"runbook": docs}, workers=2, retries=0)
+
+
+def test_edit_during_upload_is_ingested_again(docs):
+    def edit_a(path):
+        if path.endswith("a.md") and "edited" not in open(path).read():
+            with open(path, "a") as f:
+                f.write("edited\n")
+            st = os.stat(path)
+            os.utime(path, (st.st_atime, st.st_mtime + 5))
+
+    ingestor = _ingestor(docs, FakeClient(on_upload=edit_a))
+    assert sorted(ingestor.run().uploaded) == ["a.md", "b.md"]
+    assert [p.name for _, p, _, _ in ingestor.pending()] == ["a.md"]
+
+
+def test_failed_file_does_not_lose_the_others(docs):
+    def fail_b(path):
+        if path.endswith("b.md"):
+            raise RuntimeError("boom")
+
+    ingestor = _ingestor(docs, FakeClient(on_upload=fail_b))
+    report = ingestor.run()
+    assert report.uploaded == ["a.md"] and list(report.failed) == ["b.md"]
+    # The manifest was saved: a new run only retries the failure.
+    assert [p.name for _, p, _, _ in _ingestor(docs, FakeClient()).pending()] == ["b.md"]
+
+
+def test_file_deleted_after_discovery_is_skipped(docs, monkeypatch):
+    ingestor = _ingestor(docs, FakeClient())
+    real_stat = type(docs).stat
+
+    def stat(path, *args, **kwargs):
+        if path.name == "b.md":
+            raise FileNotFoundError(path)
+        return real_stat(path, *args, **kwargs)
+
+    monkeypatch.setattr(type(docs), "stat", stat)
+    assert [p.name for _, p, _, _ in ingestor.pending()] == ["a.md"]
+
+
+def test_watch_survives_a_failed_cycle(docs, monkeypatch):
+    ingestor = _ingestor(docs, FakeClient())
+    cycles = []
+
+    def run(**kwargs):
+        cycles.append(1)
+        if len(cycles) == 1:
+            raise OSError("disk full")
+        raise KeyboardInterrupt  # stop the loop
+
+    monkeypatch.setattr(ingestor, "run", run)
+    monkeypatch.setattr("integrations.rag_ingest.time.sleep", lambda s: None)
+    with pytest.raises(KeyboardInterrupt):
+        ingestor.watch()
+    assert len(cycles) == 2
@@ -0,0 +1,33 @@
+import pytest
+
+from integrations import snowflake_client
+from integrations.resilience import get_policy
+from integrations.snowflake_client import SnowflakeClient
+
+
+class BrokenConnection:
+    def is_closed(self):
+        return False
+
+    def cursor(self):
+        return self
+
+    def execute(self, *args, **kwargs):
+        raise ConnectionResetError("connection reset")
+
+    def close(self):
+        pass
+
+
+def test_policy_predicate_does_not_pin_a_client():
+    SnowflakeClient()
+    assert not hasattr(get_policy("snowflake").is_transient, "__self__")
+
+
+def test_connection_error_drops_the_connection(monkeypatch):
+    monkeypatch.setattr(snowflake_client, "_is_transient", lambda e: isinstance(e, ConnectionError))
+    client = SnowflakeClient()
+    client._conn = BrokenConnection()
+    with pytest.raises(ConnectionResetError):
+        client._query("SELECT 1", None)
+    assert client._conn is None
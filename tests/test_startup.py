@@ -0,0 +1,18 @@
+"""Import-time budgets and deferred imports (scripts/bench_startup.py) as part of the suite."""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+SCRIPT = Path(__file__).resolve().parent.parent / "scripts" / "bench_startup.py"
+spec = importlib.util.spec_from_file_location("bench_startup", SCRIPT)
+bench_startup = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(bench_startup)
+
+
+@pytest.mark.parametrize("module", list(bench_startup.DEFAULT_BUDGETS))
+def test_startup_import_stays_within_budget(module):
+    # bench() imports the target in fresh interpreters, so this process's imports don't count.
+    result = bench_startup.bench(module, bench_startup.DEFAULT_BUDGETS[module], runs=3, top=0, save_dir=None)
+    assert result["eager_deferred_modules"] == [], f"{module} imports deferred modules eagerly"
+    assert result["median_sec"] <= result["budget_sec"], f"{module} imports in {result['median_sec']}s"
@@ -0,0 +1,22 @@
+import threading
+
+import pytest
+
+from backend.store import Store
+
+
+def test_store_rejects_in_memory_database():
+    with pytest.raises(ValueError):
+        Store(":memory:")
+
+
+def test_store_is_shared_across_threads(tmp_path):
+    store = Store(tmp_path / "agentops.db")
+    job, created = store.enqueue_job("k1", "notify", {"text": "hi"})
+    assert created
+
+    seen = {}
+    t = threading.Thread(target=lambda: seen.update(job=store.get_job(job["id"])))
+    t.start()
+    t.join()
+    assert seen["job"]["idempotency_key"] == "k1"
@@ -0,0 +1,23 @@
+import threading
+
+from telemetry import record, run_scope
+
+
+def test_run_scope_sees_only_its_own_context():
+    with run_scope() as run:
+        record("llm", "test-model", 0.1, tokens_in=10)
+        # Another request's call while the run is open (e.g. a summarize endpoint).
+        other = threading.Thread(target=record, args=("llm", "test-model", 0.1), kwargs={"tokens_in": 99})
+        other.start()
+        other.join()
+    assert run.totals("llm")["calls"] == 1
+    assert run.totals("llm")["tokens_in"] == 10
+
+
+def test_nested_scopes_both_record():
+    with run_scope() as outer:
+        with run_scope() as inner:
+            record("tool", "test-tool", 0.01)
+        record("tool", "test-tool", 0.01)
+    assert inner.totals("tool")["calls"] == 1
+    assert outer.totals("tool")["calls"] == 2
@@ -0,0 +1,30 @@
+from integrations.training_tracker import _pick_run
+
+TRIGGERED_AT = 1_700_000_000.0
+
+
+def test_previous_finished_run_is_not_picked():
+    runs = [{"status": "completed", "started_at": TRIGGERED_AT - 3600, "metrics": {"f1": 0.8}}]
+    assert _pick_run(runs, None, TRIGGERED_AT) is None
+
+
+def test_new_run_is_picked_over_the_previous_one():
+    previous = {"status": "completed", "started_at": "2023-11-14T21:13:20Z"}  # TRIGGERED_AT - 3600
+    new = {"status": "running", "started_at": TRIGGERED_AT + 2}
+    assert _pick_run([previous, new], None, TRIGGERED_AT) is new
+
+
+def test_run_just_before_the_trigger_counts_only_while_in_progress():
+    running = {"status": "running", "started_at": TRIGGERED_AT - 5}
+    assert _pick_run([running], None, TRIGGERED_AT) is running
+    assert _pick_run([{**running, "status": "completed"}], None, TRIGGERED_AT) is None
+
+
+def test_unstamped_runs_count_only_while_in_progress():
+    assert _pick_run([{"status": "completed"}], None, TRIGGERED_AT) is None
+    assert _pick_run([{"status": "running"}], None, TRIGGERED_AT) == {"status": "running"}
+
+
+def test_run_id_match_wins():
+    runs = [{"run_id": 7, "status": "completed", "started_at": TRIGGERED_AT - 3600}]
+    assert _pick_run(runs, 7, TRIGGERED_AT) is runs[0]